@@ -0,0 +1,129 @@
+"""Library snapshot benchmarks on a synthetic 5,000-series / 20,000-movie library.
+
+    cd backends/python && uv run python benchmarks/bench_library.py
+
+Times the operations every health poll and search performs against a library
+snapshot — building the table from a fresh dump, the health totals, presence
+lookups — plus the on-disk round trip, next to the per-record dict walk the
+totals used to be. Writes snapshots to a temporary data dir only.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from engine.media.clients.radarr import LIBRARY_COLUMNS as MOVIE_COLUMNS  # noqa: E402
+from engine.media.clients.sonarr import LIBRARY_COLUMNS as SERIES_COLUMNS  # noqa: E402
+from engine.media.columns import LibraryTable  # noqa: E402
+from engine.media.health import apply_library_stats  # noqa: E402
+from engine.media.models import ServerHealth  # noqa: E402
+from engine.media.snapshots import load_snapshot, save_snapshot  # noqa: E402
+
+SERIES = 5_000
+MOVIES = 20_000
+
+
+def synthetic_series(n: int) -> list[dict]:
+    rng = random.Random(1)
+    records = []
+    for i in range(n):
+        seasons = [
+            {
+                "seasonNumber": s,
+                "monitored": s > 0,
+                "statistics": {
+                    "episodeCount": (count := rng.randint(6, 24)),
+                    "episodeFileCount": rng.randint(0, count),
+                    "totalEpisodeCount": count,
+                    "sizeOnDisk": rng.randint(0, 40_000_000_000),
+                },
+            }
+            for s in range(rng.randint(1, 8))
+        ]
+        stats = {
+            key: sum(s["statistics"][key] for s in seasons)
+            for key in ("episodeCount", "episodeFileCount", "totalEpisodeCount", "sizeOnDisk")
+        }
+        records.append(
+            {
+                "id": i + 1,
+                "tvdbId": 70_000 + i * 3,
+                "title": f"Series {i}",
+                "year": 1990 + i % 35,
+                "monitored": rng.random() < 0.9,
+                "statistics": {**stats, "seasonCount": len(seasons)},
+                "seasons": seasons,
+            }
+        )
+    return records
+
+
+def synthetic_movies(n: int) -> list[dict]:
+    rng = random.Random(2)
+    return [
+        {
+            "id": i + 1,
+            "tmdbId": 100 + i * 7,
+            "title": f"Movie {i}",
+            "year": 1950 + i % 75,
+            "monitored": True,
+            "hasFile": (has_file := rng.random() < 0.8),
+            "sizeOnDisk": rng.randint(1_000_000_000, 60_000_000_000) if has_file else 0,
+        }
+        for i in range(n)
+    ]
+
+
+def dict_walk_stats(kind: str, items: list[dict]) -> tuple[int, int]:
+    """The per-record totals apply_library_stats computed before the columns."""
+    if kind == "sonarr":
+        stats = [item.get("statistics", {}) for item in items]
+        return sum(s.get("episodeFileCount") or 0 for s in stats), sum(s.get("sizeOnDisk") or 0 for s in stats)
+    return sum(1 for item in items if item.get("hasFile")), sum(item.get("sizeOnDisk") or 0 for item in items)
+
+
+def bench(label: str, fn, repeat: int = 20) -> None:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"  {label:<44} {best * 1000:9.3f} ms")
+
+
+def run(kind: str, records: list[dict], id_field: str, columns) -> None:
+    print(f"\n{kind}: {len(records):,} records")
+    table = LibraryTable.from_records(records, id_field, columns)
+    dict_index = {r[id_field]: r for r in records}
+    probes = [r[id_field] for r in random.Random(3).sample(records, 1_000)] + list(range(-1_000, 0))
+
+    bench("build table from dump", lambda: LibraryTable.from_records(records, id_field, columns), repeat=5)
+    bench("health totals: dict walk (before)", lambda: dict_walk_stats(kind, list(dict_index.values())))
+    bench("health totals: column reductions", lambda: apply_library_stats(ServerHealth(name="x", kind=kind), table))
+    bench("2,000 presence lookups: table", lambda: [table.get(p) for p in probes])
+
+    bench("save snapshot", lambda: save_snapshot(kind, time.time(), table), repeat=3)
+
+    def cold_lookups():
+        disk = load_snapshot(kind)
+        return [disk.get(p) for p in probes]
+
+    bench("load snapshot (cold) + 2,000 lookups", cold_lookups)
+    disk = load_snapshot(kind)
+    bench("health totals: columns from disk", lambda: apply_library_stats(ServerHealth(name="x", kind=kind), disk))
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as data_dir:
+        os.environ["SYNCPLEX_DATA_DIR"] = data_dir
+        run("sonarr", synthetic_series(SERIES), "tvdbId", SERIES_COLUMNS)
+        run("radarr", synthetic_movies(MOVIES), "tmdbId", MOVIE_COLUMNS)
+
+
+if __name__ == "__main__":
+    main()
@@ -31,6 +31,12 @@ def parse_inventory(path: Path | None = None) -> list[Machine]:
                 api_key_env=s.get("api_key_env", ""),
                 quality_profile=s.get("quality_profile", ""),
                 root_folder=s.get("root_folder", ""),
+                pool_size=int(s["pool_size"]) if s.get("pool_size") else None,
+                timeouts={k: float(v) for k, v in s.get("timeouts", {}).items()},
+                library_refresh_seconds=(
+                    float(s["library_refresh_seconds"]) if s.get("library_refresh_seconds") else None
+                ),
+                full_resync_seconds=float(s["full_resync_seconds"]) if s.get("full_resync_seconds") else None,
             )
             for s in entry.get("services", [])
         ]
@@ -194,7 +200,7 @@ def machines_to_json(machines: list[Machine]) -> str:
             entry["identity_file"] = m.identity_file
         if m.services:
             entry["services"] = [
-                {k: v for k, v in vars(s).items() if v not in ("", None)} for s in m.services
+                {k: v for k, v in vars(s).items() if v not in ("", None, {})} for s in m.services
             ]
         hosts.append(entry)
     return json.dumps({"hosts": hosts}, indent=2)
@@ -6,10 +6,26 @@ that kills the whole search.
 """
 
 import asyncio
+import logging
+import re
 import time
-
-from .clients import PlexClient, RadarrClient, SonarrClient
+from collections.abc import AsyncIterator, Callable, Mapping
+from contextlib import aclosing
+from dataclasses import replace
+
+from .clients import PlexClient, RadarrClient, SonarrClient, close_http_clients
+from .clients.arr_base import addable, imdb_number, invalidate_add_defaults
+from .clients.lookup_cache import lookup_cache
+from .columns import LibraryTable
 from .config import ArrInstance, MediaConfig, load_media_config
+from .library import (
+    cached_snapshot,
+    client_for,
+    invalidate_library_cache,
+    library_index,
+    patch_library,
+    refresh_title,
+)
 from .models import (
     AddResult,
     AggregatedResult,
@@ -18,10 +34,9 @@ from .models import (
     MediaType,
     PresenceState,
 )
+from .plex_index import check_presence as plex_presence
 
-
-def _client_for(instance: ArrInstance, media_type: MediaType) -> SonarrClient | RadarrClient:
-    return SonarrClient(instance) if media_type == MediaType.TV else RadarrClient(instance)
+logger = logging.getLogger(__name__)
 
 
 def _external_key(item: dict, media_type: MediaType) -> str:
@@ -32,42 +47,161 @@ def _external_key(item: dict, media_type: MediaType) -> str:
     return f"title:{item.get('title', '').casefold()}:{item.get('year') or 0}"
 
 
-# Library snapshots per instance, indexed by external id. Lookup responses lie
-# about presence detail (Radarr omits hasFile, Sonarr omits season statistics),
-# so statuses are derived from the instance's real library instead. A short TTL
-# keeps search-as-you-type from refetching the library on every keystroke.
-_LIBRARY_TTL_SECONDS = 60.0
-_library_cache: dict[str, tuple[float, dict[int, dict]]] = {}
-
-
-def invalidate_library_cache(instance_name: str | None = None) -> None:
-    if instance_name is None:
-        _library_cache.clear()
-    else:
-        _library_cache.pop(instance_name, None)
-
-
-async def _library_index(client: SonarrClient | RadarrClient) -> dict[int, dict]:
-    now = time.monotonic()
-    cached = _library_cache.get(client.name)
-    if cached and now - cached[0] < _LIBRARY_TTL_SECONDS:
-        return cached[1]
-    id_field = "tvdbId" if isinstance(client, SonarrClient) else "tmdbId"
-    index = {item[id_field]: item for item in await client.get_library() if item.get(id_field)}
-    _library_cache[client.name] = (now, index)
-    return index
+# Smoothed lookup round trip per instance, in ms. Lookup-once mode runs the
+# metadata lookup on the fastest instance that answers; a failed lookup pushes
+# the instance to the back of the line until it succeeds again.
+_lookup_ms: dict[str, float] = {}
+
+# Metadata lookups in flight per instance. A batch of hundreds of searches
+# must not stampede one server's metadata proxy; the lookup-once pick skips an
+# instance whose slots are all taken. Semaphores are bound to the loop that
+# made them, like the pooled HTTP clients (clients/pool).
+MAX_LOOKUPS_PER_INSTANCE = 4
+_max_lookups = MAX_LOOKUPS_PER_INSTANCE
+_lookup_slots: dict[str, tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = {}
+
+
+def set_lookup_concurrency(limit: int) -> None:
+    """How many lookups may run at once on each instance (CLI --concurrency)."""
+    global _max_lookups
+    _max_lookups = max(limit, 1)
+    _lookup_slots.clear()
+
+
+def _lookup_slot(instance_name: str) -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    entry = _lookup_slots.get(instance_name)
+    if entry is None or entry[0] is not loop:
+        entry = _lookup_slots[instance_name] = (loop, asyncio.Semaphore(_max_lookups))
+    return entry[1]
+
+
+async def _timed_lookup(client: SonarrClient | RadarrClient, query: str) -> list[dict]:
+    """The client's lookup answer for `query`, served from the process-wide
+    lookup cache when any instance answered it recently. Another instance's
+    items lose their `id` — that is the answering instance's library id, and
+    presence on this one comes from its own library."""
+    media_type = MediaType.TV if isinstance(client, SonarrClient) else MediaType.MOVIE
+    entry = await lookup_cache().fetch(media_type.value, query, client.name, lambda: _measured_lookup(client, query))
+    if entry.instance == client.name:
+        return entry.items
+    return [{key: value for key, value in item.items() if key != "id"} for item in entry.items]
+
+
+async def _measured_lookup(client: SonarrClient | RadarrClient, query: str) -> list[dict]:
+    # only real round trips are timed — a cache hit says nothing about the
+    # instance, and neither does the wait for a lookup slot
+    async with _lookup_slot(client.name):
+        start = time.perf_counter()
+        try:
+            results = await client.lookup(query)
+        except Exception:
+            _lookup_ms[client.name] = float("inf")
+            raise
+        elapsed = (time.perf_counter() - start) * 1000
+    previous = _lookup_ms.get(client.name, float("inf"))
+    _lookup_ms[client.name] = elapsed if previous == float("inf") else 0.7 * previous + 0.3 * elapsed
+    return results
+
+
+async def _lookup_anywhere(clients: list[SonarrClient | RadarrClient], query: str) -> tuple[str, list[dict]]:
+    """Lookup on the fastest instance, failing over down the list.
+
+    Instances with no timing yet sort first (stable, in config order) so every
+    instance gets measured; instances with every lookup slot taken sort last,
+    so a batch spreads over the instances. Returns the answering instance's
+    name and results.
+    """
+    last_exc: Exception | None = None
+    for client in sorted(clients, key=lambda c: (_lookup_slot(c.name).locked(), _lookup_ms.get(c.name, 0.0))):
+        try:
+            return client.name, await _timed_lookup(client, query)
+        except Exception as exc:  # noqa: BLE001 — try the next instance
+            last_exc = exc
+    assert last_exc is not None
+    raise last_exc
+
+
+# "tvdb:371980", "tmdb:603", "imdb:tt0133093" — the id forms the CLI documents
+_ID_QUERY = re.compile(r"^\s*(tvdb|tmdb|imdb):\s*(\d+|tt\d+)\s*$", re.IGNORECASE)
+# which ids a library record carries, per media type
+_LIBRARY_IDS = {MediaType.TV: ("tvdb", "imdb"), MediaType.MOVIE: ("tmdb", "imdb")}
+
+
+def _id_query(query: str, media_type: MediaType) -> tuple[str, str] | None:
+    """("tvdbId", "371980") for an id-form query the libraries can answer, else None."""
+    match = _ID_QUERY.match(query)
+    if match is None or match[1].lower() not in _LIBRARY_IDS[media_type]:
+        return None
+    return f"{match[1].lower()}Id", match[2]
+
+
+def _find_record(library: LibraryTable, id_field: str, value: str) -> dict | None:
+    if id_field == "imdbId":
+        number = imdb_number({"imdbId": value})
+        return library.find("imdb", number) if number else None
+    return library.get(int(value)) if value.isdigit() else None
+
+
+async def _search_by_id(
+    clients: list[SonarrClient | RadarrClient], id_field: str, value: str
+) -> dict[str, dict | Exception] | None:
+    """Snapshots answering an id-form query from the libraries alone, or None
+    when no library has the title (a lookup has to find it)."""
+    libraries = await asyncio.gather(*(library_index(c) for c in clients), return_exceptions=True)
+    snapshots: dict[str, dict | Exception] = {}
+    found: tuple[SonarrClient | RadarrClient, dict] | None = None
+    for client, library in zip(clients, libraries):
+        if isinstance(library, BaseException):
+            snapshots[client.name] = library  # type: ignore[assignment]
+            continue
+        record = None if found else _find_record(library, id_field, value)
+        if record is not None:
+            found = client, record
+        # a projected library record is no lookup item: an add must look the title up
+        snapshots[client.name] = {"results": [], "library": library, "from_library": True}
+    if found is None:
+        return None
+    client, record = found
+    snapshots[client.name]["results"] = [await _displayable(client, record)]  # type: ignore[index]
+    return snapshots
+
+
+async def _displayable(client: SonarrClient | RadarrClient, record: dict) -> dict:
+    """The title's whole resource from the instance holding it, so the row has
+    the overview and poster a library record leaves out — one small request
+    to that instance, not a metadata lookup. The bare record if it fails."""
+    if not record.get("id"):
+        return record
+    try:
+        if isinstance(client, SonarrClient):
+            return await client.get_series(record["id"])
+        return await client.get_movie(record["id"])
+    except Exception as exc:  # noqa: BLE001 — the record still answers the query
+        logger.debug("no details for %s on %s: %s", record.get("title"), client.name, exc)
+        return record
 
 
 async def _instance_snapshot(client: SonarrClient | RadarrClient, query: str) -> dict:
     """One instance's search results plus its library keyed by external id."""
-    results, library = await asyncio.gather(client.lookup(query), _library_index(client))
+    results, library = await asyncio.gather(_timed_lookup(client, query), library_index(client))
     return {"results": results, "library": library}
 
 
+def _unreachable(instance_name: str, exc: BaseException) -> InstanceStatus:
+    return InstanceStatus(
+        instance=instance_name,
+        state=PresenceState.UNREACHABLE,
+        # httpx timeouts stringify to "" — fall back to the class name
+        error=str(exc) or type(exc).__name__,
+    )
+
+
 def merge_lookups(
     per_instance: dict[str, dict | Exception],
     media_type: MediaType,
     config: MediaConfig,
+    limit: int | None = None,
 ) -> list[AggregatedResult]:
     """Merge per-instance snapshots into one AggregatedResult per unique title.
 
@@ -76,6 +210,13 @@ def merge_lookups(
     each instance's library record (authoritative), not the lookup item. Every
     configured instance gets a status row on every result: NOT_PRESENT when
     its library lacks the title, UNREACHABLE when the instance itself errored.
+    An instance absent from `per_instance`, or whose library hasn't arrived
+    (None), gets a PENDING row — progressive search merges partial answers.
+
+    With a `limit`, only the first `limit` titles (in lookup order) are built
+    at all, so a broad query costs what the rows shown cost. Results keep the
+    lookup item they came from for add_to_instance, except when a snapshot's
+    results are library records (`"from_library"`).
     """
     merged: dict[str, AggregatedResult] = {}
     items_by_key: dict[str, dict[str, dict]] = {}  # key -> instance -> raw lookup item
@@ -84,29 +225,33 @@ def merge_lookups(
         snapshot = per_instance.get(instance.name)
         if not isinstance(snapshot, dict):
             continue
-        client = _client_for(instance, media_type)
+        client = client_for(instance, media_type)
         for item in snapshot["results"]:
             key = _external_key(item, media_type)
             if key not in merged:
-                merged[key] = AggregatedResult(result=client.to_search_result(item))
-            items_by_key.setdefault(key, {})[instance.name] = item
+                if limit is not None and len(merged) >= limit:
+                    continue
+                merged[key] = AggregatedResult(
+                    result=client.to_search_result(item),
+                    lookup_item=None if snapshot.get("from_library") else item,
+                )
+            if not snapshot.get("borrowed"):  # another instance's items say nothing of this one
+                items_by_key.setdefault(key, {})[instance.name] = item
 
     for aggregated_key, aggregated in merged.items():
         result = aggregated.result
         ext_id = result.tvdb_id if media_type == MediaType.TV else result.tmdb_id
         for instance in config.arr_instances(media_type.value):
             snapshot = per_instance.get(instance.name)
-            if not isinstance(snapshot, dict):
+            if snapshot is None or (isinstance(snapshot, dict) and snapshot["library"] is None):
                 aggregated.statuses.append(
-                    InstanceStatus(
-                        instance=instance.name,
-                        state=PresenceState.UNREACHABLE,
-                        # httpx timeouts stringify to "" — fall back to the class name
-                        error=str(snapshot) or type(snapshot).__name__,
-                    )
+                    InstanceStatus(instance=instance.name, state=PresenceState.PENDING)
                 )
                 continue
-            client = _client_for(instance, media_type)
+            if not isinstance(snapshot, dict):
+                aggregated.statuses.append(_unreachable(instance.name, snapshot))
+                continue
+            client = client_for(instance, media_type)
             if ext_id:
                 item = snapshot["library"].get(ext_id)
             else:
@@ -117,24 +262,238 @@ def merge_lookups(
     return list(merged.values())
 
 
+class LiveResults(list[AggregatedResult]):
+    """What `search_everywhere` returns: the results so far, patched in place
+    while `backfill` (None when nothing was left to wait for past the
+    deadline) collects the late answers."""
+
+    backfill: asyncio.Task | None = None
+
+    @property
+    def settled(self) -> bool:
+        """No answers left to come."""
+        return self.backfill is None or self.backfill.done()
+
+    def cancel(self) -> None:
+        """Stop waiting for late answers — a newer search superseded this one."""
+        if self.backfill is not None:
+            self.backfill.cancel()
+
+
 async def search_everywhere(
     query: str,
     media_type: MediaType,
     config: MediaConfig | None = None,
-) -> list[AggregatedResult]:
-    """Search all Sonarr (tv) or Radarr (movie) instances concurrently and merge."""
+    lookup_once: bool = False,
+    deadline: float | None = None,
+    on_backfill: Callable[[list[AggregatedResult]], object] | None = None,
+    limit: int | None = None,
+) -> LiveResults:
+    """Search all Sonarr (tv) or Radarr (movie) instances concurrently and merge.
+
+    With `lookup_once`, the metadata lookup runs on a single instance (the
+    fastest that answers) instead of all of them; every instance still gets
+    its status row from its own library. An id-form query (`tvdb:371980`,
+    `tmdb:603`, `imdb:tt0133093`) for a title some library already holds is
+    answered from the libraries without any lookup; only an id no library
+    has falls back to one. With a `limit`, only that many titles are merged
+    (see merge_lookups).
+
+    With a `deadline` (seconds), returns whatever has been merged by then —
+    instances that haven't answered carry PENDING rows — and the search keeps
+    running in the background: each later answer is patched into the returned
+    results in place (statuses replaced, new titles appended) and
+    `on_backfill` is called with them, so a UI can re-render; the returned
+    `LiveResults` says whether answers are still coming and can cancel them.
+    """
+    updates = search_progressively(query, media_type, config, lookup_once, limit)
+    if deadline is None:
+        results: list[AggregatedResult] = []
+        async for results in updates:
+            pass
+        return LiveResults(results)
+
+    shown = LiveResults()
+    latest: list[AggregatedResult] = []
+    returned = False
+
+    async def _drive() -> None:
+        nonlocal latest
+        async with aclosing(updates):
+            async for update in updates:
+                if not returned:
+                    latest = update
+                    continue
+                _backfill(shown, update)
+                if on_backfill is not None:
+                    on_backfill(shown)
+
+    task = asyncio.get_running_loop().create_task(_drive())
+    try:
+        await asyncio.wait_for(asyncio.shield(task), deadline)
+    except TimeoutError:
+        _backfills.add(task)  # the loop only keeps weak references to tasks
+        task.add_done_callback(_backfill_done)
+        shown.backfill = task
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+    shown.extend(latest)
+    returned = True
+    return shown
+
+
+async def search_many(
+    queries: list[str],
+    media_type: MediaType,
+    config: MediaConfig | None = None,
+    limit: int | None = None,
+) -> AsyncIterator[tuple[str, list[AggregatedResult]]]:
+    """Search every query in one event loop, yielding (query, merged results)
+    as each finishes — not in input order.
+
+    The searches share one library snapshot per instance and the lookup
+    cache; each runs its lookup once, and lookups are held to the
+    per-instance limit (set_lookup_concurrency). Closing the generator early
+    cancels the searches still running.
+    """
     if config is None:
         config = load_media_config()
-    instances = config.arr_instances(media_type.value)
-    if not instances:
-        return []
-
-    clients = [_client_for(i, media_type) for i in instances]
-    snapshots = await asyncio.gather(*(_instance_snapshot(c, query) for c in clients), return_exceptions=True)
-    per_instance: dict[str, dict | Exception] = {
-        c.name: s for c, s in zip(clients, snapshots)  # type: ignore[misc]
-    }
-    return merge_lookups(per_instance, media_type, config)
+    searches = asyncio.Semaphore(_max_lookups * max(len(config.arr_instances(media_type.value)), 1))
+
+    async def _search(query: str) -> tuple[str, list[AggregatedResult]]:
+        async with searches:
+            results = await search_everywhere(query, media_type, config, lookup_once=True, limit=limit)
+        return query, results
+
+    tasks = [asyncio.ensure_future(_search(query)) for query in queries]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            yield await finished
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+# Deadline-bounded searches still filling in their late answers.
+_backfills: set[asyncio.Task] = set()
+
+
+def _backfill(shown: list[AggregatedResult], update: list[AggregatedResult]) -> None:
+    by_key = {aggregated.result.external_key: aggregated for aggregated in shown}
+    for aggregated in update:
+        current = by_key.get(aggregated.result.external_key)
+        if current is None:
+            shown.append(aggregated)
+        else:
+            current.statuses = aggregated.statuses
+
+
+def _backfill_done(task: asyncio.Task) -> None:
+    _backfills.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.debug("search backfill failed: %s", task.exception())
+
+
+async def search_progressively(
+    query: str,
+    media_type: MediaType,
+    config: MediaConfig | None = None,
+    lookup_once: bool = False,
+    limit: int | None = None,
+) -> AsyncIterator[list[AggregatedResult]]:
+    """`search_everywhere`, yielding the merged results again as each instance answers.
+
+    Instances that haven't answered yet carry a PENDING status row, so one slow
+    server no longer holds back what the others already know. Updates without
+    any results are skipped until the last one; the last update is exactly what
+    `search_everywhere` returns. Closing the generator early cancels this
+    search's outstanding requests (shared library fetches carry on).
+    """
+    if config is None:
+        config = load_media_config()
+    clients = [client_for(i, media_type) for i in config.arr_instances(media_type.value)]
+    if not clients:
+        return
+
+    id_query = _id_query(query, media_type)
+    if id_query is not None:
+        # an id some library already holds needs no metadata lookup at all
+        snapshots = await _search_by_id(clients, *id_query)
+        if snapshots is not None:
+            yield merge_lookups(snapshots, media_type, config, limit)
+            return
+        lookup_once = True  # absent everywhere: one lookup finds it for all
+
+    loop = asyncio.get_running_loop()
+    # task -> the client it answers for (None: the shared lookup in lookup-once mode)
+    pending: dict[asyncio.Task, SonarrClient | RadarrClient | None] = {}
+    if lookup_once:
+        pending[loop.create_task(_lookup_anywhere(clients, query))] = None
+        for c in clients:
+            pending[loop.create_task(library_index(c))] = c
+    else:
+        for c in clients:
+            pending[loop.create_task(_instance_snapshot(c, query))] = c
+
+    # lookup-once: the shared lookup's outcome, and each library as it lands
+    lookup: tuple[str, list[dict]] | BaseException | None = None
+    libraries: dict[str, Mapping[int, dict] | BaseException] = {}
+    per_instance: dict[str, dict | Exception] = {}
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                client = pending.pop(task)
+                outcome = task.exception() or task.result()
+                if client is None:
+                    lookup = outcome
+                elif lookup_once:
+                    libraries[client.name] = outcome
+                else:
+                    per_instance[client.name] = outcome
+            if lookup_once:
+                if lookup is None:
+                    continue  # nothing to show before the lookup lands
+                per_instance = _lookup_once_snapshots(clients, lookup, libraries)
+            results = merge_lookups(per_instance, media_type, config, limit)
+            if results or not pending:
+                yield results
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def _lookup_once_snapshots(
+    clients: list[SonarrClient | RadarrClient],
+    lookup: tuple[str, list[dict]] | BaseException,
+    libraries: dict[str, Mapping[int, dict] | BaseException],
+) -> dict[str, dict | Exception]:
+    """Snapshots for lookup-once mode: one metadata lookup, every library.
+
+    Every instance proxies the same external metadata service, so the results
+    only need fetching once; presence comes from each instance's own library.
+    Only the answering instance carries the lookup items (merge falls back to
+    them for titles without an external id, whose `id` is per-instance). If
+    its own library failed, the first instance whose library didn't carries
+    them instead, marked `"borrowed"` — the results still hold for everyone.
+    """
+    if isinstance(lookup, BaseException):
+        return {c.name: lookup for c in clients}  # type: ignore[misc]
+    answered_by, results = lookup
+    carrier = answered_by
+    if isinstance(libraries.get(answered_by), BaseException):
+        carrier = next((c.name for c in clients if not isinstance(libraries.get(c.name), BaseException)), answered_by)
+    snapshots: dict[str, dict | Exception] = {}
+    for c in clients:
+        library = libraries.get(c.name)
+        if isinstance(library, BaseException):
+            snapshots[c.name] = library  # type: ignore[assignment]
+        elif library is not None or c.name == carrier:
+            snapshots[c.name] = {"results": results if c.name == carrier else [], "library": library}
+            if c.name != answered_by and c.name == carrier:
+                snapshots[c.name]["borrowed"] = True
+    return snapshots
 
 
 async def check_plex_availability(
@@ -145,7 +504,7 @@ async def check_plex_availability(
     if config is None:
         config = load_media_config()
     clients = [PlexClient(s) for s in config.plex]
-    aggregated.plex = list(await asyncio.gather(*(c.check_presence(aggregated.result) for c in clients)))
+    aggregated.plex = list(await asyncio.gather(*(plex_presence(c, aggregated.result) for c in clients)))
     return aggregated
 
 
@@ -154,23 +513,38 @@ async def refresh_status(
     config: MediaConfig | None = None,
     include_plex: bool = True,
 ) -> AggregatedResult:
-    """Re-poll every instance (and optionally Plex) for one title by its external ID."""
+    """Re-poll every instance (and optionally Plex) for one title by its external ID.
+
+    Fetches just that title's library record from each instance and patches
+    it into the cached snapshots, so a refresh costs one small request per
+    instance and keeps every other title's presence. Results without an
+    external id fall back to a fresh title search.
+    """
     if config is None:
         config = load_media_config()
-    invalidate_library_cache()  # an explicit refresh must not serve cached presence
     result = aggregated.result
-    # tvdb:/tmdb: keys work as lookup terms; title-keyed results fall back to a title search
-    term = result.title if result.external_key.startswith("title:") else result.external_key
-
-    refreshed = await search_everywhere(term, result.media_type, config)
-    for candidate in refreshed:
-        if candidate.result.external_key == result.external_key:
-            if include_plex:
-                await check_plex_availability(candidate, config)
-            return candidate
+    ext_id = result.tvdb_id if result.media_type == MediaType.TV else result.tmdb_id
+    if not ext_id:
+        for candidate in await search_everywhere(result.title, result.media_type, config):
+            if candidate.result.external_key == result.external_key:
+                if include_plex:
+                    await check_plex_availability(candidate, config)
+                return candidate
+        # Nothing came back (e.g. all instances down) — keep what we had
+        return aggregated
 
-    # Nothing came back (e.g. all instances down) — keep what we had
-    return aggregated
+    clients = [client_for(i, result.media_type) for i in config.arr_instances(result.media_type.value)]
+    records = await asyncio.gather(*(refresh_title(c, ext_id) for c in clients), return_exceptions=True)
+    refreshed = replace(
+        aggregated,
+        statuses=[
+            _unreachable(c.name, record) if isinstance(record, BaseException) else c.to_status(record)
+            for c, record in zip(clients, records)
+        ],
+    )
+    if include_plex:
+        await check_plex_availability(refreshed, config)
+    return refreshed
 
 
 async def enrich_tv_statuses(
@@ -180,8 +554,10 @@ async def enrich_tv_statuses(
     """Replace lookup-derived statuses with authoritative per-series data.
 
     Sonarr lookup responses often omit episode/season statistics for library
-    entries; /api/v3/series/{id} always has them. Only touches instances that
-    have the series; failures keep the lookup-derived status.
+    entries; library records and /api/v3/series/{id} always have them. A fresh
+    library snapshot answers without a round trip; only instances whose
+    snapshot is expired or lacks the series fetch it. Only touches instances
+    that have the series; failures keep the lookup-derived status.
     """
     if config is None:
         config = load_media_config()
@@ -197,8 +573,15 @@ async def enrich_tv_statuses(
     if not targets:
         return aggregated
 
+    tvdb_id = aggregated.result.tvdb_id
+
     async def _refetch(instance: ArrInstance, status: InstanceStatus) -> InstanceStatus:
         client = SonarrClient(instance)
+        snapshot = cached_snapshot(instance.name)
+        if snapshot is not None and snapshot.fresh and tvdb_id:
+            record = snapshot.index.get(tvdb_id)
+            if record is not None and record.get("id") == status.series_id:
+                return client.to_status(record)
         try:
             item = await client.get_series(status.series_id)  # type: ignore[arg-type]
         except Exception:  # noqa: BLE001 — keep the lookup-derived status on failure
@@ -273,34 +656,102 @@ async def add_to_instance(
     if quality_profile:
         instance.quality_profile = quality_profile
 
-    client = _client_for(instance, result.media_type)
+    client = client_for(instance, result.media_type)
+    ext_id = result.tvdb_id if isinstance(client, SonarrClient) else result.tmdb_id
+    if not ext_id:
+        id_name = "TVDB" if isinstance(client, SonarrClient) else "TMDB"
+        return AddResult(instance=instance_name, ok=False, message=f"Result has no {id_name} id")
     try:
-        if isinstance(client, SonarrClient):
-            if not result.tvdb_id:
-                return AddResult(instance=instance_name, ok=False, message="Result has no TVDB id")
-            items = await client.lookup_by_tvdb(result.tvdb_id)
-        else:
-            if not result.tmdb_id:
-                return AddResult(instance=instance_name, ok=False, message="Result has no TMDB id")
-            items = await client.lookup_by_tmdb(result.tmdb_id)
-        if not items:
-            return AddResult(instance=instance_name, ok=False, message="Title not found by external id")
-        item = items[0]
-        if item.get("id"):
+        # presence from the instance's library, add defaults from their cache:
+        # usually neither costs a request, leaving the add itself as the only one
+        library, (profile_id, root_folder) = await asyncio.gather(library_index(client), client.resolve_add_defaults())
+        if ext_id in library:
             return AddResult(instance=instance_name, ok=False, message="Already present on this instance")
-
-        profile_id, root_folder = await client.resolve_add_defaults()
+        item = aggregated.lookup_item
+        if not item or _external_key(item, result.media_type) != result.external_key:
+            # a result that didn't come from a lookup (a stored request, a library hit)
+            if isinstance(client, SonarrClient):
+                items = await client.lookup_by_tvdb(ext_id)
+            else:
+                items = await client.lookup_by_tmdb(ext_id)
+            if not items:
+                return AddResult(instance=instance_name, ok=False, message="Title not found by external id")
+            item = items[0]
         if isinstance(client, SonarrClient):
-            await client.add_series(item, profile_id, root_folder)
+            added = await client.add_series(addable(item), profile_id, root_folder)
         else:
-            await client.add_movie(item, profile_id, root_folder)
+            added = await client.add_movie(addable(item), profile_id, root_folder)
     except Exception as exc:  # noqa: BLE001 — surfaced to the UI as a failed add
+        # the profile or folder may be what the server rejected — ask again next time
+        invalidate_add_defaults(instance_name)
         return AddResult(instance=instance_name, ok=False, message=str(exc))
 
-    invalidate_library_cache(instance_name)  # so the next search/refresh sees the new title
+    # the add response is the new library record — patch it in so the next
+    # search sees the title without refetching the instance's whole library
+    if isinstance(added, dict) and added.get("id"):
+        patch_library(client, ext_id, added)
+    else:
+        invalidate_library_cache(instance_name)
     return AddResult(instance=instance_name, ok=True, message=f"Added '{result.title}' to {instance_name}")
 
 
+async def add_many(
+    queries: list[str],
+    instance_names: list[str],
+    media_type: MediaType,
+    config: MediaConfig | None = None,
+    quality_profile: str = "",
+    concurrency: int = 4,
+    on_result: Callable[[AddResult], object] | None = None,
+) -> list[AddResult]:
+    """Add many titles to each of `instance_names` — `add_to_instance` in bulk.
+
+    Each query (a title, or a tvdb:/tmdb:/imdb: id) resolves to its top
+    search hit. The searches share one event loop, so every library is
+    fetched once, ids some library holds need no lookup, and each add posts
+    the search hit with the instance's cached defaults. At most `concurrency`
+    adds run at a time per instance. Returns one AddResult per query ×
+    instance, in input order, and passes each to `on_result` as it lands.
+    A query without a hit, or resolving to a title an earlier one already
+    claimed, gets failed results instead of a post.
+    """
+    if config is None:
+        config = load_media_config()
+    searches = asyncio.Semaphore(concurrency * max(len(config.arr_instances(media_type.value)), 1))
+    posts: dict[str, asyncio.Semaphore] = {name: asyncio.Semaphore(concurrency) for name in instance_names}
+    claimed: dict[str, str] = {}  # external key -> the query that claimed it
+
+    async def _post(target: AggregatedResult, instance_name: str) -> AddResult:
+        async with posts[instance_name]:
+            return await add_to_instance(target, instance_name, config, quality_profile)
+
+    async def _add(query: str) -> list[AddResult]:
+        async with searches:
+            hits = await search_everywhere(query, media_type, config, lookup_once=True, limit=1)
+        key = hits[0].result.external_key if hits else ""
+        if not hits or key in claimed:
+            message = f"Same title as '{claimed[key]}'" if hits else "No results"
+            results = [AddResult(instance=name, ok=False, message=message) for name in instance_names]
+        else:
+            claimed[key] = query
+            results = list(await asyncio.gather(*(_post(hits[0], name) for name in instance_names)))
+        for add_result in results:
+            add_result.query, add_result.external_key = query, key
+            if on_result is not None:
+                on_result(add_result)
+        return results
+
+    per_query = await asyncio.gather(*(_add(query) for query in queries))
+    return [add_result for results in per_query for add_result in results]
+
+
 def search_and_merge(query: str, media_type: MediaType, config: MediaConfig | None = None):
     """Sync convenience wrapper for CLI/scripts."""
-    return asyncio.run(search_everywhere(query, media_type, config))
+
+    async def _search() -> list[AggregatedResult]:
+        try:
+            return await search_everywhere(query, media_type, config)
+        finally:
+            await close_http_clients()
+
+    return asyncio.run(_search())
@@ -2,19 +2,27 @@
 
 import asyncio
 import json
+from contextlib import aclosing
 
 import typer
 
 from .aggregation import (
+    MAX_LOOKUPS_PER_INSTANCE,
+    add_many,
     add_to_instance,
     check_plex_availability,
     enrich_tv_statuses,
     episodes_everywhere,
     search_everywhere,
+    search_many,
+    search_progressively,
+    set_lookup_concurrency,
 )
-from .config import load_media_config
+from .clients import close_http_clients
+from .config import MediaConfig, load_media_config
 from .health import format_bytes
-from .models import AggregatedResult, MediaType, PresenceState
+from .library import DEFAULT_MAX_STALENESS_SECONDS, set_max_staleness, settle_background
+from .models import AddResult, AggregatedResult, MediaType, PresenceState, to_json
 
 media_app = typer.Typer(name="media", help="Search/add media across all Sonarr/Radarr/Plex instances")
 
@@ -23,9 +31,38 @@ STATE_GLYPHS = {
     PresenceState.MONITORED_INCOMPLETE: "◐",
     PresenceState.NOT_PRESENT: "○",
     PresenceState.UNREACHABLE: "✗",
+    PresenceState.PENDING: "…",
 }
 
 
+def _run(coro, render=None):
+    """asyncio.run that closes the pooled server connections before the loop ends.
+
+    `render` is called with the result as soon as it is ready; background
+    library revalidations then finish (so the saved snapshot is current for
+    the next command) before the loop closes.
+    """
+
+    async def _main():
+        try:
+            result = await coro
+            if render is not None:
+                render(result)
+            await settle_background()
+            return result
+        finally:
+            await close_http_clients()
+
+    return asyncio.run(_main())
+
+
+MAX_AGE_OPTION = typer.Option(
+    DEFAULT_MAX_STALENESS_SECONDS,
+    "--max-age",
+    help="Serve a saved library snapshot up to this many seconds past expiry (0 = always refetch)",
+)
+
+
 def _echo_warnings(config) -> None:
     for warning in config.warnings:
         typer.secho(f"  ! {warning}", fg=typer.colors.YELLOW, err=True)
@@ -49,6 +86,8 @@ def _render_result(aggregated: AggregatedResult) -> None:
                 detail = f"  missing {s.missing_episode_count}/{s.total_episode_count} episodes"
         elif s.state == PresenceState.UNREACHABLE:
             detail = f"  unreachable: {s.error[:60]}"
+        elif s.state == PresenceState.PENDING:
+            detail = "  no answer yet"
         if s.size_on_disk:
             detail += f"  · {format_bytes(s.size_on_disk)}"
         typer.echo(f"    {glyph} {s.instance:<20} {s.state.value}{detail}")
@@ -59,7 +98,13 @@ def _render_result(aggregated: AggregatedResult) -> None:
 
 
 def _dump_json(results: list[AggregatedResult]) -> None:
-    typer.echo(json.dumps([r.model_dump(mode="json") for r in results], indent=2))
+    typer.echo(json.dumps([to_json(r) for r in results], indent=2))
+
+
+def _ndjson_line(results: list[AggregatedResult]) -> str:
+    """One progressive-search update; `pending` empties on the last line."""
+    pending = sorted({s.instance for r in results for s in r.statuses if s.state == PresenceState.PENDING})
+    return json.dumps({"pending": pending, "results": [to_json(r) for r in results]})
 
 
 @media_app.command()
@@ -86,36 +131,79 @@ def instances(output_json: bool = typer.Option(False, "--json", help="Output as
 
 @media_app.command()
 def search(
-    query: str = typer.Argument(..., help="Title to search for"),
+    query: str = typer.Argument(None, help="Title to search for"),
     media_type: MediaType = typer.Option(MediaType.TV, "--type", "-t", help="tv or movie"),
     plex: bool = typer.Option(False, "--plex", "-p", help="Also check Plex watch-readiness"),
     limit: int = typer.Option(5, "--limit", "-n", help="Max results to show"),
+    lookup_once: bool = typer.Option(
+        False, "--lookup-once", help="Run the metadata lookup on one instance; presence still from every library"
+    ),
+    max_age: float = MAX_AGE_OPTION,
     output_json: bool = typer.Option(False, "--json", help="Output as JSON"),
+    ndjson: bool = typer.Option(
+        False, "--ndjson", help="Stream one JSON line per update as each instance answers (pending instances listed)"
+    ),
+    from_file: typer.FileText = typer.Option(
+        None, "--from-file", help="Search every title in this file, one per line ('-' = stdin); streams NDJSON"
+    ),
+    concurrency: int = typer.Option(
+        MAX_LOOKUPS_PER_INSTANCE, "--concurrency", help="With --from-file: lookups in flight per instance"
+    ),
 ):
     """Search every configured instance and show status per instance."""
     config = load_media_config()
+    set_max_staleness(max_age)
     if not config.arr_instances(media_type.value):
         typer.echo(f"No {'sonarr' if media_type == MediaType.TV else 'radarr'} instances configured.")
         _echo_warnings(config)
         raise typer.Exit(1)
-
-    async def _run() -> list[AggregatedResult]:
-        results = (await search_everywhere(query, media_type, config))[:limit]
+    if from_file is not None:
+        set_lookup_concurrency(concurrency)
+        _search_from_file(_read_queries(from_file), media_type, config, limit, plex)
+        return
+    if not query:
+        typer.echo("Give a title, or --from-file.")
+        raise typer.Exit(2)
+
+    async def _search() -> list[AggregatedResult]:
+        if ndjson:
+            results: list[AggregatedResult] = []
+            async for results in search_progressively(query, media_type, config, lookup_once, limit):
+                typer.echo(_ndjson_line(results))
+        else:
+            results = await search_everywhere(query, media_type, config, lookup_once=lookup_once, limit=limit)
         if plex and results:
             await asyncio.gather(*(check_plex_availability(r, config) for r in results))
+            if ndjson:
+                typer.echo(_ndjson_line(results))
         return results
 
-    results = asyncio.run(_run())
+    def _render(results: list[AggregatedResult]) -> None:
+        if ndjson:
+            return  # already streamed
+        if output_json:
+            _dump_json(results)
+            return
+        if not results:
+            typer.echo("No results.")
+        for aggregated in results:
+            _render_result(aggregated)
+        _echo_warnings(config)
 
-    if output_json:
-        _dump_json(results)
-        return
+    _run(_search(), render=_render)
 
-    if not results:
-        typer.echo("No results.")
-    for aggregated in results:
-        _render_result(aggregated)
-    _echo_warnings(config)
+
+def _search_from_file(queries: list[str], media_type: MediaType, config, limit: int, plex: bool) -> None:
+    """One NDJSON line per query, {"query": ..., "results": [...]}, as each finishes."""
+
+    async def _search_all() -> None:
+        async with aclosing(search_many(queries, media_type, config, limit)) as searches:
+            async for query, results in searches:
+                if plex and results:
+                    await asyncio.gather(*(check_plex_availability(r, config) for r in results))
+                typer.echo(json.dumps({"query": query, "results": [to_json(r) for r in results]}))
+
+    _run(_search_all())
 
 
 def _season_label(number: int) -> str:
@@ -127,13 +215,15 @@ def seasons(
     query: str = typer.Argument(..., help="Show title (or tvdb:12345)"),
     index: int = typer.Option(0, "--index", "-i", help="Which search result to inspect (0 = first)"),
     episodes: bool = typer.Option(False, "--episodes", "-e", help="Also list every episode"),
+    max_age: float = MAX_AGE_OPTION,
     output_json: bool = typer.Option(False, "--json", help="Output as JSON"),
 ):
     """Per-season (and optionally per-episode) monitoring/availability on every instance."""
     config = load_media_config()
+    set_max_staleness(max_age)
 
-    async def _run():
-        results = await search_everywhere(query, MediaType.TV, config)
+    async def _inspect():
+        results = await search_everywhere(query, MediaType.TV, config, limit=index + 1)
         if not results:
             return None, {}
         target = results[min(index, len(results) - 1)]
@@ -141,13 +231,13 @@ def seasons(
         eps = await episodes_everywhere(target, config) if episodes else {}
         return target, eps
 
-    target, eps_by_instance = asyncio.run(_run())
+    target, eps_by_instance = _run(_inspect())
     if target is None:
         typer.echo("No results.")
         raise typer.Exit(1)
 
     if output_json:
-        data = target.model_dump(mode="json")
+        data = to_json(target)
         data["episodes"] = {
             name: [e.model_dump(mode="json") for e in eps] for name, eps in eps_by_instance.items()
         }
@@ -171,7 +261,7 @@ def seasons(
         typer.secho(f"\n  {STATE_GLYPHS[status.state]} {status.instance}{summary}", bold=True)
 
         eps = eps_by_instance.get(status.instance, [])
-        for season in sorted(status.seasons, key=lambda s: (s.season_number == 0, s.season_number)):
+        for season in sorted(status.season_details(), key=lambda s: (s.season_number == 0, s.season_number)):
             mon = "monitored  " if season.monitored else "unmonitored"
             denominator = season.total_episode_count or season.episode_count
             counts = f"{season.episode_file_count}/{denominator}" if denominator else "—"
@@ -188,16 +278,27 @@ def seasons(
 
 @media_app.command()
 def add(
-    query: str = typer.Argument(..., help="Title (or tvdb:12345 / tmdb:12345) to add"),
-    to: str = typer.Option(..., "--to", help="Instance name to add to (see `media instances`)"),
+    query: str = typer.Argument(None, help="Title (or tvdb:12345 / tmdb:12345) to add"),
+    to: list[str] = typer.Option(..., "--to", help="Instance name to add to (see `media instances`); repeatable"),
     media_type: MediaType = typer.Option(MediaType.TV, "--type", "-t", help="tv or movie"),
     profile: str = typer.Option("", "--profile", help="Quality profile name (default: instance default)"),
+    from_file: typer.FileText = typer.Option(
+        None, "--from-file", help="Add every title or id in this file, one per line ('-' = stdin, # comments)"
+    ),
+    concurrency: int = typer.Option(4, "--concurrency", help="With --from-file: adds in flight per instance"),
     yes: bool = typer.Option(False, "--yes", "-y", help="Skip confirmation"),
     output_json: bool = typer.Option(False, "--json", help="Output as JSON"),
+    ndjson: bool = typer.Option(False, "--ndjson", help="With --from-file: one JSON line per result as it lands"),
 ):
-    """Add the top search result to a specific instance."""
+    """Add the top search result to specific instances (or a whole file of titles)."""
     config = load_media_config()
-    results = asyncio.run(search_everywhere(query, media_type, config))
+    if from_file is not None:
+        _add_from_file(_read_queries(from_file), to, media_type, config, profile, concurrency, yes, output_json, ndjson)
+        return
+    if not query:
+        typer.echo("Give a title, or --from-file.")
+        raise typer.Exit(2)
+    results = _run(search_everywhere(query, media_type, config, limit=1))
     if not results:
         typer.echo("No results.")
         raise typer.Exit(1)
@@ -205,13 +306,60 @@ def add(
     target = results[0]
     if not yes and not output_json:
         _render_result(target)
-        typer.confirm(f"\nAdd '{target.result.title}' to {to}?", abort=True)
+        typer.confirm(f"\nAdd '{target.result.title}' to {', '.join(to)}?", abort=True)
+
+    async def _add_all() -> list[AddResult]:
+        return [await add_to_instance(target, name, config, quality_profile=profile) for name in to]
 
-    add_result = asyncio.run(add_to_instance(target, to, config, quality_profile=profile))
+    add_results = _run(_add_all())
     if output_json:
-        typer.echo(add_result.model_dump_json(indent=2))
+        if len(add_results) == 1:
+            typer.echo(add_results[0].model_dump_json(indent=2))
+        else:
+            typer.echo(json.dumps([r.model_dump(mode="json") for r in add_results], indent=2))
     else:
-        icon = "✓" if add_result.ok else "✗"
-        typer.echo(f"  {icon} {add_result.message}")
-    if not add_result.ok:
+        for add_result in add_results:
+            icon = "✓" if add_result.ok else "✗"
+            typer.echo(f"  {icon} {add_result.message}")
+    if not all(r.ok for r in add_results):
+        raise typer.Exit(1)
+
+
+def _read_queries(lines) -> list[str]:
+    """Non-blank, non-comment lines of a title list."""
+    return [line.strip() for line in lines if line.strip() and not line.lstrip().startswith("#")]
+
+
+def _add_from_file(
+    queries: list[str],
+    to: list[str],
+    media_type: MediaType,
+    config: MediaConfig,
+    profile: str,
+    concurrency: int,
+    yes: bool,
+    output_json: bool,
+    ndjson: bool,
+) -> None:
+    if not queries:
+        typer.echo("No titles in the file.")
+        raise typer.Exit(1)
+    if not yes and not (output_json or ndjson):
+        typer.confirm(f"Add up to {len(queries)} titles to {', '.join(to)}?", abort=True)
+
+    def _emit(add_result: AddResult) -> None:
+        if ndjson:
+            typer.echo(add_result.model_dump_json())
+        elif not output_json:
+            icon = "✓" if add_result.ok else "✗"
+            typer.echo(f"  {icon} {add_result.query}: {add_result.message}")
+
+    add_results = _run(add_many(queries, to, media_type, config, profile, concurrency, on_result=_emit))
+    if output_json:
+        typer.echo(json.dumps([r.model_dump(mode="json") for r in add_results], indent=2))
+    elif not ndjson:
+        added = sum(r.ok for r in add_results)
+        typer.echo(f"\n  {added} added, {len(add_results) - added} not added ({len(queries)} titles × {len(to)})")
+        _echo_warnings(config)
+    if not all(r.ok for r in add_results):
         raise typer.Exit(1)
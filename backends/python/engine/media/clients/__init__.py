@@ -1,5 +1,6 @@
 from .plex import PlexClient
+from .pool import close_http_clients
 from .radarr import RadarrClient
 from .sonarr import SonarrClient
 
-__all__ = ["PlexClient", "RadarrClient", "SonarrClient"]
+__all__ = ["PlexClient", "RadarrClient", "SonarrClient", "close_http_clients"]
@@ -1,19 +1,72 @@
 """Shared HTTP plumbing for Sonarr and Radarr (both expose the same v3 API shape)."""
 
+import asyncio
 import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
 from typing import Any
 
 import httpx
 
 from ..config import ArrInstance
+from .breaker import breaker_for
+from .inflight import coalesce
+from .jsonstream import FieldSpec, iter_json_array, project
+from .latency import DEFAULT_TIMEOUT, EndpointClass, tracker_for
+from .pool import pool_limits, shared_client
 
-DEFAULT_TIMEOUT = 8.0
+# How long an instance's quality profiles and root folders are trusted for adds.
+# They change when someone edits the server's settings, which is rare; a
+# failed add drops them early (invalidate_add_defaults).
+ADD_DEFAULTS_TTL_SECONDS = 15 * 60.0
+# instance name -> (expires_at, the configured (profile, root folder) the pick
+# honored, (quality profile id, root folder path))
+_add_defaults: dict[str, tuple[float, tuple[str, str], tuple[int, str]]] = {}
 
-# Lookup proxies to the arr's external metadata service and a full library dump
-# runs to tens of MB on a big instance — both can legitimately outlast the
-# default read window while the server is perfectly healthy. Connect stays at
-# the default so a genuinely down host still fails fast.
-SLOW_READ_TIMEOUT = httpx.Timeout(DEFAULT_TIMEOUT, read=30.0)
+# What a lookup item carries only because some instance already has the title:
+# its library id, folder and settings there. An add posts the item to another
+# instance, which must not inherit them.
+_LIBRARY_ONLY_FIELDS = frozenset(
+    {
+        "id",
+        "path",
+        "folder",
+        "added",
+        "qualityProfileId",
+        "languageProfileId",
+        "rootFolderPath",
+        "tags",
+        "statistics",
+        "movieFile",
+        "hasFile",
+        "sizeOnDisk",
+    }
+)
+
+
+def invalidate_add_defaults(instance_name: str | None = None) -> None:
+    """Forget cached add defaults for one instance, or all of them."""
+    if instance_name is None:
+        _add_defaults.clear()
+    else:
+        _add_defaults.pop(instance_name, None)
+
+
+def addable(item: dict) -> dict:
+    """A lookup item stripped of any instance's library fields, ready to post.
+
+    Seasons keep only their number: which ones are monitored (and their
+    statistics) is the answering instance's business. The new series
+    monitors every regular season, not the specials.
+    """
+    payload = {key: value for key, value in item.items() if key not in _LIBRARY_ONLY_FIELDS}
+    if "seasons" in payload:
+        payload["seasons"] = [
+            {"seasonNumber": season["seasonNumber"], "monitored": season["seasonNumber"] > 0}
+            for season in payload["seasons"] or ()
+        ]
+    return payload
 
 
 class ArrClientBase:
@@ -25,39 +78,127 @@ class ArrClientBase:
     def name(self) -> str:
         return self.instance.name
 
-    def _client(self, timeout: httpx.Timeout | float | None = None) -> httpx.AsyncClient:
+    def _client(self) -> httpx.AsyncClient:
+        """This instance's pooled keep-alive client (shared by every ArrClientBase
+        built for the same instance). Timeouts are set per request."""
+        return shared_client(f"arr:{self.name}:{self.instance.base_url}", self._new_client)
+
+    def _new_client(self) -> httpx.AsyncClient:
         return httpx.AsyncClient(
             base_url=self.instance.base_url,
             headers={"X-Api-Key": self.instance.api_key},
-            timeout=self.timeout if timeout is None else timeout,
+            timeout=self.timeout,
+            limits=pool_limits(self.instance.pool_size),
         )
 
+    @asynccontextmanager
+    async def _guarded(self, kind: EndpointClass) -> AsyncIterator[httpx.Timeout]:
+        """Wrap one request in this instance's circuit breaker — fails fast with
+        CircuitOpenError while the instance is known to be down — and time it
+        into its latency histogram. Yields the timeout derived from that history."""
+        breaker = breaker_for(self.name)
+        tracker = tracker_for(self.name)
+        breaker.before_request()
+        start = time.perf_counter()
+        try:
+            yield tracker.timeout(kind, self.instance.timeouts)
+        except httpx.ReadTimeout:
+            # the server accepted the connection; a timed-out read is a (censored)
+            # latency sample, so a consistently slow class earns a longer window
+            tracker.record(kind, time.perf_counter() - start)
+            breaker.record_failure()
+            raise
+        except httpx.PoolTimeout:
+            # never left the process: our own pool was busy, the host is not to blame
+            breaker.abandon()
+            raise
+        except httpx.TransportError:
+            breaker.record_failure()
+            raise
+        except httpx.HTTPStatusError:
+            breaker.record_success()  # an error status still means the host answered
+            raise
+        except BaseException:
+            breaker.abandon()
+            raise
+        tracker.record(kind, time.perf_counter() - start)
+        breaker.record_success()
+
+    async def _send(self, method: str, path: str, kind: EndpointClass, **kwargs: Any) -> httpx.Response:
+        async with self._guarded(kind) as timeout:
+            return await self._client().request(method, path, timeout=timeout, **kwargs)
+
     async def _get(
         self,
         path: str,
         params: dict | None = None,
-        timeout: httpx.Timeout | float | None = None,
+        kind: EndpointClass = EndpointClass.DEFAULT,
         retries: int = 1,
     ) -> Any:
         """GET with retry on transient transport errors — one dropped connection
-        or slow read must not surface a healthy server as unreachable."""
+        or slow read must not surface a healthy server as unreachable.
+
+        Concurrent identical GETs to this instance share one request.
+        """
+        key = (self.name, self.instance.base_url, path, tuple(sorted((params or {}).items())), retries)
+        return await coalesce(key, lambda: self._with_retry(kind, retries, lambda: self._get_json(path, params, kind)))
+
+    async def _get_json(self, path: str, params: dict | None, kind: EndpointClass) -> Any:
+        resp = await self._send("GET", path, kind, params=params)
+        resp.raise_for_status()
+        return resp.json()
+
+    async def _get_projected(
+        self, path: str, fields: FieldSpec, kind: EndpointClass = EndpointClass.LIBRARY, retries: int = 1
+    ) -> list[dict]:
+        """GET a JSON array, streamed and parsed record by record, keeping only
+        `fields` of each record. For the big endpoints (full library dumps).
+
+        Concurrent calls for the same path share one request, as with `_get`.
+        """
+        key = (self.name, self.instance.base_url, path, "projected", retries)
+        return await coalesce(
+            key, lambda: self._with_retry(kind, retries, lambda: self._stream_projected(path, fields, kind))
+        )
+
+    async def _stream_projected(self, path: str, fields: FieldSpec, kind: EndpointClass) -> list[dict]:
+        async with self._guarded(kind) as timeout:
+            async with self._client().stream("GET", path, timeout=timeout) as resp:
+                resp.raise_for_status()
+                return [project(record, fields) async for record in iter_json_array(resp.aiter_bytes())]
+
+    async def _with_retry(self, kind: EndpointClass, retries: int, attempt: Callable[[], Awaitable[Any]]) -> Any:
+        tracker = tracker_for(self.name)
         last_exc: httpx.TransportError | None = None
         for _ in range(retries + 1):
             try:
-                async with self._client(timeout) as client:
-                    resp = await client.get(path, params=params)
-                    resp.raise_for_status()
-                    return resp.json()
+                return await attempt()
             except httpx.TransportError as exc:
                 last_exc = exc
+                if not tracker.should_retry(kind, exc, tracker.timeout(kind, self.instance.timeouts).read):
+                    break
         assert last_exc is not None
         raise last_exc
 
+    async def _history_since(self, since: float) -> list[dict]:
+        """History events (grabs, imports, file deletes, renames...) at or after
+        `since`, epoch seconds — what a delta library sync replays."""
+        date = datetime.fromtimestamp(since, UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+        return await self._get("/api/v3/history/since", params={"date": date})
+
+    async def _record_or_none(self, path: str, fields: FieldSpec) -> dict | None:
+        """One library record by the arr's own id (projected), or None once it's gone."""
+        try:
+            return project(await self._get(path), fields)
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code == 404:
+                return None
+            raise
+
     async def _post(self, path: str, payload: dict) -> Any:
-        async with self._client() as client:
-            resp = await client.post(path, json=payload)
-            resp.raise_for_status()
-            return resp.json()
+        resp = await self._send("POST", path, EndpointClass.ADD, json=payload)
+        resp.raise_for_status()
+        return resp.json()
 
     async def ping_ms(self) -> float:
         """Round-trip time of the cheapest authenticated endpoint, in milliseconds.
@@ -66,7 +207,7 @@ class ArrClientBase:
         liveness should reflect a single honest round trip.
         """
         start = time.perf_counter()
-        await self._get("/api/v3/system/status", retries=0)
+        await self._get("/api/v3/system/status", kind=EndpointClass.PING, retries=0)
         return (time.perf_counter() - start) * 1000
 
     async def disk_space(self) -> list[dict]:
@@ -83,9 +224,24 @@ class ArrClientBase:
         """Pick the quality profile id and root folder path to use for an add.
 
         Honors the instance's configured preferences, falling back to the first
-        of each the server offers.
+        of each the server offers. The pick is cached per instance for
+        ADD_DEFAULTS_TTL_SECONDS, so repeated adds cost no extra requests.
         """
-        profiles = await self.quality_profiles()
+        wanted = (self.instance.quality_profile, self.instance.root_folder)
+        cached = _add_defaults.get(self.name)
+        if cached is not None and cached[0] > time.monotonic() and cached[1] == wanted:
+            return cached[2]
+
+        async def _fetch() -> tuple[int, str]:
+            profiles, folders = await asyncio.gather(self.quality_profiles(), self.root_folders())
+            defaults = self._pick_add_defaults(profiles, folders)
+            _add_defaults[self.name] = (time.monotonic() + ADD_DEFAULTS_TTL_SECONDS, wanted, defaults)
+            return defaults
+
+        # a bulk add's first posts to an instance all wait on one fetch
+        return await coalesce(("add_defaults", self.name, wanted), _fetch)
+
+    def _pick_add_defaults(self, profiles: list[dict], folders: list[dict]) -> tuple[int, str]:
         if not profiles:
             raise RuntimeError(f"{self.name}: no quality profiles configured on server")
         profile_id = profiles[0]["id"]
@@ -99,7 +255,6 @@ class ArrClientBase:
                     f"{self.name}: quality profile '{self.instance.quality_profile}' not found on server"
                 )
 
-        folders = await self.root_folders()
         if not folders:
             raise RuntimeError(f"{self.name}: no root folders configured on server")
         root_path = folders[0]["path"]
@@ -114,6 +269,13 @@ class ArrClientBase:
         return profile_id, root_path
 
 
+def imdb_number(record: dict) -> int:
+    """The number in a record's IMDb id ("tt0133093" -> 133093), 0 without one —
+    an int64 column can hold it (engine/media/columns)."""
+    imdb_id = record.get("imdbId") or ""
+    return int(imdb_id[2:]) if imdb_id[:2] == "tt" and imdb_id[2:].isdigit() else 0
+
+
 def poster_url(item: dict) -> str:
     for image in item.get("images", []):
         if image.get("coverType") == "poster":
@@ -0,0 +1,101 @@
+"""Per-server circuit breakers, so a dead host fails fast instead of timing out.
+
+Without one, every search, health poll and detail view waits out the full
+timeout (plus a retry) on a server that is switched off before calling it
+unreachable. A breaker counts consecutive transport failures per server;
+past the threshold it opens and every request fails immediately with
+CircuitOpenError, which the aggregation layer renders as UNREACHABLE like any
+other failure. After a backoff it half-opens: one probe request goes through,
+and its outcome closes the breaker or re-opens it with a doubled backoff.
+
+Only transport failures count — an HTTP error status means the host answered,
+and a PoolTimeout (our own connection pool was full) never reached it.
+"""
+
+import time
+from collections.abc import Callable
+from enum import Enum
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending a request to a server whose breaker is open."""
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        base_backoff: float = 5.0,
+        max_backoff: float = 120.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._clock = clock
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self._trips = 0  # consecutive opens without a success in between — drives the backoff
+        self._retry_at = 0.0
+        self._probing = False
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until an open breaker lets a probe through (0 when not open)."""
+        if self.state != CircuitState.OPEN:
+            return 0.0
+        return max(self._retry_at - self._clock(), 0.0)
+
+    def before_request(self) -> None:
+        """Gate one request: raises CircuitOpenError when it must not be sent."""
+        if self.state == CircuitState.OPEN:
+            if self._clock() < self._retry_at:
+                raise CircuitOpenError(f"{self.name}: circuit open, retrying in {self.retry_in:.0f}s")
+            self.state = CircuitState.HALF_OPEN
+        if self.state == CircuitState.HALF_OPEN:
+            if self._probing:
+                raise CircuitOpenError(f"{self.name}: circuit half-open, probe in flight")
+            self._probing = True
+
+    def record_success(self) -> None:
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self._trips = 0
+        self._probing = False
+
+    def abandon(self) -> None:
+        """A request ended without a verdict (cancelled) — free the probe slot."""
+        self._probing = False
+
+    def record_failure(self) -> None:
+        if self.state == CircuitState.OPEN:
+            return  # requests sent before it opened, failing late: the trip already counted them
+        self.failures += 1
+        if self.state == CircuitState.HALF_OPEN or self.failures >= self.failure_threshold:
+            self._trip()
+
+    def _trip(self) -> None:
+        self._trips += 1
+        backoff = min(self.base_backoff * 2 ** (self._trips - 1), self.max_backoff)
+        self.state = CircuitState.OPEN
+        self._retry_at = self._clock() + backoff
+        self._probing = False
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def breaker_for(name: str) -> CircuitBreaker:
+    """The process-wide breaker for one configured server (by service name)."""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        breaker = _breakers[name] = CircuitBreaker(name)
+    return breaker
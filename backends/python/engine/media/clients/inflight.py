@@ -0,0 +1,38 @@
+"""Single-flight coalescing: concurrent callers of the same request share one fetch.
+
+Several browser tabs searching at once, or a health poll landing while a
+search refetches an expired library, would otherwise each download the same
+multi-MB library dump (or run the same slow lookup) in parallel. The first
+caller starts the fetch; everyone who asks for the same key before it
+finishes awaits that one task. Only for idempotent reads.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from functools import partial
+from typing import Any
+
+_inflight: dict[tuple[int, Hashable], asyncio.Task] = {}
+
+
+def _finished(key: tuple[int, Hashable], task: asyncio.Task) -> None:
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    if not task.cancelled():
+        task.exception()  # mark retrieved — every waiter may have been cancelled
+
+
+async def coalesce(key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    """Await the in-flight fetch for `key`, starting it if nobody has.
+
+    The shared task is shielded: one caller giving up (a superseded
+    search-as-you-type keystroke) never cancels the fetch the others await.
+    """
+    loop = asyncio.get_running_loop()
+    full_key = (id(loop), key)
+    task = _inflight.get(full_key)
+    if task is None:
+        task = loop.create_task(fetch())
+        _inflight[full_key] = task
+        task.add_done_callback(partial(_finished, full_key))
+    return await asyncio.shield(task)
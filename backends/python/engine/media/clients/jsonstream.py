@@ -0,0 +1,96 @@
+"""Incremental parsing of top-level JSON arrays, keeping only the fields we use.
+
+A full library dump is tens of MB of JSON on a big instance. `resp.json()`
+holds the whole body, then the whole decoded tree, and the library cache kept
+that tree alive — alternate titles, image lists, ratings, paths, tags and all —
+when presence only ever reads ids, statistics, seasons and a few flags.
+`iter_json_array` decodes one record at a time as the body streams in, and
+`project` cuts each record down to a field spec before the next is decoded,
+so neither the body nor the unprojected tree is ever resident in full.
+"""
+
+import codecs
+import json
+from collections.abc import AsyncIterator, Mapping
+from typing import Any
+
+# A field spec maps key -> None (keep the value as is) or a nested spec,
+# applied to a dict value or to every dict in a list value.
+FieldSpec = Mapping[str, "FieldSpec | None"]
+
+_WHITESPACE = " \t\n\r"
+_decoder = json.JSONDecoder()
+
+
+def project(value: Any, spec: FieldSpec) -> Any:
+    """`value` cut down to the keys in `spec` (recursively; lists element-wise)."""
+    if isinstance(value, list):
+        return [project(v, spec) for v in value]
+    if not isinstance(value, dict):
+        return value
+    return {key: value[key] if sub is None else project(value[key], sub) for key, sub in spec.items() if key in value}
+
+
+def _skip(buf: str, pos: int, chars: str) -> int:
+    while pos < len(buf) and buf[pos] in chars:
+        pos += 1
+    return pos
+
+
+async def iter_json_array(chunks: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+    """Yield each element of a JSON array as its bytes arrive.
+
+    Raises ValueError when the body isn't a well-formed top-level array.
+    """
+    text = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    pos = 0
+    opened = closed = False
+    done = False
+    while not done:
+        try:
+            chunk = await anext(chunks)
+        except StopAsyncIteration:
+            buf += text.decode(b"", final=True)
+            done = True
+        else:
+            buf += text.decode(chunk)
+
+        while True:
+            pos = _skip(buf, pos, _WHITESPACE)
+            if pos == len(buf):
+                break
+            if not opened:
+                if buf[pos] != "[":
+                    raise ValueError("expected a JSON array")
+                opened = True
+                pos += 1
+                continue
+            if closed:
+                raise ValueError("trailing data after JSON array")
+            if buf[pos] == "]":
+                closed = True
+                pos += 1
+                continue
+            if buf[pos] == ",":
+                pos = _skip(buf, pos + 1, _WHITESPACE)
+                if pos == len(buf):
+                    break
+            try:
+                element, end = _decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if done:
+                    raise ValueError("truncated JSON array") from None
+                break  # the element is still arriving
+            end = _skip(buf, end, _WHITESPACE)
+            if end == len(buf) or buf[end] not in ",]":
+                if done:
+                    raise ValueError("malformed JSON array")
+                break  # a bare number may continue in the next chunk — decode it again then
+            pos = end
+            yield element
+
+        buf, pos = buf[pos:], 0
+
+    if not closed:
+        raise ValueError("truncated JSON array")
@@ -0,0 +1,115 @@
+"""Rolling latency histograms per server, and the timeouts derived from them.
+
+One global timeout fits nobody: an instance on the LAN answers a ping in 3 ms,
+one across Tailscale in 150 ms, and a library dump on a big instance takes
+seconds either way. Each server keeps a window of recent request durations per
+endpoint class; timeouts come from the observed p99 with generous headroom,
+so a healthy-but-slow server stops being flagged unreachable, while a dead
+host that normally connects in milliseconds is given up on in a fraction of
+a second. Until a class has enough samples the cold defaults apply.
+Per-service overrides come from the `timeouts` field in hosts.json.
+"""
+
+import statistics
+from collections import deque
+from enum import Enum
+
+import httpx
+
+DEFAULT_TIMEOUT = 8.0
+
+
+class EndpointClass(str, Enum):
+    PING = "ping"
+    LOOKUP = "lookup"  # proxies to the external metadata service
+    LIBRARY = "library"  # full library dumps — tens of MB on a big instance
+    ADD = "add"
+    DEFAULT = "default"  # everything else: diskspace, rootfolder, single records
+
+
+# Read timeouts before any samples exist. Lookup and library dumps can
+# legitimately outlast the default window while the server is perfectly healthy.
+COLD_READ_TIMEOUTS = {
+    EndpointClass.PING: DEFAULT_TIMEOUT,
+    EndpointClass.LOOKUP: 30.0,
+    EndpointClass.LIBRARY: 30.0,
+    EndpointClass.ADD: 30.0,
+    EndpointClass.DEFAULT: DEFAULT_TIMEOUT,
+}
+
+# Bounds on derived read timeouts — never shorter than the floor (jitter on a
+# fast LAN), never longer than the ceiling (a wedged server must still fail).
+READ_FLOOR = 2.0
+READ_CEILINGS = {
+    EndpointClass.PING: 15.0,
+    EndpointClass.LOOKUP: 90.0,
+    EndpointClass.LIBRARY: 180.0,
+    EndpointClass.ADD: 90.0,
+    EndpointClass.DEFAULT: 30.0,
+}
+CONNECT_FLOOR = 0.25
+HEADROOM = 3.0  # timeout = observed p99 x headroom
+
+SAMPLE_WINDOW = 100
+MIN_SAMPLES = 5
+
+
+class LatencyTracker:
+    """Recent request durations (seconds) for one server, per endpoint class."""
+
+    def __init__(self, window: int = SAMPLE_WINDOW):
+        self._samples: dict[EndpointClass, deque[float]] = {k: deque(maxlen=window) for k in EndpointClass}
+
+    def record(self, kind: EndpointClass, seconds: float) -> None:
+        self._samples[kind].append(seconds)
+
+    def percentile(self, kind: EndpointClass, pct: int) -> float | None:
+        """The pct-th percentile duration, or None until MIN_SAMPLES exist."""
+        samples = self._samples[kind]
+        if len(samples) < MIN_SAMPLES:
+            return None
+        return statistics.quantiles(samples, n=100, method="inclusive")[pct - 1]
+
+    def read_timeout(self, kind: EndpointClass) -> float:
+        p99 = self.percentile(kind, 99)
+        if p99 is None:
+            return COLD_READ_TIMEOUTS[kind]
+        return min(max(p99 * HEADROOM, READ_FLOOR), READ_CEILINGS[kind])
+
+    def connect_timeout(self) -> float:
+        """From the ping class — the closest thing to a bare round trip."""
+        p99 = self.percentile(EndpointClass.PING, 99)
+        if p99 is None:
+            return DEFAULT_TIMEOUT
+        return min(max(p99 * HEADROOM, CONNECT_FLOOR), DEFAULT_TIMEOUT)
+
+    def timeout(self, kind: EndpointClass, overrides: dict[str, float] | None = None) -> httpx.Timeout:
+        """Per-request timeout; `overrides` (from hosts.json) win per class and for connect."""
+        overrides = overrides or {}
+        read = overrides.get(kind.value) or self.read_timeout(kind)
+        connect = overrides.get("connect") or min(self.connect_timeout(), read)
+        return httpx.Timeout(read, connect=connect)
+
+    def should_retry(self, kind: EndpointClass, exc: httpx.TransportError, read_timeout: float) -> bool:
+        """Whether a failed attempt is worth repeating.
+
+        A read timeout on a class that routinely runs close to its window is
+        the server being slow, not a blip — retrying only doubles the wait.
+        Connection-level failures are cheap to retry (and the breaker stops a
+        dead host from being retried forever).
+        """
+        if not isinstance(exc, httpx.ReadTimeout):
+            return True
+        p95 = self.percentile(kind, 95)
+        return p95 is None or p95 < read_timeout / 2
+
+
+_trackers: dict[str, LatencyTracker] = {}
+
+
+def tracker_for(name: str) -> LatencyTracker:
+    """The process-wide latency tracker for one configured server (by service name)."""
+    tracker = _trackers.get(name)
+    if tracker is None:
+        tracker = _trackers[name] = LatencyTracker()
+    return tracker
@@ -0,0 +1,115 @@
+"""Process-wide LRU + TTL cache of metadata lookup answers.
+
+A Sonarr/Radarr lookup proxies to the arr's external metadata service and is
+the slowest call a search makes. Search-as-you-type asks for "seve", "sever",
+"severa"... and people search the same title again minutes later, from the
+web UI, the TUI or a CLI loop in the same process. Answers are cached per
+(media type, normalized term), so every instance and every session shares
+them; concurrent misses for one key share one lookup (inflight.coalesce).
+
+Entries expire after a TTL — new releases and renamed titles show up without
+a restart — and the least recently used entry is evicted past `max_entries`.
+Failed lookups are never cached, nor shared with the other instances
+waiting on them. `stats()` reports hits, misses and evictions.
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from .inflight import coalesce
+
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_TTL_SECONDS = 10 * 60.0
+
+
+def normalize_term(term: str) -> str:
+    """'  Severance ' and 'severance' are one query."""
+    return " ".join(term.casefold().split())
+
+
+@dataclass
+class CachedLookup:
+    instance: str  # who answered — its items carry its own library ids
+    items: list[dict]
+    expires_at: float
+
+
+class LookupCache:
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[tuple[str, str], CachedLookup] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, media_type: str, term: str) -> CachedLookup | None:
+        """The live entry for the query (counted as a hit or a miss)."""
+        key = (media_type, normalize_term(term))
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= self._clock():
+            del self._entries[key]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, media_type: str, term: str, instance: str, items: list[dict]) -> CachedLookup:
+        key = (media_type, normalize_term(term))
+        entry = self._entries[key] = CachedLookup(instance=instance, items=items, expires_at=self._clock() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    async def fetch(
+        self, media_type: str, term: str, instance: str, lookup: Callable[[], Awaitable[list[dict]]]
+    ) -> CachedLookup:
+        """The cached answer, or `lookup()`'s (run once however many ask) stored.
+
+        Only answers are shared: when the lookup this caller joined was another
+        instance's and it failed, this instance runs its own — one dead
+        server must not fail the others' searches.
+        """
+        entry = self.get(media_type, term)
+        if entry is not None:
+            return entry
+        ran_own = False
+
+        async def _miss() -> CachedLookup:
+            nonlocal ran_own
+            ran_own = True
+            return self.put(media_type, term, instance, await lookup())
+
+        try:
+            return await coalesce(("lookup", media_type, normalize_term(term)), _miss)
+        except Exception:
+            if ran_own:
+                raise
+        return self.put(media_type, term, instance, await lookup())
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+_cache = LookupCache()
+
+
+def lookup_cache() -> LookupCache:
+    """The process-wide cache every search shares."""
+    return _cache
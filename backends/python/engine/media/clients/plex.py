@@ -1,19 +1,120 @@
+import asyncio
 import time
 
 import httpx
 
 from ..config import PlexServer
-from ..models import MediaSearchResult, MediaType, PlexAvailability
-
-DEFAULT_TIMEOUT = 8.0
+from ..models import MediaSearchResult, MediaType
+from .breaker import breaker_for
+from .latency import DEFAULT_TIMEOUT, EndpointClass, tracker_for
 
 # Plex library item types per media type
 _PLEX_TYPES = {MediaType.TV: "show", MediaType.MOVIE: "movie"}
 
 
+def _wanted_guids(result: MediaSearchResult) -> list[str]:
+    guids = []
+    if result.tvdb_id:
+        guids.append(f"tvdb://{result.tvdb_id}")
+    if result.tmdb_id:
+        guids.append(f"tmdb://{result.tmdb_id}")
+    if result.imdb_id:
+        guids.append(f"imdb://{result.imdb_id}")
+    return guids
+
+
+class PlexIndex:
+    """Every show and movie on one Plex server, keyed by external GUID.
+
+    Built from the section listings (includeGuids), so any number of titles
+    is answered from memory — and matched by TVDB/TMDB/IMDb id, never by a
+    title string that may differ between Plex and the arr. Items Plex never
+    matched to an agent (no GUIDs) fall back to exact title + year (±1).
+
+    Kept current by `PlexClient.sync_index`, which applies per-section deltas;
+    `watermarks` is the newest updatedAt seen in each section.
+    """
+
+    def __init__(self) -> None:
+        self.items: dict[str, dict] = {}  # ratingKey -> compact item
+        self.watermarks: dict[str, int] = {}  # section key -> newest updatedAt
+        self._by_guid: dict[tuple[str, str], set[str]] = {}  # (type, guid) -> ratingKeys
+        self._by_title: dict[tuple[str, str], set[str]] = {}  # (type, casefold title) -> untagged ratingKeys
+        self._section_sizes: dict[str, int] = {}
+
+    def add(self, item: dict, section: str = "") -> None:
+        """Add (or replace) one item from a section listing."""
+        key = str(item.get("ratingKey", ""))
+        if not key or item.get("type") not in _PLEX_TYPES.values():
+            return
+        self.remove(key)
+        compact = {
+            "type": item["type"],
+            "section": section,
+            "title": item.get("title", ""),
+            "year": item.get("year"),
+            "guids": [g.get("id", "") for g in item.get("Guid", []) if g.get("id")],
+            "updatedAt": item.get("updatedAt") or item.get("addedAt") or 0,
+        }
+        self.items[key] = compact
+        self._section_sizes[section] = self._section_sizes.get(section, 0) + 1
+        self.watermarks[section] = max(self.watermarks.get(section, 0), compact["updatedAt"])
+        for guid in compact["guids"]:
+            self._by_guid.setdefault((compact["type"], guid), set()).add(key)
+        if not compact["guids"]:
+            self._by_title.setdefault((compact["type"], compact["title"].casefold()), set()).add(key)
+
+    def remove(self, rating_key: str) -> None:
+        compact = self.items.pop(rating_key, None)
+        if compact is None:
+            return
+        self._section_sizes[compact["section"]] -= 1
+        lookups = [(self._by_guid, (compact["type"], g)) for g in compact["guids"]]
+        if not compact["guids"]:
+            lookups.append((self._by_title, (compact["type"], compact["title"].casefold())))
+        for table, lookup in lookups:
+            keys = table.get(lookup)
+            if keys is not None:
+                keys.discard(rating_key)
+                if not keys:
+                    del table[lookup]
+
+    def replace_section(self, section: str, items: list[dict]) -> None:
+        """Swap one section's contents for a full listing of it."""
+        self.drop_section(section)
+        self.watermarks[section] = 0
+        for item in items:
+            self.add(item, section)
+
+    def drop_section(self, section: str) -> None:
+        for key in [k for k, item in self.items.items() if item["section"] == section]:
+            self.remove(key)
+        self.watermarks.pop(section, None)
+        self._section_sizes.pop(section, None)
+
+    def section_size(self, section: str) -> int:
+        return self._section_sizes.get(section, 0)
+
+    def section_keys(self, section: str) -> set[str]:
+        return {key for key, item in self.items.items() if item["section"] == section}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def contains(self, result: MediaSearchResult) -> bool:
+        wanted_type = _PLEX_TYPES[result.media_type]
+        if any((wanted_type, guid) in self._by_guid for guid in _wanted_guids(result)):
+            return True
+        for key in self._by_title.get((wanted_type, result.title.casefold()), ()):
+            year = self.items[key]["year"]
+            if not result.year or year in (result.year, result.year - 1, result.year + 1):
+                return True
+        return False
+
+
 class PlexClient:
-    """Minimal async Plex client — presence checks only, via the /library/all filter
-    endpoint with includeGuids so titles can be matched by TVDB/TMDB id, not name."""
+    """Minimal async Plex client — library listings for the GUID index
+    (engine/media/plex_index), plus liveness."""
 
     def __init__(self, server: PlexServer, timeout: float = DEFAULT_TIMEOUT):
         self.server = server
@@ -30,54 +131,138 @@ class PlexClient:
             timeout=self.timeout,
         )
 
-    async def _search(self, title: str) -> list[dict]:
+    async def _get(
+        self, path: str, params: dict | None = None, kind: EndpointClass = EndpointClass.DEFAULT
+    ) -> httpx.Response:
+        """One GET through this server's circuit breaker and latency tracker
+        (see ArrClientBase._send)."""
+        breaker = breaker_for(self.name)
+        tracker = tracker_for(self.name)
+        breaker.before_request()
+        start = time.perf_counter()
+        try:
+            async with self._client() as client:
+                resp = await client.get(path, params=params, timeout=tracker.timeout(kind, self.server.timeouts))
+        except httpx.ReadTimeout:
+            tracker.record(kind, time.perf_counter() - start)
+            breaker.record_failure()
+            raise
+        except httpx.TransportError:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.abandon()
+            raise
+        tracker.record(kind, time.perf_counter() - start)
+        breaker.record_success()
+        resp.raise_for_status()
+        return resp
+
+    async def _get_json(self, path: str, params: dict | None = None, kind: EndpointClass = EndpointClass.DEFAULT):
         # One retry on transport errors — a dropped connection must not render
-        # a healthy server as "unreachable" in the detail view.
+        # a healthy server as "unreachable" in the detail view — unless the
+        # latency history says the timeout was the server being slow.
+        tracker = tracker_for(self.name)
         last_exc: httpx.TransportError | None = None
         for _ in range(2):
             try:
-                async with self._client() as client:
-                    resp = await client.get("/library/all", params={"title": title, "includeGuids": "1"})
-                    resp.raise_for_status()
-                    return resp.json().get("MediaContainer", {}).get("Metadata", []) or []
+                return (await self._get(path, params=params, kind=kind)).json().get("MediaContainer", {})
             except httpx.TransportError as exc:
                 last_exc = exc
+                read = tracker.timeout(kind, self.server.timeouts).read
+                if not tracker.should_retry(kind, exc, read):
+                    break
         assert last_exc is not None
         raise last_exc
 
+    async def sections(self) -> list[dict]:
+        """The server's library sections (key, type, title)."""
+        return (await self._get_json("/library/sections")).get("Directory", []) or []
+
+    async def section_items(self, key: str, updated_since: int | None = None) -> list[dict]:
+        """Every item in one section, with its external GUIDs — or, given
+        `updated_since`, only those added or changed after it."""
+        params = {"includeGuids": "1"}
+        if updated_since is not None:
+            params["updatedAt>>="] = str(updated_since)  # Plex's filter syntax for updatedAt > n
+        container = await self._get_json(f"/library/sections/{key}/all", params=params, kind=EndpointClass.LIBRARY)
+        return container.get("Metadata", []) or []
+
+    async def section_size(self, key: str) -> int:
+        """How many items the section holds, without listing any of them."""
+        container = await self._get_json(
+            f"/library/sections/{key}/all",
+            params={"X-Plex-Container-Start": "0", "X-Plex-Container-Size": "0"},
+        )
+        return int(container.get("totalSize", container.get("size", 0)))
+
+    async def section_keys(self, key: str) -> set[str]:
+        """The ratingKey of every item in one section — a listing without GUIDs."""
+        container = await self._get_json(f"/library/sections/{key}/all", kind=EndpointClass.LIBRARY)
+        return {str(item["ratingKey"]) for item in container.get("Metadata", []) or [] if item.get("ratingKey")}
+
+    async def _indexed_sections(self) -> list[str]:
+        return [str(s["key"]) for s in await self.sections() if s.get("type") in _PLEX_TYPES.values()]
+
+    async def load_index(self) -> PlexIndex:
+        """Every show and movie on the server, indexed by external GUID."""
+        index = PlexIndex()
+        keys = await self._indexed_sections()
+        for key, items in zip(keys, await asyncio.gather(*(self.section_items(k) for k in keys))):
+            index.replace_section(key, items)
+        return index
+
+    async def sync_index(self, index: PlexIndex) -> int:
+        """Bring `index` up to date in place from per-section deltas; returns
+        how many items were added, changed or removed.
+
+        Each section is asked only for items updated since its watermark.
+        Plex's listings don't report deletions, so a section whose delta was
+        not empty (a removal may hide behind an add of the same size) or whose
+        size no longer matches the index's has its ratingKeys listed: keys gone
+        from Plex are dropped, and if the sizes still disagree something was
+        missed and only that section is listed again in full. New sections are
+        listed in full; vanished ones are dropped.
+        """
+        keys = await self._indexed_sections()
+        known = [k for k in keys if k in index.watermarks]
+        new = [k for k in keys if k not in index.watermarks]
+        deltas, sizes, listings = await asyncio.gather(
+            asyncio.gather(*(self.section_items(k, updated_since=index.watermarks[k]) for k in known)),
+            asyncio.gather(*(self.section_size(k) for k in known)),
+            asyncio.gather(*(self.section_items(k) for k in new)),
+        )
+        changed = 0
+        suspect = []
+        for key, items, size in zip(known, deltas, sizes):
+            for item in items:
+                indexed = index.items.get(str(item.get("ratingKey", "")))
+                # the item at the watermark itself, if a server lists it again, is no change
+                if indexed is None or (item.get("updatedAt") or item.get("addedAt") or 0) > indexed["updatedAt"]:
+                    changed += 1
+                index.add(item, key)
+            if items or index.section_size(key) != size:
+                suspect.append(key)
+        stale = []
+        for key, present in zip(suspect, await asyncio.gather(*(self.section_keys(k) for k in suspect))):
+            for rating_key in index.section_keys(key) - present:
+                index.remove(rating_key)
+                changed += 1
+            if index.section_size(key) != len(present):
+                stale.append(key)
+        for key, items in zip(new, listings):
+            index.replace_section(key, items)
+            changed += len(items)
+        for key in set(index.watermarks) - set(keys):
+            changed += index.section_size(key)
+            index.drop_section(key)
+        for key, items in zip(stale, await asyncio.gather(*(self.section_items(k) for k in stale))):
+            changed += abs(index.section_size(key) - len(items))
+            index.replace_section(key, items)
+        return changed
+
     async def ping_ms(self) -> float:
         """Round-trip time of the lightweight /identity endpoint, in milliseconds."""
         start = time.perf_counter()
-        async with self._client() as client:
-            resp = await client.get("/identity")
-            resp.raise_for_status()
+        await self._get("/identity", kind=EndpointClass.PING)
         return (time.perf_counter() - start) * 1000
-
-    async def check_presence(self, result: MediaSearchResult) -> PlexAvailability:
-        try:
-            items = await self._search(result.title)
-        except Exception as exc:  # noqa: BLE001 — one server down must not break the check
-            # timeouts stringify to "" and the UIs branch on error truthiness
-            return PlexAvailability(server=self.name, available=False, error=str(exc) or type(exc).__name__)
-
-        wanted_type = _PLEX_TYPES[result.media_type]
-        wanted_guids = set()
-        if result.tvdb_id:
-            wanted_guids.add(f"tvdb://{result.tvdb_id}")
-        if result.tmdb_id:
-            wanted_guids.add(f"tmdb://{result.tmdb_id}")
-        if result.imdb_id:
-            wanted_guids.add(f"imdb://{result.imdb_id}")
-
-        for item in items:
-            if item.get("type") != wanted_type:
-                continue
-            guids = {g.get("id", "") for g in item.get("Guid", [])}
-            if wanted_guids & guids:
-                return PlexAvailability(server=self.name, available=True)
-            # Fallback for items without external GUIDs: exact title + year
-            if not guids and item.get("title", "").casefold() == result.title.casefold():
-                if not result.year or item.get("year") in (result.year, result.year - 1, result.year + 1):
-                    return PlexAvailability(server=self.name, available=True)
-
-        return PlexAvailability(server=self.name, available=False)
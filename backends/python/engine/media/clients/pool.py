@@ -0,0 +1,57 @@
+"""Long-lived HTTP clients, one per configured server.
+
+Every client owns a keep-alive connection pool, so the lookups, library dumps,
+pings and disk checks a server sees reuse an open TCP (and TLS) connection
+instead of paying a fresh handshake per request. httpx clients are bound to
+the event loop that opened them; the CLI runs one loop per command, so a client
+left over from a finished loop is replaced rather than reused. Whoever owns the
+loop (CLI command, TUI, web server) calls `close_http_clients()` on the way out.
+"""
+
+import asyncio
+from collections.abc import Callable
+
+import httpx
+
+# Idle connections are dropped after this long. Comfortably above the health
+# board's 60 s poll so its ping finds a warm connection, below the arr's own
+# (Kestrel) 130 s keep-alive so we never reuse one the server already closed.
+KEEPALIVE_EXPIRY_SECONDS = 90.0
+
+_clients: dict[str, tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+
+
+def pool_limits(size: int) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=size,
+        max_keepalive_connections=size,
+        keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+    )
+
+
+def shared_client(key: str, factory: Callable[[], httpx.AsyncClient]) -> httpx.AsyncClient:
+    """The pooled client for `key` on the running loop, created on first use."""
+    loop = asyncio.get_running_loop()
+    entry = _clients.get(key)
+    if entry is not None and entry[0] is loop and not entry[1].is_closed:
+        return entry[1]
+    client = factory()
+    _clients[key] = (loop, client)
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close every pooled client opened on the running loop.
+
+    Clients left behind by loops that already ended are dropped without a
+    close — their sockets died with the loop.
+    """
+    loop = asyncio.get_running_loop()
+    owned = []
+    for key, (owner, client) in list(_clients.items()):
+        if owner is loop:
+            owned.append(client)
+            del _clients[key]
+        elif owner.is_closed():
+            del _clients[key]
+    await asyncio.gather(*(c.aclose() for c in owned), return_exceptions=True)
@@ -1,5 +1,38 @@
+from ..columns import ColumnSpec
 from ..models import InstanceStatus, MediaSearchResult, MediaType, PresenceState
-from .arr_base import SLOW_READ_TIMEOUT, ArrClientBase, poster_url
+from .arr_base import ArrClientBase, imdb_number, poster_url
+from .jsonstream import FieldSpec, project
+from .latency import EndpointClass
+
+# What library records keep: everything to_status and the health stats read,
+# plus the identifiers. The rest of a movie record is dropped as it streams in.
+LIBRARY_FIELDS: FieldSpec = {
+    "id": None,
+    "tmdbId": None,
+    "imdbId": None,
+    "title": None,
+    "alternateTitles": {"title": None},  # for the typeahead index (engine/media/typeahead)
+    "year": None,
+    "monitored": None,
+    "hasFile": None,
+    "sizeOnDisk": None,
+    "statistics": {"sizeOnDisk": None},
+}
+
+
+def _size_on_disk(record: dict) -> int:
+    # Radarr v3/v4 put sizeOnDisk on the movie record; v5 moved it under statistics
+    return record.get("sizeOnDisk") or (record.get("statistics") or {}).get("sizeOnDisk") or 0
+
+
+# Per-movie numbers the health board totals, held as columns (engine/media/columns).
+LIBRARY_COLUMNS: ColumnSpec = {
+    "size_on_disk": _size_on_disk,
+    "has_file": lambda record: int(bool(record.get("hasFile"))),
+    "monitored": lambda record: int(bool(record.get("monitored"))),
+    "arr_id": lambda record: record.get("id") or 0,  # Radarr's own id, which history names movies by
+    "imdb": imdb_number,  # so an imdb: query finds its movie without decoding every record
+}
 
 
 class RadarrClient(ArrClientBase):
@@ -7,15 +40,38 @@ class RadarrClient(ArrClientBase):
 
     async def lookup(self, term: str) -> list[dict]:
         """Search movies. Items already in this instance's library carry a non-zero id."""
-        return await self._get("/api/v3/movie/lookup", params={"term": term}, timeout=SLOW_READ_TIMEOUT)
+        return await self._get("/api/v3/movie/lookup", params={"term": term}, kind=EndpointClass.LOOKUP)
 
     async def lookup_by_tmdb(self, tmdb_id: int) -> list[dict]:
         return await self.lookup(f"tmdb:{tmdb_id}")
 
+    async def get_movie(self, movie_id: int) -> dict:
+        """The whole movie resource — overview and images included, unlike a
+        library record."""
+        return await self._get(f"/api/v3/movie/{movie_id}")
+
     async def get_library(self) -> list[dict]:
         """Every movie in this instance's library. Lookup responses leave
-        hasFile empty even for downloaded movies — these records are authoritative."""
-        return await self._get("/api/v3/movie", timeout=SLOW_READ_TIMEOUT)
+        hasFile empty even for downloaded movies — these records are authoritative
+        (projected to LIBRARY_FIELDS)."""
+        return await self._get_projected("/api/v3/movie", LIBRARY_FIELDS)
+
+    async def library_record(self, tmdb_id: int) -> dict | None:
+        """This one movie's library record (projected to LIBRARY_FIELDS), or None
+        when it isn't in the library — a single-title refresh, not a dump."""
+        items = await self._get("/api/v3/movie", params={"tmdbId": tmdb_id})
+        # filter anyway: a Radarr that ignores the parameter answers with everything
+        item = next((i for i in items if i.get("tmdbId") == tmdb_id), None)
+        return project(item, LIBRARY_FIELDS) if item else None
+
+    async def changed_since(self, since: float) -> set[int]:
+        """Radarr ids of the movies with history at or after `since` (epoch seconds)."""
+        return {e["movieId"] for e in await self._history_since(since) if e.get("movieId")}
+
+    async def record_by_id(self, movie_id: int) -> dict | None:
+        """One movie's library record by Radarr id (projected to LIBRARY_FIELDS),
+        or None when it has been deleted."""
+        return await self._record_or_none(f"/api/v3/movie/{movie_id}", LIBRARY_FIELDS)
 
     async def add_movie(self, lookup_item: dict, quality_profile_id: int, root_folder: str) -> dict:
         payload = dict(lookup_item)
@@ -31,17 +87,18 @@ class RadarrClient(ArrClientBase):
 
     @staticmethod
     def to_search_result(item: dict) -> MediaSearchResult:
+        # nothing validates a search hit (engine/media/models) — normalize here
         return MediaSearchResult(
             media_type=MediaType.MOVIE,
-            title=item.get("title", ""),
+            title=item.get("title") or "",
             year=item.get("year") or None,
             tmdb_id=item.get("tmdbId") or None,
             imdb_id=item.get("imdbId") or None,
-            overview=item.get("overview", ""),
+            overview=item.get("overview") or "",
             poster_url=poster_url(item),
-            network=item.get("studio", ""),
-            status=item.get("status", ""),
-            genres=item.get("genres", []),
+            network=item.get("studio") or "",
+            status=item.get("status") or "",
+            genres=list(item.get("genres") or []),
             runtime=item.get("runtime") or None,
         )
 
@@ -52,11 +109,9 @@ class RadarrClient(ArrClientBase):
 
         has_file = bool(item.get("hasFile"))
         state = PresenceState.MONITORED_COMPLETE if has_file else PresenceState.MONITORED_INCOMPLETE
-        # Radarr v3/v4 put sizeOnDisk on the movie record; v5 moved it under statistics
-        size = item.get("sizeOnDisk") or (item.get("statistics") or {}).get("sizeOnDisk")
         return InstanceStatus(
             instance=self.name,
             state=state,
-            monitored=item.get("monitored", False),
-            size_on_disk=size or None,
+            monitored=bool(item.get("monitored")),
+            size_on_disk=_size_on_disk(item) or None,
         )
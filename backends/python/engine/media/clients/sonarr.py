@@ -1,3 +1,6 @@
+from functools import partial
+
+from ..columns import ColumnSpec
 from ..models import (
     EpisodeDetail,
     InstanceStatus,
@@ -6,7 +9,57 @@ from ..models import (
     PresenceState,
     SeasonDetail,
 )
-from .arr_base import SLOW_READ_TIMEOUT, ArrClientBase, poster_url
+from .arr_base import ArrClientBase, imdb_number, poster_url
+from .jsonstream import FieldSpec, project
+from .latency import EndpointClass
+
+_STATS = {"episodeCount": None, "episodeFileCount": None, "totalEpisodeCount": None, "sizeOnDisk": None}
+
+# What library records keep: everything to_status and the health stats read,
+# plus the identifiers. The rest of a series record is dropped as it streams in.
+LIBRARY_FIELDS: FieldSpec = {
+    "id": None,
+    "tvdbId": None,
+    "imdbId": None,
+    "title": None,
+    "alternateTitles": {"title": None},  # for the typeahead index (engine/media/typeahead)
+    "year": None,
+    "network": None,  # with status: what `syncplex seasons tvdb:...` shows from the library alone
+    "status": None,
+    "monitored": None,
+    "statistics": {**_STATS, "seasonCount": None},
+    "seasons": {"seasonNumber": None, "monitored": None, "statistics": _STATS},
+}
+
+
+def _season_details(seasons: list[dict]) -> list[SeasonDetail]:
+    return [
+        SeasonDetail(
+            season_number=s.get("seasonNumber") or 0,
+            monitored=bool(s.get("monitored")),
+            episode_file_count=stats.get("episodeFileCount") or 0,
+            episode_count=stats.get("episodeCount") or 0,
+            total_episode_count=stats.get("totalEpisodeCount") or 0,
+            size_on_disk=stats.get("sizeOnDisk") or 0,
+        )
+        for s in seasons
+        for stats in [s.get("statistics") or {}]
+    ]
+
+
+def _stat(key: str):
+    return lambda record: (record.get("statistics") or {}).get(key) or 0
+
+
+# Per-series numbers the health board totals, held as columns (engine/media/columns).
+LIBRARY_COLUMNS: ColumnSpec = {
+    "episode_count": _stat("episodeCount"),
+    "episode_file_count": _stat("episodeFileCount"),
+    "size_on_disk": _stat("sizeOnDisk"),
+    "monitored": lambda record: int(bool(record.get("monitored"))),
+    "arr_id": lambda record: record.get("id") or 0,  # Sonarr's own id, which history names series by
+    "imdb": imdb_number,  # so an imdb: query finds its series without decoding every record
+}
 
 
 class SonarrClient(ArrClientBase):
@@ -15,7 +68,7 @@ class SonarrClient(ArrClientBase):
     async def lookup(self, term: str) -> list[dict]:
         """Search series. Items already in this instance's library carry a non-zero id
         and inline statistics, so one call answers both 'what matches' and 'do I have it'."""
-        return await self._get("/api/v3/series/lookup", params={"term": term}, timeout=SLOW_READ_TIMEOUT)
+        return await self._get("/api/v3/series/lookup", params={"term": term}, kind=EndpointClass.LOOKUP)
 
     async def lookup_by_tvdb(self, tvdb_id: int) -> list[dict]:
         return await self.lookup(f"tvdb:{tvdb_id}")
@@ -26,8 +79,26 @@ class SonarrClient(ArrClientBase):
         return await self._get(f"/api/v3/series/{series_id}")
 
     async def get_library(self) -> list[dict]:
-        """Every series in this instance's library, with authoritative statistics."""
-        return await self._get("/api/v3/series", timeout=SLOW_READ_TIMEOUT)
+        """Every series in this instance's library, with authoritative statistics
+        (projected to LIBRARY_FIELDS)."""
+        return await self._get_projected("/api/v3/series", LIBRARY_FIELDS)
+
+    async def library_record(self, tvdb_id: int) -> dict | None:
+        """This one series' library record (projected to LIBRARY_FIELDS), or None
+        when it isn't in the library — a single-title refresh, not a dump."""
+        items = await self._get("/api/v3/series", params={"tvdbId": tvdb_id})
+        # filter anyway: a Sonarr that ignores the parameter answers with everything
+        item = next((i for i in items if i.get("tvdbId") == tvdb_id), None)
+        return project(item, LIBRARY_FIELDS) if item else None
+
+    async def changed_since(self, since: float) -> set[int]:
+        """Sonarr ids of the series with history at or after `since` (epoch seconds)."""
+        return {e["seriesId"] for e in await self._history_since(since) if e.get("seriesId")}
+
+    async def record_by_id(self, series_id: int) -> dict | None:
+        """One series' library record by Sonarr id (projected to LIBRARY_FIELDS),
+        or None when it has been deleted."""
+        return await self._record_or_none(f"/api/v3/series/{series_id}", LIBRARY_FIELDS)
 
     async def get_episodes(self, series_id: int) -> list[EpisodeDetail]:
         """Full episode list for a series already in this instance's library."""
@@ -59,20 +130,21 @@ class SonarrClient(ArrClientBase):
 
     @staticmethod
     def to_search_result(item: dict) -> MediaSearchResult:
-        stats = item.get("statistics", {})
+        # nothing validates a search hit (engine/media/models) — normalize here
+        stats = item.get("statistics") or {}
         return MediaSearchResult(
             media_type=MediaType.TV,
-            title=item.get("title", ""),
+            title=item.get("title") or "",
             year=item.get("year") or None,
             tvdb_id=item.get("tvdbId") or None,
             imdb_id=item.get("imdbId") or None,
-            overview=item.get("overview", ""),
+            overview=item.get("overview") or "",
             poster_url=poster_url(item),
-            network=item.get("network", ""),
-            status=item.get("status", ""),
-            genres=item.get("genres", []),
+            network=item.get("network") or "",
+            status=item.get("status") or "",
+            genres=list(item.get("genres") or []),
             runtime=item.get("runtime") or None,
-            season_count=stats.get("seasonCount") or len(item.get("seasons", [])) or None,
+            season_count=stats.get("seasonCount") or len(item.get("seasons") or []) or None,
         )
 
     def to_status(self, item: dict | None) -> InstanceStatus:
@@ -80,9 +152,9 @@ class SonarrClient(ArrClientBase):
         if not item or not item.get("id"):
             return InstanceStatus(instance=self.name, state=PresenceState.NOT_PRESENT)
 
-        stats = item.get("statistics", {})
-        total = stats.get("episodeCount", 0)
-        files = stats.get("episodeFileCount", 0)
+        stats = item.get("statistics") or {}
+        total = stats.get("episodeCount") or 0
+        files = stats.get("episodeFileCount") or 0
         missing = max(total - files, 0)
         if total == 0 and files == 0:
             # In the library but nothing monitored/downloaded — calling that
@@ -90,24 +162,13 @@ class SonarrClient(ArrClientBase):
             state = PresenceState.MONITORED_INCOMPLETE
         else:
             state = PresenceState.MONITORED_COMPLETE if missing == 0 else PresenceState.MONITORED_INCOMPLETE
-        seasons = [
-            SeasonDetail(
-                season_number=s.get("seasonNumber", 0),
-                monitored=s.get("monitored", False),
-                episode_file_count=s.get("statistics", {}).get("episodeFileCount", 0),
-                episode_count=s.get("statistics", {}).get("episodeCount", 0),
-                total_episode_count=s.get("statistics", {}).get("totalEpisodeCount", 0),
-                size_on_disk=s.get("statistics", {}).get("sizeOnDisk", 0),
-            )
-            for s in item.get("seasons", [])
-        ]
         return InstanceStatus(
             instance=self.name,
             state=state,
-            monitored=item.get("monitored", False),
+            monitored=bool(item.get("monitored")),
             missing_episode_count=missing,
             total_episode_count=total,
             series_id=item.get("id"),
-            seasons=seasons,
+            season_source=partial(_season_details, item.get("seasons") or []),
             size_on_disk=stats.get("sizeOnDisk") or None,
         )
@@ -0,0 +1,104 @@
+"""Columnar library snapshots: the numbers every health poll sums, kept as arrays.
+
+Library totals (series/episode/movie counts, sizes, averages) used to walk every
+record dict on every health poll. A `LibraryTable` stores each instance's
+library as parallel int64 columns — external ids ascending, plus one column per
+statistic the client's column spec names — with an id -> row index over them.
+Totals are reductions over a column (`sum` over an `array` runs in C, no
+per-record dict lookups), and a presence check is one index hit.
+
+The full (projected) records are still there for whoever needs one title's
+detail: `table[ext_id]` returns the record, so a table is a drop-in
+`Mapping[int, dict]`. The on-disk snapshot (engine/media/snapshots) maps the
+same columns straight from the file.
+"""
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Iterator, Mapping, MutableSequence
+from functools import cached_property
+
+# Column name -> how to read it from a library record. Every column is int64.
+ColumnSpec = Mapping[str, Callable[[dict], int]]
+
+
+class LibraryTable(Mapping[int, dict]):
+    """One instance's library: sorted id column, statistic columns, records by row."""
+
+    def __init__(self, ids: array, columns: Mapping[str, array], records: MutableSequence[dict]):
+        self.ids = ids
+        self.columns = columns
+        self._records = records
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict], id_field: str, spec: ColumnSpec) -> "LibraryTable":
+        """Build a table from library records; records without an id are dropped."""
+        by_id = {record[id_field]: record for record in records if record.get(id_field)}
+        ids = array("q", sorted(by_id))
+        rows = [by_id[ext_id] for ext_id in ids]
+        columns = {name: array("q", map(read, rows)) for name, read in spec.items()}
+        return cls(ids, columns, rows)
+
+    def with_record(self, ext_id: int, record: dict | None, spec: ColumnSpec) -> "LibraryTable":
+        """A copy with one title's record replaced, added, or (None) removed.
+
+        Copy-on-write rather than in place: readers holding this table (a merge
+        in progress, a snapshot being written to disk) never see it change.
+        Copying the columns is a memcpy; the records are copied by reference.
+        """
+        ids = array("q", self.ids)
+        columns = {name: array("q", column) for name, column in self.columns.items()}
+        records = self._records.copy()  # type: ignore[attr-defined]
+        row = self.row(ext_id)
+        if row is not None and record is not None:
+            records[row] = record
+            for name, read in spec.items():
+                columns[name][row] = read(record)
+        elif row is not None:
+            del ids[row], records[row]
+            for column in columns.values():
+                del column[row]
+        elif record is not None:
+            row = bisect_left(ids, ext_id)
+            ids.insert(row, ext_id)
+            records.insert(row, record)
+            for name, read in spec.items():
+                columns[name].insert(row, read(record))
+        return LibraryTable(ids, columns, records)
+
+    @cached_property
+    def _rows(self) -> dict[int, int]:
+        return {ext_id: row for row, ext_id in enumerate(self.ids)}
+
+    def row(self, ext_id: object) -> int | None:
+        return self._rows.get(ext_id)  # type: ignore[call-overload]
+
+    def find(self, column: str, value: int) -> dict | None:
+        """The first record whose `column` holds `value` — a scan of the column
+        in C; no record is decoded but the one found."""
+        try:
+            row = self.columns[column].index(value)
+        except ValueError:
+            return None
+        return self._records[row]
+
+    def total(self, column: str) -> int:
+        return sum(self.columns[column])
+
+    def count_nonzero(self, column: str) -> int:
+        return len(self.ids) - self.columns[column].count(0)
+
+    def __getitem__(self, ext_id: int) -> dict:
+        row = self.row(ext_id)
+        if row is None:
+            raise KeyError(ext_id)
+        return self._records[row]
+
+    def __contains__(self, ext_id: object) -> bool:
+        return self.row(ext_id) is not None
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
@@ -12,6 +12,19 @@ from ..config import load_env
 from ..inventory import parse_inventory
 from ..models import Machine
 
+# Keep-alive connections held open per Sonarr/Radarr instance. Search-as-you-type
+# runs a lookup and (on a cold cache) a library dump side by side, the health
+# board adds ping/diskspace/rootfolder — a handful covers it without queueing.
+DEFAULT_POOL_SIZE = 8
+
+# How often the web UI / TUI refresh each instance's library snapshot in the
+# background (engine/media/library.LibraryRefresher).
+DEFAULT_LIBRARY_REFRESH_SECONDS = 120.0
+
+# Between refreshes only the titles the instance's history names are refetched
+# (engine/media/library); the whole library is dumped again this often.
+DEFAULT_FULL_RESYNC_SECONDS = 6 * 60 * 60.0
+
 
 @dataclass
 class ArrInstance:
@@ -20,6 +33,10 @@ class ArrInstance:
     api_key: str
     quality_profile: str = ""  # preferred profile name; first available when empty
     root_folder: str = ""  # preferred root folder path; first available when empty
+    pool_size: int = DEFAULT_POOL_SIZE  # max pooled keep-alive connections to this server
+    timeouts: dict[str, float] = field(default_factory=dict)  # fixed seconds per endpoint class / "connect"
+    library_refresh_seconds: float = DEFAULT_LIBRARY_REFRESH_SECONDS
+    full_resync_seconds: float = DEFAULT_FULL_RESYNC_SECONDS
 
 
 @dataclass
@@ -27,6 +44,7 @@ class PlexServer:
     name: str
     base_url: str
     token: str
+    timeouts: dict[str, float] = field(default_factory=dict)  # fixed seconds per endpoint class / "connect"
 
 
 @dataclass
@@ -63,7 +81,7 @@ def load_media_config(machines: list[Machine] | None = None) -> MediaConfig:
                 continue
 
             if svc.type == "plex":
-                config.plex.append(PlexServer(name=svc.name, base_url=base_url, token=key))
+                config.plex.append(PlexServer(name=svc.name, base_url=base_url, token=key, timeouts=svc.timeouts))
             else:
                 instance = ArrInstance(
                     name=svc.name,
@@ -71,6 +89,10 @@ def load_media_config(machines: list[Machine] | None = None) -> MediaConfig:
                     api_key=key,
                     quality_profile=svc.quality_profile,
                     root_folder=svc.root_folder,
+                    pool_size=svc.pool_size or DEFAULT_POOL_SIZE,
+                    timeouts=svc.timeouts,
+                    library_refresh_seconds=svc.library_refresh_seconds or DEFAULT_LIBRARY_REFRESH_SECONDS,
+                    full_resync_seconds=svc.full_resync_seconds or DEFAULT_FULL_RESYNC_SECONDS,
                 )
                 (config.sonarr if svc.type == "sonarr" else config.radarr).append(instance)
 
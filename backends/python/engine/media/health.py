@@ -8,10 +8,13 @@ ServerHealth with up=False, never an exception.
 
 import asyncio
 
-from .aggregation import _library_index
 from .clients import PlexClient, RadarrClient, SonarrClient
+from .clients.breaker import CircuitState, breaker_for
+from .columns import LibraryTable
 from .config import MediaConfig, PlexServer, load_media_config
+from .library import library_index
 from .models import AggregatedResult, MediaType, ServerHealth
+from .plex_index import cached_plex_snapshot, plex_index
 
 # Fallbacks for instances whose library has nothing to average over yet
 DEFAULT_EPISODE_BYTES = 1_500_000_000  # ~1.5 GB per episode
@@ -61,19 +64,17 @@ def _storage_for_roots(disks: list[dict], root_folders: list[dict]) -> tuple[int
     return (free, total) if total else (None, None)
 
 
-def apply_library_stats(health: ServerHealth, items: list[dict]) -> None:
-    """Fill library totals and size averages from raw library records."""
+def apply_library_stats(health: ServerHealth, library: LibraryTable) -> None:
+    """Fill library totals and size averages from the library's columns."""
+    health.library_size_bytes = library.total("size_on_disk")
     if health.kind == "sonarr":
-        stats = [item.get("statistics", {}) for item in items]
-        health.series_count = len(items)
-        health.episode_count = sum(s.get("episodeFileCount") or 0 for s in stats)
-        health.library_size_bytes = sum(s.get("sizeOnDisk") or 0 for s in stats)
+        health.series_count = len(library)
+        health.episode_count = library.total("episode_file_count")
         if health.episode_count:
             health.avg_episode_bytes = health.library_size_bytes / health.episode_count
     else:
-        health.movie_count = len(items)
-        health.library_size_bytes = sum(item.get("sizeOnDisk") or 0 for item in items)
-        downloaded = sum(1 for item in items if item.get("hasFile"))
+        health.movie_count = len(library)
+        downloaded = library.count_nonzero("has_file")
         if downloaded:
             health.avg_movie_bytes = health.library_size_bytes / downloaded
 
@@ -87,36 +88,55 @@ async def _ping_twice(ping) -> float:
         return await ping()
 
 
+def _apply_circuit(health: ServerHealth) -> None:
+    """Surface the server's breaker so the board can say why it fails fast."""
+    breaker = breaker_for(health.name)
+    health.circuit = breaker.state.value
+    if breaker.state == CircuitState.OPEN:
+        health.circuit_retry_in = breaker.retry_in
+
+
 async def _arr_health(client: SonarrClient | RadarrClient, kind: str) -> ServerHealth:
     health = ServerHealth(name=client.name, kind=kind)
     try:
         health.ping_ms = await _ping_twice(client.ping_ms)
     except Exception as exc:  # noqa: BLE001 — a down server is a result, not an error
         health.error = str(exc) or type(exc).__name__
+        _apply_circuit(health)
         return health
     health.up = True
 
     # Storage and library totals are best-effort; a failure here still leaves
     # the server marked up (the ping already succeeded).
     try:
-        disks, roots, library = await asyncio.gather(
-            client.disk_space(), client.root_folders(), _library_index(client)
-        )
+        disks, roots, library = await asyncio.gather(client.disk_space(), client.root_folders(), library_index(client))
     except Exception as exc:  # noqa: BLE001
         health.error = str(exc)
         return health
     health.disk_free_bytes, health.disk_total_bytes = _storage_for_roots(disks, roots)
-    apply_library_stats(health, list(library.values()))
+    apply_library_stats(health, library)
     return health
 
 
 async def _plex_health(server: PlexServer) -> ServerHealth:
     health = ServerHealth(name=server.name, kind="plex")
+    client = PlexClient(server)
     try:
-        health.ping_ms = await _ping_twice(PlexClient(server).ping_ms)
+        health.ping_ms = await _ping_twice(client.ping_ms)
         health.up = True
     except Exception as exc:  # noqa: BLE001
         health.error = str(exc) or type(exc).__name__
+    else:
+        # Best-effort like the arr library totals: the health poll is what keeps
+        # the GUID index synced in long-running processes.
+        try:
+            await plex_index(client)
+        except Exception as exc:  # noqa: BLE001
+            health.error = str(exc) or type(exc).__name__
+    snapshot = cached_plex_snapshot(server.name)
+    if snapshot is not None:
+        health.index_age_seconds = snapshot.age
+    _apply_circuit(health)
     return health
 
 
@@ -143,7 +163,7 @@ def known_episode_total(aggregated: AggregatedResult) -> int | None:
     for status in aggregated.statuses:
         by_seasons = sum(
             season.total_episode_count or season.episode_count
-            for season in status.seasons
+            for season in status.season_details()
             if season.season_number != 0
         )
         best = max(best, by_seasons, status.total_episode_count or 0)
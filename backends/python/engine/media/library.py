@@ -0,0 +1,365 @@
+"""Per-instance library snapshots — where every presence answer comes from.
+
+Lookup responses lie about presence detail (Radarr omits hasFile, Sonarr omits
+season statistics), so statuses are derived from each instance's real library,
+indexed by external id. Snapshots are served stale-while-revalidate: a fresh
+one is returned as is; an expired one (up to a limit) is still returned
+immediately while a refetch runs in the background, so no search pays for a
+full library dump on its critical path once the instance has been seen.
+
+After the first dump, a refresh asks the instance's history which titles
+changed since the snapshot and refetches only those; the whole library is
+dumped again every `full_resync_seconds` as a safety net.
+
+Every fetched snapshot is also written to the data dir (engine/media/snapshots)
+and a process with nothing in memory starts from that file, so a CLI command
+or a restarted web container answers presence without a library dump and
+revalidates in the background. `set_max_staleness` bounds how old a snapshot
+may be and still be served.
+
+`LibraryRefresher` goes further for long-running processes (web UI, TUI): it
+warms every instance at startup and refreshes each snapshot on its own
+interval, before it expires.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import httpx
+
+from .clients import RadarrClient, SonarrClient
+from .clients.inflight import coalesce
+from .clients.jsonstream import FieldSpec, project
+from .clients.radarr import LIBRARY_COLUMNS as MOVIE_COLUMNS
+from .clients.radarr import LIBRARY_FIELDS as MOVIE_FIELDS
+from .clients.sonarr import LIBRARY_COLUMNS as SERIES_COLUMNS
+from .clients.sonarr import LIBRARY_FIELDS as SERIES_FIELDS
+from .columns import ColumnSpec, LibraryTable
+from .config import ArrInstance, MediaConfig
+from .models import MediaType
+from .snapshots import discard_snapshot, load_snapshot, save_snapshot
+
+logger = logging.getLogger(__name__)
+
+# A short TTL keeps search-as-you-type from refetching the library on every
+# keystroke; each snapshot's expiry is jittered so instances fetched together
+# don't all expire (and refetch) on the same request.
+_LIBRARY_TTL_SECONDS = 60.0
+_LIBRARY_TTL_JITTER = 0.2  # +/- fraction of the TTL
+
+# History timestamps are the instance's clock, not ours: ask for a margin more
+# than strictly needed — refetching a title twice is cheap, missing one isn't.
+_HISTORY_SKEW_SECONDS = 5 * 60.0
+# Past this many changed titles one full dump beats that many single fetches.
+_MAX_DELTA_RECORDS = 200
+
+# How long past expiry a snapshot may still be served while it revalidates.
+# Beyond this the caller waits for the refetch — presence that old is a guess.
+DEFAULT_MAX_STALENESS_SECONDS = 15 * 60.0
+_max_staleness = DEFAULT_MAX_STALENESS_SECONDS
+
+
+@dataclass
+class LibrarySnapshot:
+    fetched_at: float  # wall clock, seconds — when the index last matched the instance
+    expires_at: float
+    index: LibraryTable  # external id (tvdb/tmdb) -> library record, plus statistic columns
+    full_at: float = 0.0  # when the library was last dumped in full; 0: unknown, dump next time
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+
+# Instances that deliver webhooks (engine/media/webhooks) keep their snapshots
+# current themselves, so the refresher polls them this many times less often.
+# A push within the last day counts — the arrs send nothing while idle.
+_PUSH_REFRESH_FACTOR = 10
+_PUSH_WINDOW_SECONDS = 24 * 60 * 60.0
+
+_library_cache: dict[str, LibrarySnapshot] = {}
+SnapshotListener = Callable[[str, MediaType, LibraryTable], object]
+_snapshot_listeners: set[SnapshotListener] = set()
+_last_push: dict[str, float] = {}  # instance -> wall clock of its last webhook
+_background: set[asyncio.Task] = set()
+_save_locks: dict[tuple[int, str], asyncio.Lock] = {}
+
+
+def client_for(instance: ArrInstance, media_type: MediaType) -> SonarrClient | RadarrClient:
+    return SonarrClient(instance) if media_type == MediaType.TV else RadarrClient(instance)
+
+
+def watch_snapshots(listener: SnapshotListener) -> Callable[[], None]:
+    """Call `listener(instance_name, media_type, table)` whenever a snapshot is
+    stored, loaded from disk or patched; returns the unsubscribe."""
+    _snapshot_listeners.add(listener)
+    return lambda: _snapshot_listeners.discard(listener)
+
+
+def _snapshot_changed(client: SonarrClient | RadarrClient, table: LibraryTable) -> None:
+    media_type = MediaType.TV if isinstance(client, SonarrClient) else MediaType.MOVIE
+    for listener in list(_snapshot_listeners):
+        try:
+            listener(client.name, media_type, table)
+        except Exception:  # noqa: BLE001 — a broken listener must not lose the snapshot
+            logger.exception("snapshot listener failed")
+
+
+def set_max_staleness(seconds: float) -> None:
+    """How far past expiry a snapshot (in memory or on disk) may still be served
+    while it revalidates. 0 means every expired snapshot is refetched first."""
+    global _max_staleness
+    _max_staleness = max(seconds, 0.0)
+
+
+def invalidate_library_cache(instance_name: str | None = None) -> None:
+    if instance_name is None:
+        _library_cache.clear()
+    else:
+        _library_cache.pop(instance_name, None)
+    discard_snapshot(instance_name)  # or the next lookup would warm-start from it
+
+
+def note_push(instance_name: str) -> None:
+    """Record that the instance just delivered a webhook."""
+    _last_push[instance_name] = time.time()
+
+
+def refresh_interval(instance: ArrInstance) -> float:
+    """Seconds between background refreshes of the instance's snapshot —
+    `library_refresh_seconds`, stretched while it pushes webhooks."""
+    pushed = _last_push.get(instance.name)
+    if pushed is not None and time.time() - pushed < _PUSH_WINDOW_SECONDS:
+        return instance.library_refresh_seconds * _PUSH_REFRESH_FACTOR
+    return instance.library_refresh_seconds
+
+
+def cached_snapshot(instance_name: str) -> LibrarySnapshot | None:
+    """Whatever snapshot is in memory for the instance, fresh or not — never fetches."""
+    return _library_cache.get(instance_name)
+
+
+async def library_index(client: SonarrClient | RadarrClient) -> LibraryTable:
+    """The instance's library keyed by external id, stale-while-revalidate."""
+    snapshot = _library_cache.get(client.name) or _load_from_disk(client)
+    now = time.time()
+    if snapshot is not None:
+        if now < snapshot.expires_at:
+            return snapshot.index
+        if now - snapshot.expires_at < _max_staleness:
+            _in_background(refresh_library(client))
+            return snapshot.index
+    return await refresh_library(client)
+
+
+def _load_from_disk(client: SonarrClient | RadarrClient) -> LibrarySnapshot | None:
+    disk = load_snapshot(client.name)
+    if disk is None or set(disk.columns) != set(_layout(client)[2]):
+        return None  # none, or written by a version with other columns
+    snapshot = LibrarySnapshot(
+        fetched_at=disk.fetched_at,
+        expires_at=disk.fetched_at + _LIBRARY_TTL_SECONDS,
+        index=disk,
+        full_at=disk.full_at,
+    )
+    _library_cache[client.name] = snapshot
+    _snapshot_changed(client, disk)
+    return snapshot
+
+
+async def refresh_library(client: SonarrClient | RadarrClient, ttl: float = _LIBRARY_TTL_SECONDS) -> LibraryTable:
+    """Bring the instance's library up to date now — from its history when a
+    snapshot exists (`_sync_library`), else by a full dump. Concurrent
+    refreshes (tabs searching together, a health poll, the refresher) share one."""
+    return await coalesce(("library", client.name), lambda: _sync_library(client, ttl))
+
+
+async def _sync_library(client: SonarrClient | RadarrClient, ttl: float) -> LibraryTable:
+    """Delta sync: refetch only the titles the instance's history names since
+    the snapshot last matched it, and patch them in.
+
+    History covers grabs, imports, file deletes and renames; a title added or
+    removed without any of those is caught by the full dump that still runs
+    every `full_resync_seconds`. Too many changes at once, or an instance
+    without /history/since, also get a full dump — it's cheaper or the only way.
+    """
+    snapshot = _library_cache.get(client.name)
+    started = time.time()
+    if snapshot is None or started - snapshot.full_at >= client.instance.full_resync_seconds:
+        return await _fetch_library(client, ttl)
+    try:
+        changed = await client.changed_since(snapshot.fetched_at - _HISTORY_SKEW_SECONDS)
+    except httpx.HTTPStatusError:
+        return await _fetch_library(client, ttl)
+    if len(changed) > _MAX_DELTA_RECORDS:
+        return await _fetch_library(client, ttl)
+    arr_ids = sorted(changed)
+    slots = asyncio.Semaphore(client.instance.pool_size)  # queue here, not in the pool (PoolTimeout)
+
+    async def _refetch(arr_id: int) -> dict | None:
+        async with slots:
+            return await client.record_by_id(arr_id)
+
+    records = await asyncio.gather(*(_refetch(arr_id) for arr_id in arr_ids))
+
+    id_field, _, columns = _layout(client)
+    snapshot = _library_cache.get(client.name, snapshot)  # a patch may have landed meanwhile
+    if not changed:
+        # nothing to patch: the table and its file stay as they are (re-saving
+        # would decode every record of a mapped one), only the clock moves on
+        snapshot.fetched_at, snapshot.expires_at = started, _expiry(ttl)
+        return snapshot.index
+    index = snapshot.index
+    for arr_id, record in zip(arr_ids, records):
+        if record is not None and record.get(id_field):
+            index = index.with_record(record[id_field], record, columns)
+            continue
+        try:
+            row = index.columns["arr_id"].index(arr_id)
+        except ValueError:
+            continue  # gone before we ever saw it
+        index = index.with_record(index.ids[row], None, columns)
+    _store(client, started, ttl, index, full_at=snapshot.full_at)
+    logger.debug("library delta for %s: %d titles", client.name, len(changed))
+    return index
+
+
+def _layout(client: SonarrClient | RadarrClient) -> tuple[str, FieldSpec, ColumnSpec]:
+    """The external id field, record projection and column spec for the client's library."""
+    if isinstance(client, SonarrClient):
+        return "tvdbId", SERIES_FIELDS, SERIES_COLUMNS
+    return "tmdbId", MOVIE_FIELDS, MOVIE_COLUMNS
+
+
+async def _fetch_library(client: SonarrClient | RadarrClient, ttl: float) -> LibraryTable:
+    id_field, _, columns = _layout(client)
+    started = time.time()
+    index = LibraryTable.from_records(await client.get_library(), id_field, columns)
+    _store(client, started, ttl, index, full_at=started)
+    return index
+
+
+def _expiry(ttl: float) -> float:
+    return time.time() + ttl * random.uniform(1 - _LIBRARY_TTL_JITTER, 1 + _LIBRARY_TTL_JITTER)
+
+
+def _store(
+    client: SonarrClient | RadarrClient, fetched_at: float, ttl: float, index: LibraryTable, full_at: float
+) -> None:
+    _library_cache[client.name] = LibrarySnapshot(
+        fetched_at=fetched_at, expires_at=_expiry(ttl), index=index, full_at=full_at
+    )
+    _snapshot_changed(client, index)
+    _in_background(_persist(client.name))
+
+
+def patch_library(client: SonarrClient | RadarrClient, ext_id: int, record: dict | None) -> None:
+    """Put one title's fresh library record (None: gone) into the cached snapshot.
+
+    After an add or a single-title refresh, this keeps every other title's
+    presence (and the snapshot's expiry) as it was instead of throwing the
+    whole library away. The patched snapshot is saved to disk in the
+    background, like a fetched one. No snapshot in memory: nothing to patch.
+    """
+    snapshot = _library_cache.get(client.name)
+    if snapshot is None:
+        return
+    _, fields, columns = _layout(client)
+    if record is not None:
+        record = project(record, fields)  # e.g. a whole add response
+    snapshot.index = snapshot.index.with_record(ext_id, record, columns)
+    _snapshot_changed(client, snapshot.index)
+    _in_background(_persist(client.name))
+
+
+async def refresh_title(client: SonarrClient | RadarrClient, ext_id: int) -> dict | None:
+    """Refetch one title's library record from the instance and patch it in."""
+    record = await client.library_record(ext_id)
+    patch_library(client, ext_id, record)
+    return record
+
+
+async def _persist(instance_name: str) -> None:
+    """Save the instance's current snapshot to disk.
+
+    Encoding tens of MB of JSON is slow, so it runs off the loop and off the
+    caller's path. Saves for one instance queue on a lock, and each one writes
+    whatever snapshot is current when its turn comes, so the last file written
+    is never older than the cache.
+    """
+    key = (id(asyncio.get_running_loop()), instance_name)
+    lock = _save_locks.get(key)
+    if lock is None:
+        lock = _save_locks[key] = asyncio.Lock()
+    async with lock:
+        snapshot = _library_cache.get(instance_name)
+        if snapshot is not None:
+            await asyncio.to_thread(save_snapshot, instance_name, snapshot.fetched_at, snapshot.index, snapshot.full_at)
+
+
+def _in_background(coro) -> None:
+    task = asyncio.get_running_loop().create_task(coro)
+    _background.add(task)  # the loop only keeps weak references to tasks
+    task.add_done_callback(_background_done)
+
+
+def _background_done(task: asyncio.Task) -> None:
+    _background.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        # a failed revalidation leaves the stale snapshot in place; the next search retries
+        logger.debug("background library work failed: %s", task.exception())
+
+
+async def settle_background() -> None:
+    """Wait for in-flight revalidations and snapshot writes — short-lived processes
+    (CLI commands) call this after answering so the next run starts warm."""
+    while _background:
+        await asyncio.gather(*_background, return_exceptions=True)
+
+
+class LibraryRefresher:
+    """Keeps every configured instance's library snapshot fresh in the background.
+
+    Each instance refreshes on its own `library_refresh_seconds` (hosts.json),
+    ten times less often while it pushes webhooks, and the first pass runs
+    immediately so the first search isn't cold.
+    Refreshed snapshots live for 1.5 intervals, so searches between refreshes
+    always find a fresh one. Call `start()` from inside the running loop and
+    `await stop()` before it ends.
+    """
+
+    def __init__(self, config: MediaConfig):
+        self.config = config
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        loop = asyncio.get_running_loop()
+        for media_type in (MediaType.TV, MediaType.MOVIE):
+            for instance in self.config.arr_instances(media_type.value):
+                self._tasks.append(loop.create_task(self._keep_fresh(client_for(instance, media_type))))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def _keep_fresh(self, client: SonarrClient | RadarrClient) -> None:
+        while True:
+            interval = refresh_interval(client.instance)
+            try:
+                await refresh_library(client, ttl=max(interval * 1.5, _LIBRARY_TTL_SECONDS))
+            except Exception as exc:  # noqa: BLE001 — a down instance just waits for the next round
+                logger.info("library refresh for %s failed: %s", client.name, str(exc) or type(exc).__name__)
+            # jittered so instances on the same interval drift apart
+            await asyncio.sleep(interval * random.uniform(0.9, 1.1))
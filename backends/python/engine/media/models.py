@@ -1,6 +1,17 @@
+"""Media types. The search pipeline's own types — a search hit, its
+per-instance statuses and seasons, the merged result — are slotted
+dataclasses: search builds hundreds of them per keystroke from server data
+it has already normalized, and validating each showed up in profiles.
+Pydantic comes in at the edges: `to_json` for --json output, and the
+request store's MediaRequest validating its search hit on load.
+"""
+
+from dataclasses import dataclass, field
 from enum import Enum
+from functools import cache
+from typing import Annotated, Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class MediaType(str, Enum):
@@ -13,9 +24,11 @@ class PresenceState(str, Enum):
     MONITORED_INCOMPLETE = "monitored_incomplete"
     MONITORED_COMPLETE = "monitored_complete"
     UNREACHABLE = "unreachable"
+    PENDING = "pending"  # the instance hasn't answered yet (progressive search)
 
 
-class MediaSearchResult(BaseModel):
+@dataclass(slots=True)
+class MediaSearchResult:
     """Normalized search hit from a Sonarr/Radarr lookup."""
 
     media_type: MediaType
@@ -28,7 +41,7 @@ class MediaSearchResult(BaseModel):
     poster_url: str = ""
     network: str = ""  # TV network (sonarr) or studio (radarr)
     status: str = ""  # continuing / ended / released / ...
-    genres: list[str] = Field(default_factory=list)
+    genres: list[str] = field(default_factory=list)
     runtime: int | None = None  # minutes
     season_count: int | None = None
 
@@ -42,7 +55,8 @@ class MediaSearchResult(BaseModel):
         return f"title:{self.title.casefold()}:{self.year or 0}"
 
 
-class SeasonDetail(BaseModel):
+@dataclass(slots=True)
+class SeasonDetail:
     """Per-season monitoring/availability on one instance (TV only)."""
 
     season_number: int
@@ -64,7 +78,8 @@ class EpisodeDetail(BaseModel):
     air_date: str = ""
 
 
-class InstanceStatus(BaseModel):
+@dataclass(slots=True)
+class InstanceStatus:
     """Presence of one title on one Sonarr/Radarr instance."""
 
     instance: str
@@ -73,9 +88,18 @@ class InstanceStatus(BaseModel):
     missing_episode_count: int | None = None
     total_episode_count: int | None = None
     series_id: int | None = None  # instance-internal id when present (needed for episode queries)
-    seasons: list[SeasonDetail] = Field(default_factory=list)
+    seasons: list[SeasonDetail] = field(default_factory=list)  # read through season_details()
     size_on_disk: int | None = None  # bytes the whole title occupies on this instance
     error: str = ""
+    # builds `seasons` on first ask — most statuses are only ever a glyph in a row
+    season_source: Annotated[Any, Field(exclude=True)] = field(default=None, repr=False, compare=False)
+
+    def season_details(self) -> list[SeasonDetail]:
+        """Per-season detail, built from the instance's record the first time
+        something (a detail view, `syncplex seasons`, --json) asks."""
+        if self.season_source is not None:
+            self.seasons, self.season_source = self.season_source(), None
+        return self.seasons
 
 
 class ServerHealth(BaseModel):
@@ -94,6 +118,9 @@ class ServerHealth(BaseModel):
     library_size_bytes: int | None = None
     avg_episode_bytes: float | None = None  # library size / episode files — feeds add estimates
     avg_movie_bytes: float | None = None
+    circuit: str = "closed"  # closed | open | half_open — open means requests fail fast
+    circuit_retry_in: float | None = None  # seconds until an open circuit probes again
+    index_age_seconds: float | None = None  # plex: how long since the GUID index last matched the server
 
 
 class PlexAvailability(BaseModel):
@@ -104,18 +131,46 @@ class PlexAvailability(BaseModel):
     error: str = ""
 
 
-class AggregatedResult(BaseModel):
+@dataclass(slots=True)
+class AggregatedResult:
     """One title with its status across every configured instance — the object the UIs render."""
 
     result: MediaSearchResult
-    statuses: list[InstanceStatus] = Field(default_factory=list)
-    plex: list[PlexAvailability] = Field(default_factory=list)
+    statuses: list[InstanceStatus] = field(default_factory=list)
+    plex: list[PlexAvailability] = field(default_factory=list)
+    # the raw lookup item the result was built from, so an add can post it
+    # without looking the title up again; never serialized
+    lookup_item: Annotated[Any, Field(exclude=True)] = field(default=None, repr=False, compare=False)
+    # instance -> status, with the statuses list (and its length) it indexes
+    status_index: Annotated[Any, Field(exclude=True)] = field(default=None, init=False, repr=False, compare=False)
 
     def status_for(self, instance: str) -> InstanceStatus | None:
-        return next((s for s in self.statuses if s.instance == instance), None)
+        index = self.status_index
+        if index is None or index[0] is not self.statuses or index[1] != len(self.statuses):
+            # first row wins, as a scan would find it
+            by_instance = {s.instance: s for s in reversed(self.statuses)}
+            index = self.status_index = (self.statuses, len(self.statuses), by_instance)
+        return index[2].get(instance)
+
+
+@cache
+def _adapter(kind: type) -> TypeAdapter:
+    return TypeAdapter(kind)
+
+
+def to_json(value: Any) -> Any:
+    """JSON-ready data for a search type (or a pydantic model), for --json output."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, AggregatedResult):
+        for status in value.statuses:
+            status.season_details()
+    return _adapter(type(value)).dump_python(value, mode="json")
 
 
 class AddResult(BaseModel):
     instance: str
     ok: bool
     message: str = ""
+    query: str = ""  # bulk adds: the line this result answers
+    external_key: str = ""  # bulk adds: the title the query resolved to
@@ -0,0 +1,90 @@
+"""Per-server Plex GUID indexes — where every watch-readiness answer comes from.
+
+Asking Plex about one title at a time (`/library/all?title=...`) costs a round
+trip per result per server, and misses whenever Plex's title differs from the
+arr's. Instead each server's show and movie sections are listed once (with
+includeGuids) into a `PlexIndex` keyed by tvdb/tmdb/imdb GUID, and
+`check_presence` answers any number of results from memory, one dict hit
+each. After that the index is kept current from per-section deltas
+(`PlexClient.sync_index`), with a full relisting hourly as a safety net.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+
+from .clients import PlexClient
+from .clients.inflight import coalesce
+from .clients.plex import PlexIndex
+from .models import MediaSearchResult, PlexAvailability
+
+logger = logging.getLogger(__name__)
+
+# A sync asks each section only for what changed since the last one (plus
+# its size), so it can run far more often than a full listing could.
+_PLEX_SYNC_SECONDS = 30.0
+# Full relisting as a safety net for anything the deltas can't see (an item
+# rematched to a different GUID without its updatedAt moving, say).
+_PLEX_FULL_RESYNC_SECONDS = 60 * 60.0
+
+
+@dataclass
+class PlexSnapshot:
+    fetched_at: float  # wall clock, seconds — last full listing
+    synced_at: float  # last delta sync (or the full listing itself)
+    index: PlexIndex
+
+    @property
+    def age(self) -> float:
+        """Seconds since the index last matched the server."""
+        return time.time() - self.synced_at
+
+
+_plex_cache: dict[str, PlexSnapshot] = {}
+
+
+def invalidate_plex_index(server_name: str | None = None) -> None:
+    if server_name is None:
+        _plex_cache.clear()
+    else:
+        _plex_cache.pop(server_name, None)
+
+
+def cached_plex_snapshot(server_name: str) -> PlexSnapshot | None:
+    """Whatever index is in memory for the server, however old — never fetches."""
+    return _plex_cache.get(server_name)
+
+
+async def plex_index(client: PlexClient, ttl: float = _PLEX_SYNC_SECONDS) -> PlexIndex:
+    """The server's GUID index, brought up to date once it is older than `ttl`
+    — from deltas, or a full listing when there is none yet or the last is
+    over an hour old. Concurrent callers share one sync."""
+    snapshot = _plex_cache.get(client.name)
+    if snapshot is not None and snapshot.age < ttl:
+        return snapshot.index
+    return await coalesce(("plex-index", client.name), lambda: _sync_index(client))
+
+
+async def _sync_index(client: PlexClient) -> PlexIndex:
+    snapshot = _plex_cache.get(client.name)
+    now = time.time()
+    if snapshot is None or now - snapshot.fetched_at >= _PLEX_FULL_RESYNC_SECONDS:
+        index = await client.load_index()
+        _plex_cache[client.name] = PlexSnapshot(fetched_at=now, synced_at=now, index=index)
+        return index
+    changed = await client.sync_index(snapshot.index)
+    if changed:
+        logger.debug("plex index %s: %d items changed", client.name, changed)
+    snapshot.synced_at = now
+    return snapshot.index
+
+
+async def check_presence(client: PlexClient, result: MediaSearchResult) -> PlexAvailability:
+    """Watch-readiness of one result on one server, from its index. Results
+    checked together share the server's one listing."""
+    try:
+        index = await plex_index(client)
+    except Exception as exc:  # noqa: BLE001 — one server down must not break the check
+        # timeouts stringify to "" and the UIs branch on error truthiness
+        return PlexAvailability(server=client.name, available=False, error=str(exc) or type(exc).__name__)
+    return PlexAvailability(server=client.name, available=index.contains(result))
@@ -0,0 +1,187 @@
+"""On-disk library snapshots, so a fresh process starts warm.
+
+Every CLI command and every restart of the web container would otherwise
+download each instance's full library before answering anything. Each
+refreshed snapshot is written to ``<data dir>/libraries/<instance>.snap`` and
+read back memory-mapped: the file is opened, not parsed. Layout (native byte
+order, recorded in the header)::
+
+    b"SPLXLIB2"                 magic
+    uint32                      header length
+    header                      JSON: instance, fetched_at, full_at, count, byteorder, columns
+    (zero padding to 8 bytes)
+    int64[count]                external ids, ascending
+    int64[count] per column     the table's statistic columns, in header order
+    int64[count + 1]            record offsets into the blob
+    blob                        compact JSON records, back to back
+
+The columns are copied out (a few hundred KB at most); records stay in the
+mapping and are decoded one at a time when a title's detail is asked for.
+
+Writes are atomic (temp file + replace), like the user and request stores. A
+missing, foreign or corrupt file reads as "no snapshot" — the caller refetches.
+"""
+
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from collections.abc import MutableSequence
+from pathlib import Path
+
+from ..config import get_data_dir
+from .columns import LibraryTable
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SPLXLIB2"
+_LENGTH = struct.Struct("<I")
+
+
+def snapshot_path(instance_name: str) -> Path:
+    safe = re.sub(r"[^A-Za-z0-9_.-]", "_", instance_name)
+    return get_data_dir() / "libraries" / f"{safe}.snap"
+
+
+def _pad(n: int) -> int:
+    return -n % 8
+
+
+def _column(view: memoryview) -> array:
+    column = array("q")
+    column.frombytes(view)
+    return column
+
+
+class _MappedRecords(MutableSequence[dict]):
+    """Records decoded from the mapped blob on first access, then kept.
+
+    Each slot holds a decoded record or the row it still has to be decoded
+    from, so a patched copy of the table (LibraryTable.with_record) shares the
+    mapping instead of decoding every record up front.
+    """
+
+    def __init__(self, blob: memoryview, offsets: memoryview, slots: list[dict | int] | None = None):
+        self._blob = blob
+        self._offsets = offsets
+        self._slots = slots if slots is not None else list(range(len(offsets) - 1))
+
+    def __getitem__(self, row):  # type: ignore[override]
+        slot = self._slots[row]
+        if isinstance(slot, int):
+            slot = json.loads(bytes(self._blob[self._offsets[slot] : self._offsets[slot + 1]]))
+            self._slots[row] = slot
+        return slot
+
+    def __setitem__(self, row, record) -> None:  # type: ignore[override]
+        self._slots[row] = record
+
+    def __delitem__(self, row) -> None:  # type: ignore[override]
+        del self._slots[row]
+
+    def insert(self, row: int, record: dict) -> None:
+        self._slots.insert(row, record)
+
+    def copy(self) -> "_MappedRecords":
+        return _MappedRecords(self._blob, self._offsets, list(self._slots))
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+
+class DiskLibrary(LibraryTable):
+    """A library table read from one snapshot file."""
+
+    def __init__(self, path: Path):
+        with path.open("rb") as fh:
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        if view[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path}: not a library snapshot")
+        (header_len,) = _LENGTH.unpack_from(view, len(MAGIC))
+        start = len(MAGIC) + _LENGTH.size
+        self.header = json.loads(bytes(view[start : start + header_len]))
+        if self.header.get("byteorder") != sys.byteorder:
+            raise ValueError(f"{path}: written on a {self.header.get('byteorder')}-endian machine")
+        count = self.header["count"]
+        start += header_len + _pad(len(MAGIC) + _LENGTH.size + header_len)
+        ids = _column(view[start : start + 8 * count])
+        columns = {}
+        for name in self.header["columns"]:
+            start += 8 * count
+            columns[name] = _column(view[start : start + 8 * count])
+        start += 8 * count
+        offsets = view[start : start + 8 * (count + 1)].cast("q")
+        if len(ids) != count or len(offsets) != count + 1:
+            raise ValueError(f"{path}: truncated")
+        super().__init__(ids, columns, _MappedRecords(view[start + 8 * (count + 1) :], offsets))
+
+    @property
+    def fetched_at(self) -> float:
+        return self.header["fetched_at"]
+
+    @property
+    def full_at(self) -> float:
+        """When the library was last dumped in full (fetched_at may be a delta sync since)."""
+        return self.header.get("full_at", self.fetched_at)
+
+
+def save_snapshot(instance_name: str, fetched_at: float, table: LibraryTable, full_at: float | None = None) -> None:
+    """Write one instance's library to disk. Best-effort: a failure is logged, never raised."""
+    path = snapshot_path(instance_name)
+    offsets = array("q", [0])
+    chunks: list[bytes] = []
+    for ext_id in table.ids:
+        chunk = json.dumps(table[ext_id], separators=(",", ":")).encode()
+        chunks.append(chunk)
+        offsets.append(offsets[-1] + len(chunk))
+    header = json.dumps(
+        {
+            "instance": instance_name,
+            "fetched_at": fetched_at,
+            "full_at": fetched_at if full_at is None else full_at,
+            "count": len(table),
+            "byteorder": sys.byteorder,
+            "columns": list(table.columns),
+        }
+    ).encode()
+    prefix = MAGIC + _LENGTH.pack(len(header)) + header
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".snap.tmp")
+        with tmp.open("wb") as fh:
+            fh.write(prefix + b"\0" * _pad(len(prefix)))
+            fh.write(array("q", table.ids).tobytes())
+            for column in table.columns.values():
+                fh.write(array("q", column).tobytes())
+            fh.write(offsets.tobytes())
+            fh.writelines(chunks)
+        os.chmod(tmp, 0o600)
+        tmp.replace(path)
+    except OSError as exc:
+        logger.warning("could not write library snapshot for %s: %s", instance_name, exc)
+
+
+def discard_snapshot(instance_name: str | None = None) -> None:
+    """Delete one instance's snapshot file (or all of them) — it is known to be stale."""
+    paths = [snapshot_path(instance_name)] if instance_name else (get_data_dir() / "libraries").glob("*.snap")
+    for path in paths:
+        try:
+            path.unlink(missing_ok=True)
+        except OSError as exc:
+            logger.warning("could not remove library snapshot %s: %s", path, exc)
+
+
+def load_snapshot(instance_name: str) -> DiskLibrary | None:
+    path = snapshot_path(instance_name)
+    if not path.is_file():
+        return None
+    try:
+        return DiskLibrary(path)
+    except (OSError, ValueError, KeyError) as exc:
+        logger.warning("ignoring unreadable library snapshot %s: %s", path, exc)
+        return None
@@ -7,6 +7,7 @@ its output. Styling follows the readablecode "terminal navy" design system
 """
 
 import asyncio
+from contextlib import aclosing
 
 from rich.text import Text
 from textual import on, work
@@ -29,11 +30,14 @@ from ..aggregation import (
     add_to_instance,
     check_plex_availability,
     enrich_tv_statuses,
-    search_everywhere,
+    search_progressively,
 )
+from ..clients import close_http_clients
 from ..config import load_media_config
 from ..health import format_bytes
+from ..library import LibraryRefresher
 from ..models import AggregatedResult, MediaType, PresenceState
+from ..typeahead import library_matches
 
 # terminal-navy tokens (dotfiles design/tokens.css)
 BG = "#0d1420"
@@ -81,6 +85,7 @@ STATE_GLYPHS = {
     PresenceState.MONITORED_INCOMPLETE: f"[{AMBER_BRIGHT}]◐[/]",
     PresenceState.NOT_PRESENT: f"[{MUTED}]○[/]",
     PresenceState.UNREACHABLE: f"[{RED}]✗[/]",
+    PresenceState.PENDING: f"[{MUTED}]…[/]",
 }
 
 STATE_LABELS = {
@@ -88,6 +93,7 @@ STATE_LABELS = {
     PresenceState.MONITORED_INCOMPLETE: "incomplete",
     PresenceState.NOT_PRESENT: "not present",
     PresenceState.UNREACHABLE: "unreachable",
+    PresenceState.PENDING: "checking…",
 }
 
 
@@ -306,6 +312,7 @@ class MediaRemote(App):
         self.theme = "terminal-navy"
         self.media_type = MediaType.TV
         self.config = load_media_config()
+        self.refresher = LibraryRefresher(self.config)
         self.results: dict[str, AggregatedResult] = {}
         self._search_timer = None
 
@@ -329,6 +336,11 @@ class MediaRemote(App):
         for warning in self.config.warnings:
             self.notify(warning, severity="warning", timeout=8)
         self.query_one(Input).focus()
+        self.refresher.start()  # warm every library now, keep them fresh while open
+
+    async def on_unmount(self) -> None:
+        await self.refresher.stop()
+        await close_http_clients()
 
     def _update_subtitle(self) -> None:
         instances = self.config.arr_instances(self.media_type.value)
@@ -362,21 +374,41 @@ class MediaRemote(App):
 
     @work(exclusive=True, group="search")
     async def run_search(self, query: str) -> None:
-        results = await search_everywhere(query, self.media_type, self.config)
-        self.results = {r.result.external_key: r for r in results[:20]}
+        # library titles show at once, from memory; then rows appear as soon as
+        # any instance answers, and the rest fill in as they do
+        matches = library_matches(query, self.media_type, self.config, limit=20)
+        if matches:
+            self._show_results(matches)
+        updates = search_progressively(query, self.media_type, self.config, lookup_once=True, limit=20)
+        results: list[AggregatedResult] = []
+        async with aclosing(updates):
+            async for results in updates:
+                self._show_results(results)
+        if not results:
+            self.results = {}
+            self.query_one(DataTable).clear()
+            self.query_one("#detail", Static).update("no results.")
 
+    def _show_results(self, results: list[AggregatedResult]) -> None:
         table = self.query_one(DataTable)
-        table.clear()
+        instances = self.config.arr_instances(self.media_type.value)
+        first = not self.results or list(self.results) != [r.result.external_key for r in results]
+        self.results = {r.result.external_key: r for r in results}
+        if first:
+            table.clear()
         for key, aggregated in self.results.items():
-            row = [aggregated.result.title, str(aggregated.result.year or "")]
-            for instance in self.config.arr_instances(self.media_type.value):
+            glyphs = []
+            for instance in instances:
                 status = aggregated.status_for(instance.name)
-                row.append(STATE_GLYPHS[status.state] if status else "?")
-            table.add_row(*row, key=key)
-        if self.results:
+                glyphs.append(STATE_GLYPHS[status.state] if status else "?")
+            if first:
+                table.add_row(aggregated.result.title, str(aggregated.result.year or ""), *glyphs, key=key)
+            else:
+                # same rows, later answers — update in place so the cursor stays put
+                for instance, glyph in zip(instances, glyphs):
+                    table.update_cell(key, instance.name, glyph)
+        if first and self.results:
             table.focus()
-        else:
-            self.query_one("#detail", Static).update("no results.")
 
     # --- detail / plex ------------------------------------------------------
 
@@ -391,7 +423,8 @@ class MediaRemote(App):
 
     @work(exclusive=True, group="enrich")
     async def enrich_detail(self, aggregated: AggregatedResult) -> None:
-        """Lookup responses lack per-season statistics — refetch the real series records."""
+        """Lookup responses lack per-season statistics — fill them in from the library
+        snapshot (or the real series records when it is stale)."""
         if any(s.series_id for s in aggregated.statuses):
             await enrich_tv_statuses(aggregated, self.config)
             self._render_detail(aggregated)
@@ -433,7 +466,7 @@ class MediaRemote(App):
             if status.size_on_disk:
                 line += f" · {format_bytes(status.size_on_disk)}"
             lines.append(line)
-            for season in sorted(status.seasons, key=lambda s: (s.season_number == 0, s.season_number)):
+            for season in sorted(status.season_details(), key=lambda s: (s.season_number == 0, s.season_number)):
                 label = "SP" if season.season_number == 0 else f"S{season.season_number}"
                 mark = f"[{GREEN_BRIGHT}]✓[/]" if season.monitored else f"[{MUTED}]✗[/]"
                 denominator = season.total_episode_count or season.episode_count
@@ -0,0 +1,210 @@
+"""Instant title matches from the library snapshots already in memory.
+
+Most searches are for something at least one instance already has, and every
+instance's library is in memory anyway (engine/media/library). A `TitleIndex`
+per media type maps the trigrams of every title, alternate title, year and
+external id in those snapshots to the titles that contain them, so
+`library_matches` answers a keystroke with merged, cross-instance statuses in
+well under 10 ms — while the remote lookup is still running — without asking
+any server anything.
+
+The index follows the snapshots as they are stored, loaded or patched
+(`library.watch_snapshots`), not on the keystroke path. Each instance's table
+is compared with the one it was last built from, and only titles that
+appeared, disappeared or changed what is searchable about them (names, year,
+ids) are re-indexed — a full re-dump of an unchanged library re-indexes
+nothing.
+"""
+
+import re
+from dataclasses import dataclass, field
+
+from .columns import LibraryTable
+from .config import MediaConfig
+from .library import cached_snapshot, client_for, watch_snapshots
+from .models import AggregatedResult, InstanceStatus, MediaType, PresenceState
+
+_WORD = re.compile(r"\w+")
+_ID_FIELDS = ("tvdbId", "tmdbId", "imdbId")
+
+
+def normalize(text: str) -> str:
+    """Casefolded words separated by single spaces — punctuation ignored."""
+    return " ".join(_WORD.findall(text.casefold()))
+
+
+def _grams(word: str) -> set[str]:
+    """Trigrams of a word padded at the front, so one- and two-letter prefixes
+    ("  s", " se") are trigrams too. A typed word's grams are a subset of
+    those of every word it is a prefix of."""
+    padded = f"  {word}"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _text_grams(text: str) -> set[str]:
+    return set().union(*(_grams(word) for word in text.split()))
+
+
+def _fingerprint(record: dict) -> tuple:
+    """Everything the index reads from a record; equal fingerprints index alike."""
+    alternates = tuple(alt.get("title") for alt in record.get("alternateTitles") or ())
+    return (record.get("title"), alternates, record.get("year"), *map(record.get, _ID_FIELDS))
+
+
+@dataclass
+class _Title:
+    ext_id: int
+    names: list[str]  # normalized title, alternate titles
+    search_text: str  # names + year + external ids, for the final substring check
+    fingerprint: tuple = ()  # of the record the names came from
+    records: dict[str, dict] = field(default_factory=dict)  # instance -> library record
+
+
+class TitleIndex:
+    """Trigram index over one media type's titles across every instance."""
+
+    def __init__(self, media_type: MediaType):
+        self.media_type = media_type
+        self._titles: dict[int, _Title] = {}
+        self._postings: dict[str, set[int]] = {}
+        self._sources: dict[str, LibraryTable] = {}  # instance -> the table last indexed
+
+    def sync(self, instance: str, table: LibraryTable | None) -> None:
+        """Bring the instance's titles in line with its current snapshot."""
+        previous = self._sources.get(instance)
+        if table is previous:
+            return
+        old_ids = set(previous) if previous is not None else set()
+        new_ids = set(table) if table is not None else set()
+        for ext_id in old_ids - new_ids:
+            self._drop(instance, ext_id)
+        for ext_id in new_ids:
+            record = table[ext_id]  # type: ignore[index]
+            title = self._titles.get(ext_id)
+            if title is None or title.records.get(instance) is not record:
+                self._put(instance, ext_id, record)  # new, patched or re-dumped
+        if table is None:
+            self._sources.pop(instance, None)
+        else:
+            self._sources[instance] = table
+
+    def _put(self, instance: str, ext_id: int, record: dict) -> None:
+        title = self._titles.get(ext_id)
+        if title is None:
+            title = self._titles[ext_id] = _Title(ext_id, [], "")
+        title.records[instance] = record  # always: statuses come from the latest record
+        if next(iter(title.records.values())) is record and _fingerprint(record) != title.fingerprint:
+            self._reindex(title)  # the names come from the first instance that has it
+
+    def _drop(self, instance: str, ext_id: int) -> None:
+        title = self._titles.get(ext_id)
+        if title is None or instance not in title.records:
+            return
+        was_first = next(iter(title.records)) == instance
+        del title.records[instance]
+        if not title.records:
+            self._unindex(title)
+            del self._titles[ext_id]
+        elif was_first:
+            self._reindex(title)
+
+    def _reindex(self, title: _Title) -> None:
+        self._unindex(title)
+        record = next(iter(title.records.values()))
+        title.fingerprint = _fingerprint(record)
+        names = [normalize(record.get("title", ""))]
+        names += [normalize(alt.get("title", "")) for alt in record.get("alternateTitles") or []]
+        title.names = [n for n in dict.fromkeys(names) if n] or [""]
+        ids = [str(record.get(key)) for key in _ID_FIELDS if record.get(key)]
+        title.search_text = " ".join([*title.names, str(record.get("year") or ""), *ids])
+        for gram in _text_grams(title.search_text):
+            self._postings.setdefault(gram, set()).add(title.ext_id)
+
+    def _unindex(self, title: _Title) -> None:
+        if not title.search_text:
+            return
+        for gram in _text_grams(title.search_text):
+            keys = self._postings.get(gram)
+            if keys is not None:
+                keys.discard(title.ext_id)
+                if not keys:
+                    del self._postings[gram]
+
+    def search(self, query: str, limit: int = 10) -> list[_Title]:
+        """Titles with a word starting with each word of `query` (in a name,
+        the year or an id), best first: exact title, title prefix, a name
+        word prefix, then the rest."""
+        words = normalize(query).split()
+        if not words:
+            return []
+        candidates: set[int] | None = None
+        # rarest gram first keeps the running intersection small
+        for gram in sorted(_text_grams(" ".join(words)), key=lambda g: len(self._postings.get(g, ()))):
+            keys = self._postings.get(gram, set())
+            candidates = set(keys) if candidates is None else candidates & keys
+            if not candidates:
+                return []
+        phrase = " ".join(words)
+        matches = [
+            title
+            for title in (self._titles[ext_id] for ext_id in candidates or ())
+            if all(f" {w}" in f" {title.search_text}" for w in words)
+        ]
+        matches.sort(key=lambda title: (_rank(title, phrase), -len(title.records), title.names[0]))
+        return matches[:limit]
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+
+def _rank(title: _Title, phrase: str) -> int:
+    if phrase in title.names:
+        return 0
+    if any(name.startswith(phrase) for name in title.names):
+        return 1
+    if any(f" {phrase}" in f" {name}" for name in title.names):
+        return 2
+    return 3  # matched on an alternate word order, the year or an id
+
+
+_indexes: dict[MediaType, TitleIndex] = {}
+
+
+def title_index(media_type: MediaType) -> TitleIndex:
+    index = _indexes.get(media_type)
+    if index is None:
+        index = _indexes[media_type] = TitleIndex(media_type)
+    return index
+
+
+def _on_snapshot(instance_name: str, media_type: MediaType, table: LibraryTable) -> None:
+    title_index(media_type).sync(instance_name, table)
+
+
+watch_snapshots(_on_snapshot)
+
+
+def library_matches(query: str, media_type: MediaType, config: MediaConfig, limit: int = 10) -> list[AggregatedResult]:
+    """Titles already in some instance's library that match `query`, with every
+    instance's status — from memory only, never a request. Instances without
+    a snapshot yet carry PENDING rows."""
+    index = title_index(media_type)
+    instances = config.arr_instances(media_type.value)
+    for instance in instances:
+        # normally already in step (an identity check); catches snapshots dropped
+        # by invalidate_library_cache or stored before this module was imported
+        snapshot = cached_snapshot(instance.name)
+        index.sync(instance.name, snapshot.index if snapshot is not None else None)
+
+    clients = [client_for(instance, media_type) for instance in instances]
+    results = []
+    for title in index.search(query, limit):
+        first = next(iter(title.records.values()))
+        statuses = [
+            client.to_status(title.records.get(client.name))
+            if cached_snapshot(client.name) is not None
+            else InstanceStatus(instance=client.name, state=PresenceState.PENDING)
+            for client in clients
+        ]
+        results.append(AggregatedResult(result=clients[0].to_search_result(first), statuses=statuses))
+    return results
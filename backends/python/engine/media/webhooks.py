@@ -0,0 +1,114 @@
+"""Sonarr/Radarr "Connect" webhooks — library changes pushed instead of polled.
+
+Each instance posts its events (Grab, Download, SeriesAdd, SeriesDelete,
+MovieFileDelete, ...) to the web app's `/webhooks/{instance}` route. An event
+names one title, so handling it costs one small request: that title's library
+record is refetched and patched into the instance's snapshot (deletes patch
+it out without asking). Every subscriber — an open web session — then gets a
+`LibraryChange` with the instance's fresh status for the title, and the
+instance is marked push-driven so the background refresher can back off.
+"""
+
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from .config import ArrInstance, MediaConfig
+from .library import client_for, note_push, patch_library, refresh_title
+from .models import AggregatedResult, InstanceStatus, MediaType
+
+logger = logging.getLogger(__name__)
+
+# Events that mean the title is gone from the instance's library altogether.
+# Everything else (file imported or deleted, grabbed, renamed, edited...) is
+# answered by refetching the title's record.
+_REMOVED_EVENTS = {"SeriesDelete", "MovieDelete"}
+# Connection checks and events that don't name a library title.
+_IGNORED_EVENTS = {"Test", "Health", "HealthRestored", "ApplicationUpdate", "ManualInteractionRequired"}
+
+
+@dataclass
+class LibraryChange:
+    instance: str
+    media_type: MediaType
+    event_type: str
+    external_key: str  # same key search results merge on, e.g. "tvdb:371980"
+    status: InstanceStatus  # the instance's presence for the title after the event
+
+
+Listener = Callable[[LibraryChange], object]
+_listeners: set[Listener] = set()
+
+
+def subscribe(listener: Listener) -> Callable[[], None]:
+    """Call `listener` with every library change; returns the unsubscribe."""
+    _listeners.add(listener)
+    return lambda: _listeners.discard(listener)
+
+
+def _publish(change: LibraryChange) -> None:
+    for listener in list(_listeners):
+        try:
+            listener(change)
+        except Exception:  # noqa: BLE001 — one broken session must not starve the others
+            logger.exception("library change listener failed")
+
+
+def find_instance(config: MediaConfig, instance_name: str) -> tuple[ArrInstance, MediaType]:
+    """The configured instance and what it serves. KeyError when unknown."""
+    for media_type in (MediaType.TV, MediaType.MOVIE):
+        for instance in config.arr_instances(media_type.value):
+            if instance.name == instance_name:
+                return instance, media_type
+    raise KeyError(instance_name)
+
+
+async def handle_event(config: MediaConfig, instance_name: str, payload: dict) -> LibraryChange | None:
+    """Apply one webhook event from the instance to its snapshot and publish it.
+
+    Returns None for events that don't touch a title (the "Test" button,
+    health notices). Raises KeyError for an unknown instance and ValueError
+    for a payload that names no title.
+    """
+    instance, media_type = find_instance(config, instance_name)
+    event_type = str(payload.get("eventType", ""))
+    if event_type in _IGNORED_EVENTS:
+        return None
+    client = client_for(instance, media_type)
+    if media_type == MediaType.TV:
+        id_field, ext_id = "tvdbId", (payload.get("series") or {}).get("tvdbId")
+    else:
+        id_field, ext_id = "tmdbId", (payload.get("movie") or {}).get("tmdbId")
+    if not ext_id:
+        raise ValueError(f"{event_type or 'event'} payload has no {id_field}")
+
+    note_push(instance_name)
+    if event_type in _REMOVED_EVENTS:
+        record = None
+        patch_library(client, ext_id, None)
+    else:
+        record = await refresh_title(client, ext_id)
+    change = LibraryChange(
+        instance=instance_name,
+        media_type=media_type,
+        event_type=event_type,
+        external_key=f"{id_field.removesuffix('Id')}:{ext_id}",
+        status=client.to_status(record),
+    )
+    logger.info("webhook %s from %s: %s", event_type, instance_name, change.external_key)
+    _publish(change)
+    return change
+
+
+def apply_change(results: list[AggregatedResult], change: LibraryChange) -> list[AggregatedResult]:
+    """Swap the instance's status row on every matching result, in place;
+    returns the results that changed."""
+    changed = []
+    for aggregated in results:
+        if aggregated.result.media_type != change.media_type or aggregated.result.external_key != change.external_key:
+            continue
+        aggregated.statuses = [
+            change.status if status.instance == change.instance else status for status in aggregated.statuses
+        ]
+        changed.append(aggregated)
+    return changed
@@ -18,6 +18,10 @@ class Service:
     api_key_env: str = ""
     quality_profile: str = ""  # arr-only: preferred profile name, else first available
     root_folder: str = ""  # arr-only: preferred root folder, else first available
+    pool_size: int | None = None  # arr-only: keep-alive connections held open; default when unset
+    timeouts: dict[str, float] = field(default_factory=dict)  # seconds per endpoint class / "connect"
+    library_refresh_seconds: float | None = None  # arr-only: background library refresh interval
+    full_resync_seconds: float | None = None  # arr-only: full library dump interval under delta sync
 
 
 @dataclass
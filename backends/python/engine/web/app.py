@@ -13,6 +13,7 @@ admins add titles directly and work the approval queue at /requests; users
 can only file requests there (engine/media/requests).
 """
 
+import hmac
 import os
 
 from ..config import get_data_dir
@@ -23,11 +24,15 @@ from ..media.aggregation import (
     refresh_status,
     search_everywhere,
 )
+from ..media.clients import close_http_clients
 from ..media.config import MediaConfig, load_media_config
 from ..media.health import check_all_servers, estimate_add_bytes, format_bytes
+from ..media.library import LibraryRefresher
 from ..media.models import AggregatedResult, MediaType, PresenceState, ServerHealth
 from ..media.notifications import notify_new_request
 from ..media.requests import MediaRequest, RequestStatus, RequestStore, fulfill_request
+from ..media.typeahead import library_matches
+from ..media.webhooks import LibraryChange, apply_change, find_instance, handle_event, subscribe
 from .auth import (
     LoginRateLimiter,
     attempt_login,
@@ -38,11 +43,16 @@ from .auth import (
 )
 from .users import User, UserStore
 
+# Search-as-you-type renders by this deadline even while a server is slow;
+# late instances are patched in as they answer.
+SEARCH_DEADLINE_SECONDS = 0.4
+
 STATE_BADGE = {
     PresenceState.MONITORED_COMPLETE: ("● complete", "state-complete"),
     PresenceState.MONITORED_INCOMPLETE: ("◐ partial", "state-partial"),
     PresenceState.NOT_PRESENT: ("○ not present", "state-absent"),
     PresenceState.UNREACHABLE: ("✗ unreachable", "state-error"),
+    PresenceState.PENDING: ("… checking", "state-absent"),
 }
 
 # readablecode "terminal navy" tokens (dotfiles design/tokens.css) plus the
@@ -212,7 +222,8 @@ def _season_chip(season) -> str:
 
 
 def _stats_line(health: ServerHealth) -> str:
-    """'812 shows · 24,331 episodes · 18.9 TB' — only the parts this server has."""
+    """'812 shows · 24,331 episodes · 18.9 TB' (Plex: 'index 12s old') — only the
+    parts this server has."""
     parts = []
     if health.series_count is not None:
         parts.append(f"{health.series_count:,} shows")
@@ -222,12 +233,14 @@ def _stats_line(health: ServerHealth) -> str:
         parts.append(f"{health.movie_count:,} movies")
     if health.library_size_bytes:
         parts.append(format_bytes(health.library_size_bytes))
+    if health.index_age_seconds is not None:
+        parts.append(f"index {health.index_age_seconds:.0f}s old")
     return " · ".join(parts)
 
 
 def run_web(host: str = "127.0.0.1", port: int = 8788) -> None:  # noqa: C901 — wires every page
     from fastapi import Request
-    from fastapi.responses import RedirectResponse
+    from fastapi.responses import JSONResponse, RedirectResponse
     from nicegui import Client, app, run, ui
     from nicegui.storage import Storage
     from starlette.middleware.base import BaseHTTPMiddleware
@@ -265,6 +278,37 @@ def run_web(host: str = "127.0.0.1", port: int = 8788) -> None:  # noqa: C901 
 
     app.add_middleware(AuthMiddleware)
 
+    @app.post("/webhooks/{instance_name}")
+    async def webhook(instance_name: str, request: Request) -> JSONResponse:
+        """Sonarr/Radarr Connect → Webhook target (engine/media/webhooks).
+
+        Not a page, so the session middleware lets it through; the instance
+        proves itself with its own API key (`?apikey=` or X-Api-Key).
+        """
+        try:
+            instance, _ = find_instance(config, instance_name)
+        except KeyError:
+            return JSONResponse({"error": f"unknown instance {instance_name}"}, status_code=404)
+        key = request.query_params.get("apikey") or request.headers.get("x-api-key") or ""
+        if not hmac.compare_digest(key.encode(), instance.api_key.encode()):
+            return JSONResponse({"error": "bad api key"}, status_code=401)
+        try:
+            payload = await request.json()
+            change = await handle_event(config, instance_name, payload if isinstance(payload, dict) else {})
+        except ValueError as exc:  # malformed JSON or no title in it
+            return JSONResponse({"error": str(exc)}, status_code=400)
+        except Exception as exc:  # noqa: BLE001 — the refresher catches up on its next round
+            return JSONResponse({"error": str(exc) or type(exc).__name__}, status_code=502)
+        return JSONResponse({"ok": True, "title": change.external_key if change else None})
+
+    # Library snapshots are warmed at startup and kept fresh in the background,
+    # so searches never wait on a library dump; the pooled keep-alive
+    # connections to every server close on the way out.
+    refresher = LibraryRefresher(config)
+    app.on_startup(refresher.start)
+    app.on_shutdown(refresher.stop)
+    app.on_shutdown(close_http_clients)
+
     def _theme() -> None:
         ui.colors(
             primary="#2ea043",
@@ -344,7 +388,14 @@ def run_web(host: str = "127.0.0.1", port: int = 8788) -> None:  # noqa: C901 
         if user is None:  # middleware already redirects; belt and braces
             ui.navigate.to("/login")
             return
-        state: dict = {"media_type": MediaType.TV, "health": {}}
+        state: dict = {
+            "media_type": MediaType.TV,
+            "health": {},
+            "search_seq": 0,
+            "search": None,
+            "results": [],
+            "detail": None,
+        }
 
         def _health_card(health: ServerHealth) -> None:
             with ui.card().classes("grow basis-52 gap-1 p-3"):
@@ -353,6 +404,10 @@ def run_web(host: str = "127.0.0.1", port: int = 8788) -> None:  # noqa: C901 
                     if health.up:
                         ping = f" {health.ping_ms:.0f}ms" if health.ping_ms is not None else ""
                         ui.label(f"● up{ping}").classes("state-complete text-xs shrink-0")
+                    elif health.circuit == "open":
+                        # breaker open: requests fail fast until the next probe
+                        retry = f" · retry {health.circuit_retry_in:.0f}s" if health.circuit_retry_in else ""
+                        ui.label(f"✗ down · circuit open{retry}").classes("state-error text-xs shrink-0")
                     else:
                         ui.label("✗ down").classes("state-error text-xs shrink-0")
                 if health.disk_total_bytes:
@@ -410,14 +465,54 @@ def run_web(host: str = "127.0.0.1", port: int = 8788) -> None:  # noqa: C901 
             query = (search_box.value or "").strip()
             if len(query) < 2:
                 return
+            state["search_seq"] += 1
+            seq = state["search_seq"]
+            if state["search"] is not None:
+                state["search"].cancel()  # the older keystroke's late answers are moot
+                state["search"] = None
+
+            def backfill(results: list[AggregatedResult]) -> None:
+                if seq == state["search_seq"]:  # not superseded by a newer keystroke
+                    render_results(results[:20])
+
+            def settled(_task: object = None) -> None:
+                if seq == state["search_seq"]:
+                    spinner.visible = False
+
+            # titles some instance already has, from memory, before any server answers
+            matches = library_matches(query, state["media_type"], config, limit=20)
+            if matches:
+                render_results(matches)
             spinner.visible = True
             try:
-                results = await search_everywhere(query, state["media_type"], config)
-            finally:
-                spinner.visible = False
-            render_results(results[:20])
+                # one metadata lookup per keystroke, not one per instance; render once
+                # within the deadline, then again as each slower instance answers
+                results = await search_everywhere(
+                    query,
+                    state["media_type"],
+                    config,
+                    lookup_once=True,
+                    deadline=SEARCH_DEADLINE_SECONDS,
+                    on_backfill=backfill,
+                    limit=20,
+                )
+            except BaseException:
+                settled()
+                raise
+            if seq != state["search_seq"]:
+                results.cancel()
+                return
+            if results.settled:
+                settled()
+            else:
+                state["search"] = results
+                results.backfill.add_done_callback(settled)
+                if not results:
+                    return  # nothing merged yet: keep the typeahead view, the backfill renders
+            backfill(results)
 
         def render_results(results: list[AggregatedResult]) -> None:
+            state["results"] = results
             results_area.clear()
             with results_area:
                 if not results:
@@ -488,11 +583,11 @@ def run_web(host: str = "127.0.0.1", port: int = 8788) -> None:  # noqa: C901 
                             if status.size_on_disk:
                                 line += f" · {format_bytes(status.size_on_disk)}"
                             ui.label(line).classes(state_class)
-                            if status.seasons:
+                            if status.season_details():
                                 chips = "  ".join(
                                     _season_chip(s)
                                     for s in sorted(
-                                        status.seasons, key=lambda s: (s.season_number == 0, s.season_number)
+                                        status.season_details(), key=lambda s: (s.season_number == 0, s.season_number)
                                     )
                                     if s.total_episode_count or s.episode_count or s.monitored
                                 )
@@ -597,6 +692,8 @@ def run_web(host: str = "127.0.0.1", port: int = 8788) -> None:  # noqa: C901 
 
                 render_statuses()
                 render_plex()
+            state["detail"] = (aggregated, render_statuses)
+            dialog.on("hide", lambda: state.update(detail=None))
             dialog.open()
 
             if any(s.series_id for s in aggregated.statuses):
@@ -606,6 +703,22 @@ def run_web(host: str = "127.0.0.1", port: int = 8788) -> None:  # noqa: C901 
                 await check_plex_availability(aggregated, config)
                 render_plex()
 
+        def on_library_change(change: LibraryChange) -> None:
+            """A webhook moved a title: re-render it wherever this session shows it."""
+            detail = state["detail"]
+            shown = state["results"] + ([detail[0]] if detail and detail[0] not in state["results"] else [])
+            changed = apply_change(shown, change)
+            if not changed:
+                return
+            with page_client:
+                if any(a in state["results"] for a in changed):
+                    render_results(state["results"])
+                if detail and detail[0] in changed:
+                    detail[1]()
+
+        page_client = ui.context.client
+        page_client.on_delete(subscribe(on_library_change))
+
         async def on_toggle(e) -> None:
             state["media_type"] = e.value
             await do_search()
@@ -0,0 +1,17 @@
+import pytest
+
+from engine.media.clients.lookup_cache import lookup_cache
+
+
+@pytest.fixture(autouse=True)
+def _isolated_data_dir(tmp_path, monkeypatch):
+    """Library snapshots and other state go to a per-test data dir, never ~/.config."""
+    monkeypatch.setenv("SYNCPLEX_DATA_DIR", str(tmp_path / "data"))
+
+
+@pytest.fixture(autouse=True)
+def _empty_lookup_cache():
+    """Lookup answers are cached process-wide; every test starts cold."""
+    lookup_cache().clear()
+    yield
+    lookup_cache().clear()
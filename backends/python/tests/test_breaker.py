@@ -0,0 +1,136 @@
+"""Per-server circuit breakers (engine/media/clients/breaker)."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from engine.media.clients import SonarrClient
+from engine.media.clients import breaker as breaker_module
+from engine.media.clients.breaker import CircuitBreaker, CircuitOpenError, CircuitState
+from engine.media.config import ArrInstance
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_opens_after_threshold_and_fails_fast():
+    breaker = CircuitBreaker("sonarr-a", failure_threshold=3, clock=FakeClock())
+    for _ in range(2):
+        breaker.before_request()
+        breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+
+def test_half_open_probe_closes_or_reopens_with_longer_backoff():
+    clock = FakeClock()
+    breaker = CircuitBreaker("sonarr-a", failure_threshold=1, base_backoff=5.0, clock=clock)
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.retry_in == 5.0
+
+    clock.now += 5.0
+    breaker.before_request()  # the probe
+    assert breaker.state == CircuitState.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()  # only one probe at a time
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.retry_in == 10.0  # backoff doubles
+
+    clock.now += 10.0
+    breaker.before_request()
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    breaker.before_request()  # requests flow again
+
+
+def test_in_flight_failures_landing_after_the_trip_do_not_stretch_the_backoff():
+    clock = FakeClock()
+    breaker = CircuitBreaker("sonarr-a", failure_threshold=3, base_backoff=5.0, clock=clock)
+    for _ in range(8):  # a search_many batch, all sent while the host still looked fine
+        breaker.before_request()
+    for _ in range(8):
+        clock.now += 0.1
+        breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.retry_in == pytest.approx(5.0 - 0.5)  # one trip, timed from the third failure
+
+    clock.now += 5.0
+    breaker.before_request()  # the probe
+    breaker.record_failure()
+    assert breaker.retry_in == 10.0  # second trip, not the ninth
+
+
+def test_cancelled_probe_frees_the_slot():
+    clock = FakeClock()
+    breaker = CircuitBreaker("sonarr-a", failure_threshold=1, clock=clock)
+    breaker.before_request()
+    breaker.record_failure()
+    clock.now += breaker.retry_in
+    breaker.before_request()
+    breaker.abandon()
+    breaker.before_request()  # a new probe may go
+
+
+def test_arr_client_stops_calling_a_dead_host(monkeypatch):
+    monkeypatch.setattr(breaker_module, "_breakers", {})
+    client = SonarrClient(ArrInstance(name="sonarr-dead", base_url="http://dead", api_key="k"))
+    calls = {"n": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls["n"] += 1
+        raise httpx.ConnectError("no route to host", request=request)
+
+    client._client = lambda: httpx.AsyncClient(  # type: ignore[method-assign]
+        transport=httpx.MockTransport(handler), base_url="http://dead"
+    )
+
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(client.get_library())  # first try + retry
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(client.ping_ms())  # third failure opens the circuit
+    assert calls["n"] == 3
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(client.get_library())
+    assert calls["n"] == 3  # nothing sent while open
+
+
+def test_a_busy_connection_pool_is_not_the_hosts_fault(monkeypatch):
+    monkeypatch.setattr(breaker_module, "_breakers", {})
+    client = SonarrClient(ArrInstance(name="sonarr-busy", base_url="http://busy", api_key="k"))
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.PoolTimeout("no connection free in the pool", request=request)
+
+    client._client = lambda: httpx.AsyncClient(  # type: ignore[method-assign]
+        transport=httpx.MockTransport(handler), base_url="http://busy"
+    )
+
+    for _ in range(3):
+        with pytest.raises(httpx.PoolTimeout):
+            asyncio.run(client.get_library())
+    assert breaker_module.breaker_for("sonarr-busy").state == CircuitState.CLOSED
+
+
+def test_http_error_status_counts_as_reachable(monkeypatch):
+    """A 401/500 means the host answered — it must not trip the breaker."""
+    monkeypatch.setattr(breaker_module, "_breakers", {})
+    client = SonarrClient(ArrInstance(name="sonarr-a", base_url="http://a", api_key="k"))
+    client._client = lambda: httpx.AsyncClient(  # type: ignore[method-assign]
+        transport=httpx.MockTransport(lambda request: httpx.Response(500)), base_url="http://a"
+    )
+    for _ in range(5):
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(client.disk_space())
+    assert breaker_module.breaker_for("sonarr-a").state == CircuitState.CLOSED
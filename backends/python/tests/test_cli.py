@@ -1,6 +1,11 @@
+import json
+
 from typer.testing import CliRunner
 
 from engine.cli import app
+from engine.media import cli as media_cli
+from engine.media.config import MediaConfig
+from engine.media.models import AddResult
 
 runner = CliRunner()
 
@@ -16,3 +21,23 @@ def test_media_group_is_gone():
     """Commands are flat — no `syncplex media ...` nesting."""
     result = runner.invoke(app, ["media", "--help"])
     assert result.exit_code != 0
+
+
+def test_add_from_file_streams_an_ndjson_report(monkeypatch):
+    async def add_many(queries, to, media_type, config, profile, concurrency, on_result):
+        results = [AddResult(instance=name, ok=True, message="added", query=q) for q in queries for name in to]
+        for add_result in results:
+            on_result(add_result)
+        return results
+
+    loads: list[MediaConfig] = []
+    monkeypatch.setattr(media_cli, "load_media_config", lambda: loads.append(MediaConfig()) or loads[-1])
+    monkeypatch.setattr(media_cli, "add_many", add_many)
+    result = runner.invoke(
+        app,
+        ["add", "--from-file", "-", "--to", "sonarr-a", "--ndjson"],
+        input="# watchlist\nSeverance\n\ntvdb:393189\n",
+    )
+    assert result.exit_code == 0
+    assert [json.loads(line)["query"] for line in result.output.splitlines()] == ["Severance", "tvdb:393189"]
+    assert len(loads) == 1  # the config the command loaded is the one the adds use
@@ -1,3 +1,6 @@
+from engine.media.clients.radarr import LIBRARY_COLUMNS as MOVIE_COLUMNS
+from engine.media.clients.sonarr import LIBRARY_COLUMNS as SERIES_COLUMNS
+from engine.media.columns import LibraryTable
 from engine.media.health import (
     DEFAULT_EPISODE_BYTES,
     DEFAULT_MOVIE_BYTES,
@@ -48,14 +51,16 @@ def test_storage_falls_back_to_all_mounts():
 
 def test_apply_library_stats_sonarr():
     health = ServerHealth(name="sonarr-a", kind="sonarr")
-    apply_library_stats(
-        health,
+    library = LibraryTable.from_records(
         [
-            {"statistics": {"episodeFileCount": 100, "sizeOnDisk": 100_000_000_000}},
-            {"statistics": {"episodeFileCount": 50, "sizeOnDisk": 50_000_000_000}},
-            {"statistics": {}},
+            {"tvdbId": 1, "statistics": {"episodeFileCount": 100, "sizeOnDisk": 100_000_000_000}},
+            {"tvdbId": 2, "statistics": {"episodeFileCount": 50, "sizeOnDisk": 50_000_000_000}},
+            {"tvdbId": 3, "statistics": {}},
         ],
+        "tvdbId",
+        SERIES_COLUMNS,
     )
+    apply_library_stats(health, library)
     assert health.series_count == 3
     assert health.episode_count == 150
     assert health.library_size_bytes == 150_000_000_000
@@ -64,14 +69,16 @@ def test_apply_library_stats_sonarr():
 
 def test_apply_library_stats_radarr():
     health = ServerHealth(name="radarr-a", kind="radarr")
-    apply_library_stats(
-        health,
+    library = LibraryTable.from_records(
         [
-            {"hasFile": True, "sizeOnDisk": 8_000_000_000},
-            {"hasFile": True, "sizeOnDisk": 4_000_000_000},
-            {"hasFile": False, "sizeOnDisk": 0},
+            {"tmdbId": 1, "hasFile": True, "sizeOnDisk": 8_000_000_000},
+            {"tmdbId": 2, "hasFile": True, "statistics": {"sizeOnDisk": 4_000_000_000}},  # Radarr v5
+            {"tmdbId": 3, "hasFile": False, "sizeOnDisk": 0},
         ],
+        "tmdbId",
+        MOVIE_COLUMNS,
     )
+    apply_library_stats(health, library)
     assert health.movie_count == 3
     assert health.library_size_bytes == 12_000_000_000
     assert health.avg_movie_bytes == 6_000_000_000  # only downloaded movies average
@@ -0,0 +1,95 @@
+"""Streaming JSON array parser and field projection (engine/media/clients/jsonstream)."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from engine.media.clients import RadarrClient, SonarrClient
+from engine.media.clients.jsonstream import iter_json_array, project
+from engine.media.config import ArrInstance
+
+RECORDS = [
+    {"id": 1, "title": "Amélie", "tags": [1, 2], "nested": {"a": 1, "b": [{"c": 2, "d": 3}]}},
+    {"id": 2, "title": "Ōkami ☃", "tags": [], "nested": {"a": None, "b": []}},
+    12.5,
+    "plain [string], with {braces}",
+]
+
+
+async def _chunks(body: bytes, size: int):
+    for i in range(0, len(body), size):
+        await asyncio.sleep(0)
+        yield body[i : i + size]
+
+
+def _parse(body: bytes, size: int) -> list:
+    async def _run():
+        return [item async for item in iter_json_array(_chunks(body, size))]
+
+    return asyncio.run(_run())
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 1 << 16])
+def test_elements_survive_any_chunking(size):
+    """Chunk boundaries land mid-string, mid-number and mid multi-byte character."""
+    body = json.dumps(RECORDS, ensure_ascii=False, indent=1).encode()
+    assert _parse(body, size) == RECORDS
+
+
+def test_empty_array():
+    assert _parse(b" [ ] ", 1) == []
+
+
+@pytest.mark.parametrize("body", [b'{"id": 1}', b'[{"id": 1}, {"id"', b"[1, 2", b"[1] [2]"])
+def test_malformed_bodies_raise(body):
+    with pytest.raises(ValueError):
+        _parse(body, 3)
+
+
+def test_project_keeps_only_spec_fields():
+    spec = {"id": None, "nested": {"b": {"c": None}}, "missing": None}
+    assert project(RECORDS[0], spec) == {"id": 1, "nested": {"b": [{"c": 2}]}}
+    assert project([RECORDS[0], RECORDS[1]], {"id": None}) == [{"id": 1}, {"id": 2}]
+
+
+def _library_client(cls, records: list[dict]):
+    client = cls(ArrInstance(name="arr-a", base_url="http://a", api_key="k"))
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json=records))
+    client._client = lambda: httpx.AsyncClient(transport=transport, base_url="http://a")
+    return client
+
+
+def test_sonarr_library_is_projected():
+    series = {
+        "id": 3,
+        "tvdbId": 81189,
+        "title": "Breaking Bad",
+        "alternateTitles": [{"title": "BB"}],
+        "images": [{"coverType": "poster", "url": "/p.jpg"}],
+        "path": "/tv/Breaking Bad",
+        "monitored": True,
+        "statistics": {"episodeCount": 62, "episodeFileCount": 60, "sizeOnDisk": 9, "percentOfEpisodes": 96.7},
+        "seasons": [{"seasonNumber": 1, "monitored": True, "statistics": {"episodeCount": 7, "previousAiring": "x"}}],
+    }
+    client = _library_client(SonarrClient, [series])
+    [record] = asyncio.run(client.get_library())
+    assert record == {
+        "id": 3,
+        "tvdbId": 81189,
+        "title": "Breaking Bad",
+        "alternateTitles": [{"title": "BB"}],
+        "monitored": True,
+        "statistics": {"episodeCount": 62, "episodeFileCount": 60, "sizeOnDisk": 9},
+        "seasons": [{"seasonNumber": 1, "monitored": True, "statistics": {"episodeCount": 7}}],
+    }
+    status = client.to_status(record)
+    assert status.missing_episode_count == 2 and status.season_details()[0].episode_count == 7
+
+
+def test_radarr_library_is_projected():
+    movie = {"id": 9, "tmdbId": 603, "title": "The Matrix", "hasFile": True, "sizeOnDisk": 5, "ratings": {}}
+    client = _library_client(RadarrClient, [movie])
+    [record] = asyncio.run(client.get_library())
+    assert record == {"id": 9, "tmdbId": 603, "title": "The Matrix", "hasFile": True, "sizeOnDisk": 5}
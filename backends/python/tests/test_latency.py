@@ -0,0 +1,59 @@
+"""Latency-derived timeouts (engine/media/clients/latency)."""
+
+import httpx
+
+from engine.media.clients.latency import (
+    COLD_READ_TIMEOUTS,
+    CONNECT_FLOOR,
+    DEFAULT_TIMEOUT,
+    READ_CEILINGS,
+    EndpointClass,
+    LatencyTracker,
+)
+
+
+def test_cold_tracker_uses_defaults():
+    tracker = LatencyTracker()
+    timeout = tracker.timeout(EndpointClass.LIBRARY)
+    assert timeout.read == COLD_READ_TIMEOUTS[EndpointClass.LIBRARY]
+    assert timeout.connect == DEFAULT_TIMEOUT
+
+
+def test_fast_lan_host_gets_a_tight_connect_window():
+    """A dead host that normally answers in 3 ms is given up on in milliseconds, not 8 s."""
+    tracker = LatencyTracker()
+    for _ in range(20):
+        tracker.record(EndpointClass.PING, 0.003)
+    assert tracker.timeout(EndpointClass.PING).connect == CONNECT_FLOOR
+
+
+def test_slow_healthy_class_earns_a_longer_read_window():
+    tracker = LatencyTracker()
+    for seconds in (20.0, 25.0, 28.0, 24.0, 26.0, 27.0):
+        tracker.record(EndpointClass.LOOKUP, seconds)
+    read = tracker.timeout(EndpointClass.LOOKUP).read
+    assert read > COLD_READ_TIMEOUTS[EndpointClass.LOOKUP]
+    assert read <= READ_CEILINGS[EndpointClass.LOOKUP]
+
+
+def test_hosts_json_overrides_win():
+    tracker = LatencyTracker()
+    for _ in range(20):
+        tracker.record(EndpointClass.LOOKUP, 0.5)
+    timeout = tracker.timeout(EndpointClass.LOOKUP, {"lookup": 45.0, "connect": 1.0})
+    assert timeout.read == 45.0
+    assert timeout.connect == 1.0
+
+
+def test_read_timeout_retry_depends_on_history():
+    request = httpx.Request("GET", "http://a")
+    timeout = httpx.ReadTimeout("slow", request=request)
+    tracker = LatencyTracker()
+    assert tracker.should_retry(EndpointClass.LOOKUP, timeout, 30.0)  # no history: assume a blip
+
+    for _ in range(20):
+        tracker.record(EndpointClass.LOOKUP, 25.0)
+    # this class routinely runs close to the window — a retry would only double the wait
+    assert not tracker.should_retry(EndpointClass.LOOKUP, timeout, 30.0)
+    # connection-level failures are always worth one more try
+    assert tracker.should_retry(EndpointClass.LOOKUP, httpx.ConnectError("x", request=request), 30.0)
@@ -0,0 +1,305 @@
+"""Library snapshots: stale-while-revalidate cache, on-disk snapshots and background
+refresher (engine/media/library, engine/media/snapshots)."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from engine.media import library
+from engine.media.clients import SonarrClient
+from engine.media.clients.sonarr import LIBRARY_COLUMNS
+from engine.media.columns import LibraryTable
+from engine.media.config import ArrInstance, MediaConfig
+from engine.media.library import (
+    LibraryRefresher,
+    cached_snapshot,
+    invalidate_library_cache,
+    library_index,
+    refresh_library,
+    settle_background,
+)
+from engine.media.snapshots import DiskLibrary, load_snapshot, save_snapshot, snapshot_path
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache(monkeypatch):
+    monkeypatch.setattr(library, "_library_cache", {})
+
+
+def _counting_library(monkeypatch, records: list[dict], history: dict[int, dict | None] | None = None) -> dict:
+    """Full dumps answer `records`; `history` maps Sonarr id -> its current record
+    (None: deleted) for every series with history since the snapshot."""
+    calls = {"n": 0, "deltas": 0, "fetched": []}
+
+    async def get_library(self):
+        calls["n"] += 1
+        await asyncio.sleep(0)
+        return list(records)
+
+    async def changed_since(self, since):
+        calls["deltas"] += 1
+        return set(history or {})
+
+    async def record_by_id(self, series_id):
+        calls["fetched"].append(series_id)
+        return history[series_id]
+
+    monkeypatch.setattr(SonarrClient, "get_library", get_library)
+    monkeypatch.setattr(SonarrClient, "changed_since", changed_since)
+    monkeypatch.setattr(SonarrClient, "record_by_id", record_by_id)
+    return calls
+
+
+def _client(name="sonarr-a", refresh=120.0) -> SonarrClient:
+    return SonarrClient(ArrInstance(name=name, base_url="http://a", api_key="k", library_refresh_seconds=refresh))
+
+
+def test_fresh_snapshot_is_reused(monkeypatch):
+    calls = _counting_library(monkeypatch, [{"tvdbId": 1, "id": 7}])
+
+    async def _run():
+        first = await library_index(_client())
+        second = await library_index(_client())
+        return first, second
+
+    first, second = asyncio.run(_run())
+    assert first is second
+    assert first == {1: {"tvdbId": 1, "id": 7}}
+    assert calls["n"] == 1
+
+
+def test_expired_snapshot_is_served_while_it_revalidates(monkeypatch):
+    calls = _counting_library(monkeypatch, [{"tvdbId": 1, "id": 7}])
+    client = _client()
+    asyncio.run(library_index(client))
+    snapshot = cached_snapshot(client.name)
+
+    async def _serve_stale():
+        snapshot.expires_at = snapshot.fetched_at - 1  # just expired
+        served = await library_index(client)
+        assert served is snapshot.index  # no waiting on the refetch
+        assert calls["deltas"] == 0
+        await asyncio.gather(*library._background)
+        return served
+
+    asyncio.run(_serve_stale())
+    assert calls["n"] == 1 and calls["deltas"] == 1  # revalidated from history, not a dump
+    assert cached_snapshot(client.name).fresh  # revalidated by the background refresh
+
+
+def test_too_stale_snapshot_blocks_on_refetch(monkeypatch):
+    calls = _counting_library(monkeypatch, [{"tvdbId": 1, "id": 7}])
+    client = _client()
+    asyncio.run(library_index(client))
+    cached_snapshot(client.name).expires_at = 0.0  # expired decades ago
+    asyncio.run(library_index(client))
+    assert calls["deltas"] == 1
+    assert cached_snapshot(client.name).age < 5
+
+
+def test_refresher_warms_every_instance_at_start(monkeypatch):
+    calls = _counting_library(monkeypatch, [{"tvdbId": 1, "id": 7}])
+    config = MediaConfig(
+        sonarr=[
+            ArrInstance(name="sonarr-a", base_url="http://a", api_key="k"),
+            ArrInstance(name="sonarr-b", base_url="http://b", api_key="k"),
+        ]
+    )
+
+    async def _run():
+        refresher = LibraryRefresher(config)
+        refresher.start()
+        await asyncio.sleep(0.01)
+        await refresher.stop()
+
+    asyncio.run(_run())
+    assert calls["n"] == 2
+    for name in ("sonarr-a", "sonarr-b"):
+        snapshot = cached_snapshot(name)
+        # snapshots outlive the refresh interval so searches never find them expired
+        assert snapshot.expires_at - snapshot.fetched_at > 120.0
+
+
+def _table(index: dict[int, dict]) -> LibraryTable:
+    return LibraryTable.from_records(index.values(), "tvdbId", LIBRARY_COLUMNS)
+
+
+def test_table_columns_and_index():
+    table = _table(
+        {
+            42: {"tvdbId": 42, "monitored": True, "statistics": {"episodeFileCount": 3, "sizeOnDisk": 30}},
+            7: {"tvdbId": 7, "statistics": {"episodeFileCount": 1, "sizeOnDisk": 10}},
+        }
+    )
+    assert list(table) == [7, 42]
+    assert table.row(42) == 1 and table.row(8) is None
+    assert table[42]["statistics"]["sizeOnDisk"] == 30
+    assert table.total("size_on_disk") == 40 and table.total("episode_file_count") == 4
+    assert table.count_nonzero("monitored") == 1
+
+
+def test_snapshot_file_round_trip():
+    index = {
+        42: {"tvdbId": 42, "title": "Bluey", "statistics": {"sizeOnDisk": 5}},
+        7: {"tvdbId": 7, "title": "Andor"},
+        1000: {"tvdbId": 1000},
+    }
+    save_snapshot("sonarr-a", 1234.5, _table(index))
+    disk = load_snapshot("sonarr-a")
+    assert isinstance(disk, DiskLibrary)
+    assert disk.fetched_at == 1234.5
+    assert len(disk) == 3 and list(disk) == [7, 42, 1000]
+    assert disk[42] == index[42]
+    assert 7 in disk and 8 not in disk and "7" not in disk
+    assert dict(disk) == index
+    assert disk.columns == _table(index).columns
+
+
+def test_missing_or_corrupt_snapshot_reads_as_none():
+    assert load_snapshot("sonarr-a") is None
+    path = snapshot_path("sonarr-a")
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"not a snapshot at all")
+    assert load_snapshot("sonarr-a") is None
+
+
+def test_cold_process_serves_saved_snapshot_then_revalidates(monkeypatch):
+    calls = _counting_library(monkeypatch, [], history={7: {"tvdbId": 1, "id": 7, "monitored": True}})
+    save_snapshot("sonarr-a", time.time() - 300, _table({1: {"tvdbId": 1, "id": 7}}))
+
+    async def _run():
+        served = await library_index(_client())
+        assert calls["deltas"] == 0  # answered from disk, nothing asked of the instance yet
+        await settle_background()
+        return served
+
+    assert asyncio.run(_run())[1] == {"tvdbId": 1, "id": 7}
+    assert calls["n"] == 0 and calls["fetched"] == [7]
+    assert cached_snapshot("sonarr-a").index[1]["monitored"] is True
+    assert load_snapshot("sonarr-a")[1]["monitored"] is True  # the revalidated copy was saved
+
+
+def test_delta_sync_patches_changed_titles_and_drops_deleted_ones(monkeypatch):
+    history = {7: {"tvdbId": 1, "id": 7, "statistics": {"sizeOnDisk": 9}}, 8: None, 9: {"tvdbId": 3, "id": 9}}
+    calls = _counting_library(monkeypatch, [{"tvdbId": 1, "id": 7}, {"tvdbId": 2, "id": 8}], history)
+    client = _client()
+    asyncio.run(library_index(client))
+    cached_snapshot(client.name).expires_at = 0.0
+    index = asyncio.run(library_index(client))
+    assert calls["n"] == 1 and sorted(calls["fetched"]) == [7, 8, 9]
+    assert list(index) == [1, 3]  # 2 deleted, 3 added since the dump
+    assert index.total("size_on_disk") == 9
+
+
+def test_delta_refetches_queue_for_the_connection_pool(monkeypatch):
+    _counting_library(monkeypatch, [{"tvdbId": 1, "id": 7}], {n: {"tvdbId": n, "id": n} for n in range(100, 150)})
+    in_flight = {"now": 0, "max": 0}
+
+    async def record_by_id(self, series_id):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.001)
+        in_flight["now"] -= 1
+        return {"tvdbId": series_id, "id": series_id}
+
+    monkeypatch.setattr(SonarrClient, "record_by_id", record_by_id)
+    client = SonarrClient(ArrInstance(name="sonarr-a", base_url="http://a", api_key="k", pool_size=4))
+    asyncio.run(library_index(client))
+    cached_snapshot(client.name).expires_at = 0.0
+    index = asyncio.run(library_index(client))
+    assert len(index) == 51
+    assert in_flight["max"] == 4  # never more than the pool holds, so none waits out a PoolTimeout
+
+
+def test_an_empty_delta_leaves_the_saved_snapshot_alone(monkeypatch):
+    _counting_library(monkeypatch, [{"tvdbId": 1, "id": 7}])
+    saves: list[str] = []
+    monkeypatch.setattr(library, "save_snapshot", lambda name, *args: saves.append(name))
+    client = _client()
+
+    async def _run():
+        await library_index(client)
+        await settle_background()
+        snapshot = cached_snapshot(client.name)
+        snapshot.expires_at = 0.0
+        index = snapshot.index
+        assert await refresh_library(client) is index  # nothing changed: same table
+        await settle_background()
+        return snapshot
+
+    snapshot = asyncio.run(_run())
+    assert saves == ["sonarr-a"]  # the first dump only; no re-encode for an empty delta
+    assert snapshot.fresh and snapshot.age < 5
+
+
+def test_full_resync_runs_on_its_own_cadence(monkeypatch):
+    calls = _counting_library(monkeypatch, [{"tvdbId": 1, "id": 7}])
+    client = _client()
+    asyncio.run(library_index(client))
+    snapshot = cached_snapshot(client.name)
+    snapshot.expires_at = 0.0
+    snapshot.full_at -= client.instance.full_resync_seconds
+    asyncio.run(library_index(client))
+    assert calls["n"] == 2 and calls["deltas"] == 0
+
+
+def test_snapshot_with_other_columns_is_not_served(monkeypatch):
+    calls = _counting_library(monkeypatch, [{"tvdbId": 1, "id": 8}])
+    old = {name: read for name, read in LIBRARY_COLUMNS.items() if name != "arr_id"}
+    save_snapshot("sonarr-a", time.time(), LibraryTable.from_records([{"tvdbId": 1, "id": 7}], "tvdbId", old))
+    assert asyncio.run(library_index(_client()))[1]["id"] == 8
+    assert calls["n"] == 1
+
+
+def test_invalidation_discards_the_saved_snapshot(monkeypatch):
+    calls = _counting_library(monkeypatch, [{"tvdbId": 1, "id": 8}])
+    save_snapshot("sonarr-a", time.time(), _table({1: {"tvdbId": 1, "id": 7}}))
+    invalidate_library_cache("sonarr-a")
+    assert asyncio.run(library_index(_client()))[1]["id"] == 8
+    assert calls["n"] == 1
+
+
+@pytest.mark.parametrize("from_disk", [False, True])
+def test_with_record_patches_a_copy(from_disk):
+    table = _table(
+        {
+            7: {"tvdbId": 7, "statistics": {"sizeOnDisk": 10}},
+            42: {"tvdbId": 42, "statistics": {"sizeOnDisk": 30}},
+        }
+    )
+    if from_disk:
+        save_snapshot("sonarr-a", 0.0, table)
+        table = load_snapshot("sonarr-a")
+
+    replaced = table.with_record(42, {"tvdbId": 42, "statistics": {"sizeOnDisk": 5}}, LIBRARY_COLUMNS)
+    added = replaced.with_record(9, {"tvdbId": 9, "statistics": {"sizeOnDisk": 1}}, LIBRARY_COLUMNS)
+    removed = added.with_record(7, None, LIBRARY_COLUMNS)
+
+    assert table.total("size_on_disk") == 40 and table[42]["statistics"]["sizeOnDisk"] == 30  # untouched
+    assert replaced.total("size_on_disk") == 15
+    assert list(added) == [7, 9, 42] and added[9]["tvdbId"] == 9 and added.total("size_on_disk") == 16
+    assert list(removed) == [9, 42] and 7 not in removed and removed.total("size_on_disk") == 6
+    assert removed[42]["statistics"]["sizeOnDisk"] == 5
+
+
+def test_history_and_record_by_id_requests():
+    seen: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(str(request.url))
+        if request.url.path == "/api/v3/history/since":
+            return httpx.Response(200, json=[{"seriesId": 7, "eventType": "grabbed"}, {"seriesId": 7}, {"id": 1}])
+        if request.url.path == "/api/v3/series/7":
+            return httpx.Response(200, json={"id": 7, "tvdbId": 1, "path": "/tv/x", "monitored": True})
+        return httpx.Response(404)
+
+    client = _client()
+    client._client = lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://a")
+
+    async def _run():
+        return await client.changed_since(0.0), await client.record_by_id(7), await client.record_by_id(8)
+
+    assert asyncio.run(_run()) == ({7}, {"id": 7, "tvdbId": 1, "monitored": True}, None)
+    assert seen[0] == "http://a/api/v3/history/since?date=1970-01-01T00%3A00%3A00Z"
@@ -0,0 +1,121 @@
+"""Process-wide lookup cache: LRU + TTL, shared across instances
+(engine/media/clients/lookup_cache)."""
+
+import asyncio
+
+import httpx
+
+from engine.media import aggregation
+from engine.media.aggregation import search_everywhere
+from engine.media.clients import SonarrClient
+from engine.media.clients.lookup_cache import LookupCache, lookup_cache
+from engine.media.config import ArrInstance, MediaConfig
+from engine.media.library import invalidate_library_cache
+from engine.media.models import MediaType, PresenceState
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_terms_are_normalized_and_counted():
+    cache = LookupCache()
+    cache.put("tv", "  Severance ", "sonarr-a", [{"title": "Severance"}])
+    assert cache.get("tv", "severance").items == [{"title": "Severance"}]
+    assert cache.get("movie", "severance") is None  # media types never share
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1, "evictions": 0}
+
+
+def test_entries_expire_and_least_recent_is_evicted():
+    clock = FakeClock()
+    cache = LookupCache(max_entries=2, ttl=60.0, clock=clock)
+    cache.put("tv", "a", "sonarr-a", [])
+    cache.put("tv", "b", "sonarr-a", [])
+    cache.get("tv", "a")  # now b is the least recently used
+    cache.put("tv", "c", "sonarr-a", [])
+    assert cache.get("tv", "b") is None and cache.evictions == 1
+    clock.now = 61.0
+    assert cache.get("tv", "a") is None and cache.get("tv", "c") is None
+
+
+def test_searches_share_one_lookup_across_instances_and_repeats(monkeypatch):
+    invalidate_library_cache()
+    monkeypatch.setattr(aggregation, "_lookup_ms", {})
+    item = {"title": "Severance", "year": 2022, "tvdbId": 371980, "id": 42}
+    record = {"tvdbId": 371980, "id": 42, "statistics": {"episodeCount": 19, "episodeFileCount": 19}}
+    calls: list[str] = []
+
+    async def lookup(self, term):
+        calls.append(self.name)
+        await asyncio.sleep(0)
+        return [item]
+
+    async def get_library(self):
+        return [record] if self.name == "sonarr-a" else []
+
+    monkeypatch.setattr(SonarrClient, "lookup", lookup)
+    monkeypatch.setattr(SonarrClient, "get_library", get_library)
+    config = MediaConfig(
+        sonarr=[
+            ArrInstance(name="sonarr-a", base_url="http://a", api_key="k"),
+            ArrInstance(name="sonarr-b", base_url="http://b", api_key="k"),
+        ]
+    )
+
+    async def _run():
+        first = await search_everywhere("severance", MediaType.TV, config)
+        again = await search_everywhere("Severance ", MediaType.TV, config, lookup_once=True)
+        return first, again
+
+    first, again = asyncio.run(_run())
+    assert len(calls) == 1  # both instances waited on one lookup; the retype was a hit
+    for merged in (first, again):
+        assert merged[0].status_for("sonarr-a").state == PresenceState.MONITORED_COMPLETE
+        assert merged[0].status_for("sonarr-b").state == PresenceState.NOT_PRESENT
+    stats = lookup_cache().stats()
+    assert stats["misses"] == 2 and stats["hits"] == 1  # a waiter on the in-flight miss counts as a miss
+
+
+def test_another_instances_items_lose_their_library_id(monkeypatch):
+    lookup_cache().put("tv", "severance", "sonarr-a", [{"title": "Severance", "id": 42}])
+    client_b = SonarrClient(ArrInstance(name="sonarr-b", base_url="http://b", api_key="k"))
+    client_a = SonarrClient(ArrInstance(name="sonarr-a", base_url="http://a", api_key="k"))
+    assert asyncio.run(aggregation._timed_lookup(client_b, "severance")) == [{"title": "Severance"}]
+    assert asyncio.run(aggregation._timed_lookup(client_a, "severance")) == [{"title": "Severance", "id": 42}]
+
+
+def test_a_dead_instances_failed_lookup_is_not_shared(monkeypatch):
+    invalidate_library_cache()
+    monkeypatch.setattr(aggregation, "_lookup_ms", {})
+    calls: list[str] = []
+
+    async def lookup(self, term):
+        calls.append(self.name)
+        await asyncio.sleep(0)
+        if self.name == "sonarr-a":
+            raise httpx.ConnectError("down")
+        return [{"title": "Severance", "year": 2022, "tvdbId": 371980}]
+
+    async def get_library(self):
+        if self.name == "sonarr-a":
+            raise httpx.ConnectError("down")
+        return []
+
+    monkeypatch.setattr(SonarrClient, "lookup", lookup)
+    monkeypatch.setattr(SonarrClient, "get_library", get_library)
+    config = MediaConfig(
+        sonarr=[
+            ArrInstance(name="sonarr-a", base_url="http://a", api_key="k"),
+            ArrInstance(name="sonarr-b", base_url="http://b", api_key="k"),
+        ]
+    )
+
+    [merged] = asyncio.run(search_everywhere("severance", MediaType.TV, config))
+    assert merged.status_for("sonarr-a").state == PresenceState.UNREACHABLE
+    assert merged.status_for("sonarr-b").state == PresenceState.NOT_PRESENT
+    assert calls == ["sonarr-a", "sonarr-b"]  # sonarr-b asked for itself after sonarr-a's lookup failed
+    assert lookup_cache().get("tv", "severance").instance == "sonarr-b"
@@ -3,13 +3,40 @@ import asyncio
 import httpx
 import pytest
 
-from engine.media.aggregation import merge_lookups
-from engine.media.clients import RadarrClient, SonarrClient
+from engine.media import aggregation
+from engine.media.aggregation import (
+    add_to_instance,
+    enrich_tv_statuses,
+    merge_lookups,
+    refresh_status,
+    search_everywhere,
+    search_progressively,
+)
+from engine.media.clients import RadarrClient, SonarrClient, arr_base, close_http_clients
+from engine.media.clients import breaker as breaker_module
+from engine.media.clients import latency as latency_module
+from engine.media.clients.lookup_cache import lookup_cache
 from engine.media.config import ArrInstance, MediaConfig, load_media_config
-from engine.media.models import MediaType, PresenceState
+from engine.media.library import cached_snapshot, invalidate_library_cache
+from engine.media.models import (
+    AggregatedResult,
+    InstanceStatus,
+    MediaSearchResult,
+    MediaType,
+    PresenceState,
+    to_json,
+)
 from engine.models import Machine, Service
 
 
+@pytest.fixture(autouse=True)
+def _fresh_server_state(monkeypatch):
+    """Breakers and latency history are process-wide; one test's failures must
+    not open another's circuit or skew its timeouts."""
+    monkeypatch.setattr(breaker_module, "_breakers", {})
+    monkeypatch.setattr(latency_module, "_trackers", {})
+
+
 def _machine_with_services() -> Machine:
     return Machine(
         id="behemoth",
@@ -17,7 +44,13 @@ def _machine_with_services() -> Machine:
         hostname="192.168.86.31",
         user="root",
         services=[
-            Service(type="sonarr", name="sonarr-behemoth", port=8989, api_key_env="TEST_SONARR_KEY"),
+            Service(
+                type="sonarr",
+                name="sonarr-behemoth",
+                port=8989,
+                api_key_env="TEST_SONARR_KEY",
+                timeouts={"lookup": 45.0},
+            ),
             Service(type="radarr", name="radarr-behemoth", port=7878, api_key_env="TEST_RADARR_KEY"),
             Service(type="plex", name="plex-behemoth", port=32400, api_key_env="TEST_PLEX_TOKEN"),
         ],
@@ -34,6 +67,7 @@ def test_load_media_config_from_services(monkeypatch):
     assert [i.name for i in config.sonarr] == ["sonarr-behemoth"]
     assert config.sonarr[0].base_url == "http://192.168.86.31:8989"
     assert config.sonarr[0].api_key == "abc"
+    assert config.sonarr[0].timeouts == {"lookup": 45.0}
     assert [i.name for i in config.radarr] == ["radarr-behemoth"]
     assert [s.name for s in config.plex] == ["plex-behemoth"]
     assert config.plex[0].token == "ghi"
@@ -124,8 +158,8 @@ def test_merge_lookups_unreachable_error_never_empty():
 
 
 def _mock_arr_client(client: SonarrClient, handler) -> None:
-    """Route the client's HTTP through a MockTransport, preserving the timeout kwarg."""
-    client._client = lambda timeout=None: httpx.AsyncClient(  # type: ignore[method-assign]
+    """Route the client's HTTP through a MockTransport instead of the shared pool."""
+    client._client = lambda: httpx.AsyncClient(  # type: ignore[method-assign]
         transport=httpx.MockTransport(handler), base_url=client.instance.base_url
     )
 
@@ -161,6 +195,44 @@ def test_arr_ping_does_not_retry():
     assert calls["n"] == 1
 
 
+def test_concurrent_identical_gets_share_one_request():
+    """Tabs searching together must not download the same library dump twice."""
+    client = SonarrClient(ArrInstance(name="sonarr-a", base_url="http://a", api_key="k"))
+    calls = {"n": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls["n"] += 1
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=[{"title": "x"}])
+
+    _mock_arr_client(client, handler)
+
+    async def _run():
+        return await asyncio.gather(client.get_library(), client.get_library(), client.lookup("x"))
+
+    first, second, lookup = asyncio.run(_run())
+    assert first == second == lookup == [{"title": "x"}]
+    assert calls["n"] == 2  # one library dump, one lookup
+
+
+def test_arr_clients_share_one_pool_per_instance():
+    """Every client built for an instance reuses the same keep-alive pool within a loop."""
+    instance = ArrInstance(name="sonarr-a", base_url="http://a", api_key="k", pool_size=3)
+
+    async def _run():
+        first, second = SonarrClient(instance)._client(), SonarrClient(instance)._client()
+        other = SonarrClient(ArrInstance(name="sonarr-b", base_url="http://b", api_key="k"))._client()
+        assert first is second
+        assert other is not first
+        assert first._transport._pool._max_connections == 3
+        await close_http_clients()
+        assert first.is_closed and other.is_closed
+        return first
+
+    # a new loop (the next CLI command) gets a fresh client, not the closed one
+    assert asyncio.run(_run()) is not asyncio.run(_run())
+
+
 def test_merge_movie_status_comes_from_library_not_lookup():
     """Radarr lookup leaves hasFile empty even for downloaded movies — the
     library record must win, or every downloaded movie renders as partial."""
@@ -227,11 +299,13 @@ def test_sonarr_status_extracts_seasons():
             ],
         }
     )
-    assert len(status.seasons) == 3
-    s1 = next(s for s in status.seasons if s.season_number == 1)
+    assert status.seasons == []  # built only when asked for
+    seasons = status.season_details()
+    assert len(seasons) == 3 and status.seasons is seasons
+    s1 = next(s for s in seasons if s.season_number == 1)
     assert s1.monitored and s1.episode_file_count == 10 and s1.episode_count == 10
     assert s1.size_on_disk == 24_000_000_000
-    s2 = next(s for s in status.seasons if s.season_number == 2)
+    s2 = next(s for s in seasons if s.season_number == 2)
     assert not s2.monitored and s2.episode_file_count == 0
     # unmonitored seasons report 0 monitored eps but keep the real total
     assert s2.total_episode_count == 22
@@ -282,3 +356,511 @@ def test_radarr_status_size_on_disk():
     assert status.size_on_disk == 9_000_000_000
     # not downloaded -> no size rather than a misleading 0-byte label
     assert client.to_status({"id": 7, "hasFile": False, "sizeOnDisk": 0}).size_on_disk is None
+
+
+def _fake_sonarr(monkeypatch, libraries: dict[str, list[dict]], lookups: dict[str, list[dict] | Exception]):
+    """Serve lookup/library per instance name from memory; returns the lookup call log."""
+    invalidate_library_cache()
+    monkeypatch.setattr(aggregation, "_lookup_ms", {})
+    calls: list[str] = []
+
+    async def lookup(self, term):
+        calls.append(self.name)
+        answer = lookups[self.name]
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    async def get_library(self):
+        return libraries[self.name]
+
+    async def get_series(self, series_id):
+        return next(r for r in libraries[self.name] if r.get("id") == series_id)
+
+    monkeypatch.setattr(SonarrClient, "lookup", lookup)
+    monkeypatch.setattr(SonarrClient, "get_library", get_library)
+    monkeypatch.setattr(SonarrClient, "get_series", get_series)
+    return calls
+
+
+def test_lookup_once_queries_one_instance_and_keeps_every_status(monkeypatch):
+    item = {"title": "Severance", "year": 2022, "tvdbId": 371980}
+    record = {"tvdbId": 371980, "id": 42, "statistics": {"episodeCount": 19, "episodeFileCount": 19}}
+    calls = _fake_sonarr(
+        monkeypatch,
+        libraries={"sonarr-a": [], "sonarr-b": [record]},
+        lookups={"sonarr-a": [item], "sonarr-b": [item]},
+    )
+
+    merged = asyncio.run(search_everywhere("severance", MediaType.TV, _tv_config(), lookup_once=True))
+    assert calls == ["sonarr-a"]
+    assert len(merged) == 1
+    assert merged[0].status_for("sonarr-a").state == PresenceState.NOT_PRESENT
+    assert merged[0].status_for("sonarr-b").state == PresenceState.MONITORED_COMPLETE
+
+
+def test_lookup_once_fails_over_and_prefers_the_answering_instance(monkeypatch):
+    item = {"title": "Severance", "year": 2022, "tvdbId": 371980}
+    calls = _fake_sonarr(
+        monkeypatch,
+        libraries={"sonarr-a": [], "sonarr-b": []},
+        lookups={"sonarr-a": httpx.ConnectError("down"), "sonarr-b": [item]},
+    )
+
+    merged = asyncio.run(search_everywhere("severance", MediaType.TV, _tv_config(), lookup_once=True))
+    assert calls == ["sonarr-a", "sonarr-b"]
+    assert [s.state for s in merged[0].statuses] == [PresenceState.NOT_PRESENT] * 2
+
+    # the failed instance drops to the back of the line for the next search
+    calls.clear()
+    lookup_cache().clear()  # or the answer comes from the cache and nobody is asked
+    asyncio.run(search_everywhere("severance", MediaType.TV, _tv_config(), lookup_once=True))
+    assert calls == ["sonarr-b"]
+
+
+def test_lookup_once_survives_the_answering_instances_library_failing(monkeypatch):
+    item = {"title": "Severance", "year": 2022, "tvdbId": 371980, "id": 9}  # sonarr-a's own series id
+    record = {"tvdbId": 371980, "id": 42, "statistics": {"episodeCount": 19, "episodeFileCount": 19}}
+    calls = _fake_sonarr(monkeypatch, libraries={"sonarr-b": [record]}, lookups={"sonarr-a": [item]})
+
+    async def get_library(self):
+        if self.name == "sonarr-a":
+            raise httpx.ReadTimeout("library endpoint stuck")
+        return [record]
+
+    monkeypatch.setattr(SonarrClient, "get_library", get_library)
+    merged = asyncio.run(search_everywhere("severance", MediaType.TV, _tv_config(), lookup_once=True))
+    assert calls == ["sonarr-a"]
+    [severance] = merged  # the lookup still counts though its instance's library failed
+    assert severance.status_for("sonarr-a").state == PresenceState.UNREACHABLE
+    assert severance.status_for("sonarr-b").state == PresenceState.MONITORED_COMPLETE
+    assert severance.lookup_item is item
+
+
+def test_id_queries_are_answered_from_the_libraries(monkeypatch):
+    record = {
+        "tvdbId": 371980,
+        "imdbId": "tt11280740",
+        "id": 42,
+        "title": "Severance",
+        "statistics": {"episodeCount": 19, "episodeFileCount": 19},
+    }
+    item = {"title": "Andor", "year": 2022, "tvdbId": 393189}
+    calls = _fake_sonarr(
+        monkeypatch,
+        libraries={"sonarr-a": [], "sonarr-b": [record]},
+        lookups={"sonarr-a": [item], "sonarr-b": [item]},
+    )
+    details: list[tuple[str, int]] = []
+
+    async def get_series(self, series_id):
+        details.append((self.name, series_id))
+        poster = {"coverType": "poster", "remoteUrl": "https://img/severance.jpg"}
+        return {**record, "overview": "Work-life balance, surgically.", "images": [poster]}
+
+    monkeypatch.setattr(SonarrClient, "get_series", get_series)
+
+    for query in ("tvdb:371980", " IMDB:tt11280740 "):
+        [merged] = asyncio.run(search_everywhere(query, MediaType.TV, _tv_config()))
+        assert merged.result.title == "Severance" and merged.result.tvdb_id == 371980
+        assert merged.result.poster_url == "https://img/severance.jpg"  # rendered like a lookup hit
+        assert merged.result.overview.startswith("Work-life")
+        assert [s.state for s in merged.statuses] == [PresenceState.NOT_PRESENT, PresenceState.MONITORED_COMPLETE]
+    assert calls == [] and details == [("sonarr-b", 42)] * 2
+
+    # in no library: one lookup, not one per instance
+    [merged] = asyncio.run(search_everywhere("tvdb:393189", MediaType.TV, _tv_config()))
+    assert merged.result.title == "Andor" and len(calls) == 1
+    asyncio.run(search_everywhere("imdb:tt0000001", MediaType.TV, _tv_config()))  # in no library either
+    assert len(calls) == 2
+
+
+def test_enrich_serves_fresh_library_record_without_a_request(monkeypatch):
+    item = {"title": "Severance", "year": 2022, "tvdbId": 371980}
+    record = {
+        "tvdbId": 371980,
+        "id": 42,
+        "statistics": {"episodeCount": 19, "episodeFileCount": 19},
+        "seasons": [{"seasonNumber": 1, "monitored": True, "statistics": {"episodeCount": 9}}],
+    }
+    _fake_sonarr(monkeypatch, libraries={"sonarr-a": [record], "sonarr-b": []}, lookups={"sonarr-a": [item]})
+    fetched: list[int] = []
+
+    async def get_series(self, series_id):
+        fetched.append(series_id)
+        return {**record, "seasons": []}
+
+    monkeypatch.setattr(SonarrClient, "get_series", get_series)
+    config = _tv_config()
+
+    async def _enrich():
+        [aggregated] = await search_everywhere("severance", MediaType.TV, config, lookup_once=True)
+        status = aggregated.status_for("sonarr-a")
+        status.seasons, status.season_source = [], None  # as a lookup-derived status would have it
+        return await enrich_tv_statuses(aggregated, config)
+
+    enriched = asyncio.run(_enrich())
+    assert fetched == []
+    assert [s.episode_count for s in enriched.status_for("sonarr-a").season_details()] == [9]
+
+    # an expired snapshot is not trusted for detail — the series record is fetched
+    cached_snapshot("sonarr-a").expires_at = 0.0
+    asyncio.run(enrich_tv_statuses(enriched, config))
+    assert fetched == [42]
+
+
+@pytest.mark.parametrize("lookup_once", [False, True])
+def test_progressive_search_yields_before_the_slow_instance_answers(monkeypatch, lookup_once):
+    item = {"title": "Severance", "year": 2022, "tvdbId": 371980}
+    record = {"tvdbId": 371980, "id": 42, "statistics": {"episodeCount": 19, "episodeFileCount": 19}}
+    _fake_sonarr(monkeypatch, libraries={"sonarr-a": [], "sonarr-b": [record]}, lookups={"sonarr-a": [item]})
+    release = asyncio.Event()
+
+    async def lookup(self, term):
+        if self.name == "sonarr-b":
+            await release.wait()
+        return [item]
+
+    async def get_library(self):
+        if self.name == "sonarr-b":
+            await release.wait()
+            return [record]
+        return []
+
+    monkeypatch.setattr(SonarrClient, "lookup", lookup)
+    monkeypatch.setattr(SonarrClient, "get_library", get_library)
+
+    async def _collect():
+        updates = []
+        async for results in search_progressively("severance", MediaType.TV, _tv_config(), lookup_once):
+            updates.append([(s.instance, s.state) for s in results[0].statuses])
+            if results[0].status_for("sonarr-a").state != PresenceState.PENDING:
+                release.set()  # the slow instance answers only once the fast one is on screen
+        return updates
+
+    updates = asyncio.run(_collect())
+    assert [("sonarr-a", PresenceState.NOT_PRESENT), ("sonarr-b", PresenceState.PENDING)] in updates
+    assert updates[-1] == [("sonarr-a", PresenceState.NOT_PRESENT), ("sonarr-b", PresenceState.MONITORED_COMPLETE)]
+
+
+def test_deadline_search_returns_pending_then_backfills_in_place(monkeypatch):
+    item = {"title": "Severance", "year": 2022, "tvdbId": 371980}
+    record = {"tvdbId": 371980, "id": 42, "statistics": {"episodeCount": 19, "episodeFileCount": 19}}
+    _fake_sonarr(monkeypatch, libraries={"sonarr-a": []}, lookups={"sonarr-a": [item]})
+    release = asyncio.Event()
+
+    async def get_library(self):
+        if self.name == "sonarr-b":
+            await release.wait()  # thrashing its disk
+            return [record]
+        return []
+
+    monkeypatch.setattr(SonarrClient, "get_library", get_library)
+    backfilled: list[list] = []
+
+    async def _run():
+        results = await search_everywhere(
+            "severance", MediaType.TV, _tv_config(), lookup_once=True, deadline=0.05, on_backfill=backfilled.append
+        )
+        assert results[0].status_for("sonarr-b").state == PresenceState.PENDING
+        release.set()
+        await asyncio.gather(*aggregation._backfills)
+        return results
+
+    results = asyncio.run(_run())
+    assert results[0].status_for("sonarr-b").state == PresenceState.MONITORED_COMPLETE  # patched in place
+    assert backfilled and backfilled[-1] is results
+    assert results.settled
+
+
+def test_deadline_before_the_lookup_lands_leaves_the_search_running(monkeypatch):
+    item = {"title": "Severance", "year": 2022, "tvdbId": 371980}
+    _fake_sonarr(monkeypatch, libraries={"sonarr-a": [], "sonarr-b": []}, lookups={})
+
+    async def lookup(self, term):
+        await asyncio.sleep(0.2)  # metadata provider on a bad day
+        return [item]
+
+    monkeypatch.setattr(SonarrClient, "lookup", lookup)
+    backfilled: list[list] = []
+
+    async def _run():
+        first = await search_everywhere(
+            "sev", MediaType.TV, _tv_config(), lookup_once=True, deadline=0.05, on_backfill=backfilled.append
+        )
+        assert first == [] and not first.settled  # nothing yet, but not "no results"
+        first.cancel()  # superseded by the next keystroke
+        second = await search_everywhere(
+            "severance", MediaType.TV, _tv_config(), lookup_once=True, deadline=0.05, on_backfill=backfilled.append
+        )
+        assert second == [] and not second.settled
+        await asyncio.gather(*aggregation._backfills, return_exceptions=True)
+        return first, second
+
+    first, second = asyncio.run(_run())
+    assert first.settled and first == []  # cancelled: never filled in
+    assert [r.result.title for r in second] == ["Severance"]
+    assert backfilled == [second]
+
+
+def test_refresh_status_fetches_one_record_and_patches_the_snapshot(monkeypatch):
+    item = {"title": "Severance", "year": 2022, "tvdbId": 371980}
+    other = {"tvdbId": 1, "id": 1, "statistics": {"episodeCount": 1, "episodeFileCount": 1}}
+    _fake_sonarr(monkeypatch, libraries={"sonarr-a": [other], "sonarr-b": [other]}, lookups={"sonarr-a": [item]})
+    dumps: list[str] = []
+    fetched: list[tuple[str, int]] = []
+
+    async def get_library(self):
+        dumps.append(self.name)
+        return [other]
+
+    async def library_record(self, tvdb_id):
+        fetched.append((self.name, tvdb_id))
+        if self.name == "sonarr-b":
+            return {"tvdbId": tvdb_id, "id": 42, "statistics": {"episodeCount": 19, "episodeFileCount": 19}}
+        return None
+
+    monkeypatch.setattr(SonarrClient, "get_library", get_library)
+    monkeypatch.setattr(SonarrClient, "library_record", library_record)
+    config = _tv_config()
+
+    async def _run():
+        [aggregated] = await search_everywhere("severance", MediaType.TV, config, lookup_once=True)
+        refreshed = await refresh_status(aggregated, config, include_plex=False)
+        again = await search_everywhere("severance", MediaType.TV, config, lookup_once=True)
+        return refreshed, again
+
+    refreshed, [again] = asyncio.run(_run())
+    assert sorted(fetched) == [("sonarr-a", 371980), ("sonarr-b", 371980)]
+    assert refreshed.status_for("sonarr-b").state == PresenceState.MONITORED_COMPLETE
+    assert again.status_for("sonarr-b").state == PresenceState.MONITORED_COMPLETE  # from the patched snapshot
+    assert sorted(dumps) == ["sonarr-a", "sonarr-b"]  # no library refetched after the refresh
+    assert 1 in cached_snapshot("sonarr-b").index  # the rest of the library survived
+
+
+def _fake_adds(monkeypatch) -> tuple[list[str], list[dict]]:
+    """Serve add defaults and take posts in memory; returns the instances whose
+    settings were fetched and the posted payloads."""
+    monkeypatch.setattr(arr_base, "_add_defaults", {})
+    settings_fetched: list[str] = []
+    posted: list[dict] = []
+
+    async def quality_profiles(self):
+        settings_fetched.append(self.name)
+        return [{"id": 1, "name": "HD-1080p"}]
+
+    async def root_folders(self):
+        return [{"path": "/tv"}]
+
+    async def lookup_by_tvdb(self, tvdb_id):
+        raise AssertionError("the search hit should be reused")
+
+    async def add_series(self, item, profile_id, root_folder):
+        posted.append({**item, "qualityProfileId": profile_id, "rootFolderPath": root_folder})
+        await asyncio.sleep(0)
+        return {**item, "id": 100 + len(posted)}
+
+    for name, fake in [
+        ("quality_profiles", quality_profiles),
+        ("root_folders", root_folders),
+        ("lookup_by_tvdb", lookup_by_tvdb),
+        ("add_series", add_series),
+    ]:
+        monkeypatch.setattr(SonarrClient, name, fake)
+    return settings_fetched, posted
+
+
+def test_add_posts_the_search_hit_with_cached_defaults(monkeypatch):
+    severance = {"title": "Severance", "tvdbId": 371980, "id": 7, "path": "/tv/Severance", "qualityProfileId": 9}
+    andor = {"title": "Andor", "tvdbId": 393189}
+    _fake_sonarr(
+        monkeypatch,
+        libraries={"sonarr-a": [{"tvdbId": 371980, "id": 7}], "sonarr-b": []},
+        lookups={"sonarr-a": [severance, andor], "sonarr-b": [severance, andor]},
+    )
+    settings_fetched, posted = _fake_adds(monkeypatch)
+    config = _tv_config()
+
+    async def _run():
+        hits = await search_everywhere("s", MediaType.TV, config, lookup_once=True)
+        return [await add_to_instance(hit, instance, config) for hit in hits for instance in ("sonarr-a", "sonarr-b")]
+
+    results = asyncio.run(_run())
+    assert [r.ok for r in results] == [False, True, True, True]
+    assert results[0].message == "Already present on this instance"  # from sonarr-a's library, no lookup
+    assert posted == [
+        {"title": "Severance", "tvdbId": 371980, "qualityProfileId": 1, "rootFolderPath": "/tv"},
+        {"title": "Andor", "tvdbId": 393189, "qualityProfileId": 1, "rootFolderPath": "/tv"},
+        {"title": "Andor", "tvdbId": 393189, "qualityProfileId": 1, "rootFolderPath": "/tv"},
+    ]
+    assert sorted(settings_fetched) == ["sonarr-a", "sonarr-b"]  # once per instance, not once per add
+    assert 371980 in cached_snapshot("sonarr-b").index
+
+
+def test_add_does_not_carry_another_instances_season_choices(monkeypatch):
+    severance = {
+        "title": "Severance",
+        "tvdbId": 371980,
+        "id": 7,  # sonarr-a has it, with season 1 unmonitored
+        "seasons": [
+            {"seasonNumber": 0, "monitored": True, "statistics": {"episodeCount": 2}},
+            {"seasonNumber": 1, "monitored": False, "statistics": {"episodeCount": 9, "sizeOnDisk": 10}},
+        ],
+    }
+    _fake_sonarr(
+        monkeypatch,
+        libraries={"sonarr-a": [{"tvdbId": 371980, "id": 7}], "sonarr-b": []},
+        lookups={"sonarr-a": [severance]},
+    )
+    _, posted = _fake_adds(monkeypatch)
+    config = _tv_config()
+
+    async def _run():
+        [hit] = await search_everywhere("severance", MediaType.TV, config, lookup_once=True)
+        return await add_to_instance(hit, "sonarr-b", config)
+
+    assert asyncio.run(_run()).ok
+    [payload] = posted
+    assert payload["seasons"] == [{"seasonNumber": 0, "monitored": False}, {"seasonNumber": 1, "monitored": True}]
+
+
+def test_add_after_an_id_query_looks_the_title_up(monkeypatch):
+    record = {
+        "tvdbId": 371980,
+        "id": 7,
+        "title": "Severance",
+        "seasons": [{"seasonNumber": 1, "monitored": False, "statistics": {"episodeCount": 9}}],
+    }
+    full = {"title": "Severance", "tvdbId": 371980, "titleSlug": "severance", "images": [], "seasons": []}
+    _fake_sonarr(monkeypatch, libraries={"sonarr-a": [], "sonarr-b": [record]}, lookups={})
+    _, posted = _fake_adds(monkeypatch)
+    looked_up: list[int] = []
+
+    async def lookup_by_tvdb(self, tvdb_id):
+        looked_up.append(tvdb_id)
+        return [full]
+
+    monkeypatch.setattr(SonarrClient, "lookup_by_tvdb", lookup_by_tvdb)
+    config = _tv_config()
+
+    async def _run():
+        [hit] = await search_everywhere("tvdb:371980", MediaType.TV, config)
+        return hit, await add_to_instance(hit, "sonarr-a", config)
+
+    hit, added = asyncio.run(_run())
+    assert hit.lookup_item is None  # a library record is not something to post
+    assert added.ok and looked_up == [371980]
+    assert posted == [{**full, "qualityProfileId": 1, "rootFolderPath": "/tv"}]
+
+
+def test_add_many_resolves_each_title_once_and_reports_every_target(monkeypatch):
+    items = {
+        "severance": [{"title": "Severance", "tvdbId": 371980}],
+        "andor": [{"title": "Andor", "tvdbId": 393189}],
+        "nothing": [],
+        "tvdb:371980": [{"title": "Severance", "tvdbId": 371980}],
+    }
+    calls = _fake_sonarr(monkeypatch, libraries={"sonarr-a": [], "sonarr-b": []}, lookups={})
+
+    async def lookup(self, term):
+        calls.append(term)
+        return items[term]
+
+    monkeypatch.setattr(SonarrClient, "lookup", lookup)
+    settings_fetched, posted = _fake_adds(monkeypatch)
+    seen = []
+    queries = ["severance", "andor", "nothing", "tvdb:371980"]
+
+    results = asyncio.run(
+        aggregation.add_many(queries, ["sonarr-a", "sonarr-b"], MediaType.TV, _tv_config(), on_result=seen.append)
+    )
+    assert [(r.query, r.instance) for r in results] == [(q, i) for q in queries for i in ("sonarr-a", "sonarr-b")]
+    by_query = {q: [r for r in results if r.query == q] for q in queries}
+    assert all(r.ok for r in by_query["andor"])
+    assert [r.message for r in by_query["nothing"]] == ["No results"] * 2
+    # two lines naming one title: one adds it, the other is reported, not posted
+    same = [r for r in results if r.external_key == "tvdb:371980"]
+    assert len(same) == 4 and sum(r.ok for r in same) == 2
+    assert sorted(seen, key=id) == sorted(results, key=id)
+    assert len(posted) == 4 and sorted(settings_fetched) == ["sonarr-a", "sonarr-b"]
+
+
+def test_search_many_shares_libraries_and_caps_lookups_per_instance(monkeypatch):
+    calls = _fake_sonarr(monkeypatch, libraries={"sonarr-a": [], "sonarr-b": []}, lookups={})
+    monkeypatch.setattr(aggregation, "_lookup_slots", {})
+    aggregation.set_lookup_concurrency(2)
+    dumps: list[str] = []
+    running = {"sonarr-a": 0, "sonarr-b": 0}
+    peak = {"sonarr-a": 0, "sonarr-b": 0}
+
+    async def get_library(self):
+        dumps.append(self.name)
+        return []
+
+    async def lookup(self, term):
+        calls.append(self.name)
+        running[self.name] += 1
+        peak[self.name] = max(peak[self.name], running[self.name])
+        await asyncio.sleep(0.01)
+        running[self.name] -= 1
+        return [{"title": term, "tvdbId": int(term.removeprefix("title "))}]
+
+    monkeypatch.setattr(SonarrClient, "get_library", get_library)
+    monkeypatch.setattr(SonarrClient, "lookup", lookup)
+    queries = [f"title {n}" for n in range(1, 21)]
+
+    async def _run():
+        return [pair async for pair in aggregation.search_many(queries, MediaType.TV, _tv_config())]
+
+    try:
+        answered = asyncio.run(_run())
+    finally:
+        aggregation.set_lookup_concurrency(aggregation.MAX_LOOKUPS_PER_INSTANCE)
+    assert sorted(query for query, _ in answered) == sorted(queries)
+    assert all(results[0].result.title == query for query, results in answered)
+    assert sorted(dumps) == ["sonarr-a", "sonarr-b"]  # one library each for the whole batch
+    assert len(calls) == 20 and max(peak.values()) <= 2
+    assert min(calls.count("sonarr-a"), calls.count("sonarr-b")) > 0  # spread over both instances
+
+
+def test_results_serialize_at_the_edge_without_the_lookup_item():
+    status = InstanceStatus(instance="sonarr-a", state=PresenceState.NOT_PRESENT)
+    aggregated = AggregatedResult(
+        result=MediaSearchResult(media_type=MediaType.TV, title="Severance", tvdb_id=371980),
+        statuses=[status],
+        lookup_item={"title": "Severance", "path": "/tv/Severance"},
+    )
+    assert aggregated.status_for("sonarr-a") is status and aggregated.status_for("sonarr-b") is None
+    aggregated.statuses.append(InstanceStatus(instance="sonarr-b", state=PresenceState.PENDING))
+    assert aggregated.status_for("sonarr-b").state == PresenceState.PENDING
+    aggregated.statuses = [InstanceStatus(instance="sonarr-a", state=PresenceState.MONITORED_COMPLETE)]
+    assert aggregated.status_for("sonarr-a").state == PresenceState.MONITORED_COMPLETE
+
+    data = to_json(aggregated)
+    assert set(data) == {"result", "statuses", "plex"}
+    assert data["result"]["media_type"] == "tv" and data["statuses"][0]["state"] == "monitored_complete"
+
+
+def test_merge_builds_only_the_limited_titles_and_seasons_on_demand(monkeypatch):
+    built: list[str] = []
+    to_search_result = SonarrClient.to_search_result
+
+    def counting(item):
+        built.append(item["title"])
+        return to_search_result(item)
+
+    monkeypatch.setattr(SonarrClient, "to_search_result", staticmethod(counting))
+    items = [{"title": f"The {n}", "tvdbId": n} for n in range(1, 51)]
+    seasons = [{"seasonNumber": 1, "monitored": True, "statistics": {"episodeCount": 8, "episodeFileCount": 8}}]
+    library = {3: {"tvdbId": 3, "id": 30, "statistics": {"episodeCount": 8, "episodeFileCount": 8}, "seasons": seasons}}
+    merged = merge_lookups(
+        {"sonarr-a": {"results": items, "library": library}, "sonarr-b": {"results": items[::-1], "library": {}}},
+        MediaType.TV,
+        _tv_config(),
+        limit=5,
+    )
+    assert [r.result.tvdb_id for r in merged] == [1, 2, 3, 4, 5] and len(built) == 5
+    assert all(len(r.statuses) == 2 for r in merged)
+    status = merged[2].status_for("sonarr-a")
+    assert status.state == PresenceState.MONITORED_COMPLETE and status.seasons == []
+    assert to_json(merged[2])["statuses"][0]["seasons"][0]["episode_count"] == 8  # --json still carries them
@@ -0,0 +1,198 @@
+"""Plex GUID index, its delta sync, and watch-readiness checks (engine/media/plex_index)."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from engine.media import plex_index as plex_index_module
+from engine.media.aggregation import check_plex_availability
+from engine.media.clients import PlexClient
+from engine.media.clients import breaker as breaker_module
+from engine.media.clients.plex import PlexIndex
+from engine.media.config import MediaConfig, PlexServer
+from engine.media.health import check_all_servers
+from engine.media.models import AggregatedResult, MediaSearchResult, MediaType
+
+SECTIONS = [
+    {"key": "1", "type": "show", "title": "TV"},
+    {"key": "2", "type": "movie", "title": "Movies"},
+    {"key": "3", "type": "artist", "title": "Music"},
+]
+ITEMS = {
+    "1": [
+        {"ratingKey": "10", "type": "show", "title": "Severance", "year": 2022, "Guid": [{"id": "tvdb://371980"}]},
+        {"ratingKey": "11", "type": "show", "title": "Home Movies", "year": 1999},  # never matched to an agent
+    ],
+    "2": [
+        {
+            "ratingKey": "20",
+            "type": "movie",
+            "title": "Matrix, The",
+            "year": 1999,
+            "Guid": [{"id": "imdb://tt0133093"}, {"id": "tmdb://603"}],
+        },
+    ],
+}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_state(monkeypatch):
+    monkeypatch.setattr(plex_index_module, "_plex_cache", {})
+    monkeypatch.setattr(breaker_module, "_breakers", {})
+
+
+class FakePlex:
+    """A stand-in Plex server: sections, listings with the updatedAt filter and
+    container sizes, and add/remove events that move its clock forward."""
+
+    def __init__(self, monkeypatch, items: dict[str, list[dict]] = ITEMS):
+        self.now = 1_000
+        self.items = {
+            key: {i["ratingKey"]: {**i, "updatedAt": self.now} for i in listed} for key, listed in items.items()
+        }
+        self.requests: list[str] = []
+        monkeypatch.setattr(
+            PlexClient,
+            "_client",
+            lambda client: httpx.AsyncClient(
+                transport=httpx.MockTransport(self.handler), base_url=client.server.base_url
+            ),
+        )
+
+    def add(self, section: str, item: dict) -> None:
+        self.now += 10
+        self.items[section][item["ratingKey"]] = {**item, "updatedAt": self.now}
+
+    def remove(self, section: str, rating_key: str) -> None:
+        self.now += 10
+        del self.items[section][rating_key]
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        self.requests.append(f"{request.url.path}?{'&'.join(sorted(params))}" if params else request.url.path)
+        if request.url.path == "/identity":
+            return httpx.Response(200, json={"MediaContainer": {"machineIdentifier": "fake"}})
+        if request.url.path == "/library/sections":
+            return httpx.Response(200, json={"MediaContainer": {"Directory": SECTIONS}})
+        listed = list(self.items[request.url.path.split("/")[3]].values())
+        if params.get("X-Plex-Container-Size") == "0":
+            return httpx.Response(200, json={"MediaContainer": {"size": 0, "totalSize": len(listed)}})
+        if "includeGuids" not in params:  # a key listing
+            listed = [{k: v for k, v in i.items() if k != "Guid"} for i in listed]
+        if "updatedAt>>=" in params:  # Plex reads `>>=` as "greater than"
+            listed = [i for i in listed if i["updatedAt"] > int(params["updatedAt>>="])]
+        return httpx.Response(200, json={"MediaContainer": {"Metadata": listed}})
+
+    def full_listings(self) -> int:
+        return sum(r.endswith("/all?includeGuids") for r in self.requests)
+
+
+def _result(title: str, media_type: MediaType, **ids) -> AggregatedResult:
+    return AggregatedResult(result=MediaSearchResult(title=title, media_type=media_type, **ids))
+
+
+CONFIG = MediaConfig(plex=[PlexServer(name="plex-a", base_url="http://plex", token="t")])
+
+
+def test_many_titles_cost_one_listing(monkeypatch):
+    plex = FakePlex(monkeypatch)
+    results = [
+        _result("Severance", MediaType.TV, tvdb_id=371980),
+        _result("The Matrix", MediaType.MOVIE, tmdb_id=603),  # Plex titles it differently
+        _result("Home Movies", MediaType.TV, year=1999),  # title fallback for untagged items
+        _result("Andor", MediaType.TV, tvdb_id=393189),
+        _result("Severance", MediaType.MOVIE, tmdb_id=1),  # right title, wrong type
+    ]
+
+    async def _run():
+        await asyncio.gather(*(check_plex_availability(r, CONFIG) for r in results))
+        await check_plex_availability(_result("Severance", MediaType.TV, tvdb_id=371980), CONFIG)
+
+    asyncio.run(_run())
+    assert [r.plex[0].available for r in results] == [True, True, True, False, False]
+    assert sorted(plex.requests) == [
+        "/library/sections",
+        "/library/sections/1/all?includeGuids",
+        "/library/sections/2/all?includeGuids",
+    ]
+
+
+def _sync(client: PlexClient) -> PlexIndex:
+    snapshot = plex_index_module.cached_plex_snapshot(client.name)
+    if snapshot is not None:
+        snapshot.synced_at -= 3600  # due for a sync
+    return asyncio.run(plex_index_module.plex_index(client))
+
+
+def test_index_follows_adds_and_removes_from_deltas(monkeypatch):
+    plex = FakePlex(monkeypatch)
+    client = PlexClient(CONFIG.plex[0])
+    andor = MediaSearchResult(title="Andor", media_type=MediaType.TV, tvdb_id=393189)
+    matrix = MediaSearchResult(title="The Matrix", media_type=MediaType.MOVIE, tmdb_id=603)
+    index = _sync(client)
+    assert plex.full_listings() == 2 and not index.contains(andor)
+
+    plex.add("1", {"ratingKey": "12", "type": "show", "title": "Andor", "Guid": [{"id": "tvdb://393189"}]})
+    assert _sync(client).contains(andor)
+    assert plex.full_listings() == 2  # the add arrived as a delta
+    assert "/library/sections/1/all?includeGuids&updatedAt>>=" in plex.requests
+
+    plex.remove("2", "20")
+    assert not _sync(client).contains(matrix)
+    assert "/library/sections/2/all" in plex.requests  # the size mismatch listed the movie keys
+    assert _sync(client).contains(andor) and plex.full_listings() == 2
+
+
+def test_a_remove_and_an_add_of_the_same_size_are_both_seen(monkeypatch):
+    plex = FakePlex(monkeypatch)
+    client = PlexClient(CONFIG.plex[0])
+    index = asyncio.run(client.load_index())
+    assert asyncio.run(client.sync_index(index)) == 0  # nothing happened: nothing re-fetched or counted
+
+    plex.remove("2", "20")
+    plex.add("2", {"ratingKey": "21", "type": "movie", "title": "Dune", "Guid": [{"id": "tmdb://438631"}]})
+    assert asyncio.run(client.sync_index(index)) == 2
+    assert not index.contains(MediaSearchResult(title="The Matrix", media_type=MediaType.MOVIE, tmdb_id=603))
+    assert index.contains(MediaSearchResult(title="Dune", media_type=MediaType.MOVIE, tmdb_id=438631))
+    assert plex.full_listings() == 2  # the initial load; the removal came from a key listing
+
+
+def test_full_resync_runs_on_its_own_cadence(monkeypatch):
+    plex = FakePlex(monkeypatch)
+    client = PlexClient(CONFIG.plex[0])
+    _sync(client)
+    plex_index_module.cached_plex_snapshot("plex-a").fetched_at -= 2 * 3600
+    _sync(client)
+    assert plex.full_listings() == 4
+
+
+def test_health_reports_index_age(monkeypatch):
+    FakePlex(monkeypatch)
+    [health] = asyncio.run(check_all_servers(CONFIG))
+    assert health.up and health.index_age_seconds is not None and health.index_age_seconds < 5
+
+
+def test_index_add_replace_remove():
+    index = PlexIndex()
+    index.replace_section("1", ITEMS["1"])
+    severance = MediaSearchResult(title="Severance", media_type=MediaType.TV, tvdb_id=371980)
+    assert index.contains(severance) and len(index) == 2
+    index.add({**ITEMS["1"][0], "Guid": [{"id": "tvdb://1"}]}, "1")  # rematched by Plex
+    assert not index.contains(severance) and len(index) == 2
+    index.remove("11")
+    assert not index.contains(MediaSearchResult(title="Home Movies", media_type=MediaType.TV))
+
+
+def test_unreachable_server_reports_an_error(monkeypatch):
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("no route to host", request=request)
+
+    monkeypatch.setattr(
+        PlexClient,
+        "_client",
+        lambda self: httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url=self.server.base_url),
+    )
+    aggregated = asyncio.run(check_plex_availability(_result("Severance", MediaType.TV, tvdb_id=371980), CONFIG))
+    [plex] = aggregated.plex
+    assert not plex.available and plex.error == "no route to host"
@@ -0,0 +1,118 @@
+"""Instant title matches from the in-memory library snapshots (engine/media/typeahead)."""
+
+import pytest
+
+from engine.media import library, typeahead
+from engine.media.clients.sonarr import LIBRARY_COLUMNS
+from engine.media.columns import LibraryTable
+from engine.media.config import ArrInstance, MediaConfig
+from engine.media.library import LibrarySnapshot
+from engine.media.models import MediaType, PresenceState
+from engine.media.typeahead import TitleIndex, library_matches
+
+CONFIG = MediaConfig(
+    sonarr=[
+        ArrInstance(name="sonarr-a", base_url="http://a", api_key="k"),
+        ArrInstance(name="sonarr-b", base_url="http://b", api_key="k"),
+        ArrInstance(name="sonarr-c", base_url="http://c", api_key="k"),
+    ]
+)
+SEVERANCE = {
+    "tvdbId": 371980,
+    "id": 1,
+    "title": "Severance",
+    "year": 2022,
+    "alternateTitles": [{"title": "Separación"}],
+    "statistics": {"episodeCount": 19, "episodeFileCount": 19},
+}
+SEVEN = {"tvdbId": 1, "id": 2, "title": "The Seven Seas", "year": 1999, "statistics": {}}
+ANDOR = {"tvdbId": 393189, "id": 3, "title": "Andor", "year": 2022, "statistics": {}}
+
+
+def _table(*records: dict) -> LibraryTable:
+    return LibraryTable.from_records(records, "tvdbId", LIBRARY_COLUMNS)
+
+
+def _snapshot(table: LibraryTable) -> LibrarySnapshot:
+    return LibrarySnapshot(fetched_at=0.0, expires_at=float("inf"), index=table)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_state(monkeypatch):
+    monkeypatch.setattr(typeahead, "_indexes", {})
+    monkeypatch.setattr(
+        library,
+        "_library_cache",
+        {"sonarr-a": _snapshot(_table(SEVERANCE, SEVEN)), "sonarr-b": _snapshot(_table(ANDOR))},
+    )
+
+
+def test_prefixes_alternate_titles_years_and_ids_match():
+    def titles(query: str) -> list[str]:
+        return [r.result.title for r in library_matches(query, MediaType.TV, CONFIG)]
+
+    assert titles("sev") == ["Severance", "The Seven Seas"]  # title prefix before word prefix
+    assert titles("SEVERANCE!") == ["Severance"]
+    assert titles("separa") == ["Severance"]
+    assert titles("seas seven") == ["The Seven Seas"]
+    assert titles("2022") == ["Andor", "Severance"]
+    assert titles("393189") == ["Andor"]
+    assert titles("verance") == titles("") == titles("sevx") == []
+
+
+def test_matches_carry_every_instances_status():
+    [match] = library_matches("severance", MediaType.TV, CONFIG)
+    assert match.result.tvdb_id == 371980
+    assert [(s.instance, s.state) for s in match.statuses] == [
+        ("sonarr-a", PresenceState.MONITORED_COMPLETE),
+        ("sonarr-b", PresenceState.NOT_PRESENT),
+        ("sonarr-c", PresenceState.PENDING),  # no snapshot yet
+    ]
+
+
+def test_index_follows_patched_snapshots():
+    index = TitleIndex(MediaType.TV)
+    table = _table(SEVERANCE, SEVEN)
+    index.sync("sonarr-a", table)
+    index.sync("sonarr-b", _table(SEVERANCE))
+    assert len(index) == 2
+
+    renamed = table.with_record(1, {**SEVEN, "title": "Andor Again"}, LIBRARY_COLUMNS)
+    index.sync("sonarr-a", renamed)
+    assert [t.ext_id for t in index.search("andor")] == [1] and index.search("seven") == []
+
+    index.sync("sonarr-a", renamed.with_record(371980, None, LIBRARY_COLUMNS))
+    [severance] = index.search("sever")
+    assert list(severance.records) == ["sonarr-b"]  # still in sonarr-b
+    index.sync("sonarr-b", None)
+    assert index.search("sever") == [] and len(index) == 1
+
+
+def test_stored_and_patched_snapshots_reach_the_index_without_a_keystroke(monkeypatch):
+    monkeypatch.setattr(library, "_in_background", lambda coro: coro.close())  # no disk writes
+    client = library.client_for(CONFIG.sonarr[0], MediaType.TV)
+    library.patch_library(client, 393189, ANDOR)
+    [andor] = typeahead.title_index(MediaType.TV).search("andor")
+    assert set(andor.records) == {"sonarr-a"}  # indexed when patched; sonarr-b's snapshot not yet synced
+
+
+def test_a_redump_of_an_unchanged_library_reindexes_nothing(monkeypatch):
+    index = TitleIndex(MediaType.TV)
+    index.sync("sonarr-a", _table(SEVERANCE, SEVEN))
+    reindexed: list[int] = []
+    reindex = TitleIndex._reindex
+
+    def counting_reindex(self, title):
+        reindexed.append(title.ext_id)
+        reindex(self, title)
+
+    monkeypatch.setattr(TitleIndex, "_reindex", counting_reindex)
+
+    redump = _table(dict(SEVERANCE), {**SEVEN, "statistics": {"episodeCount": 3}})  # new dicts, same names
+    index.sync("sonarr-a", redump)
+    assert reindexed == []
+    [seven] = index.search("seven")
+    assert seven.records["sonarr-a"] is redump[1]  # statuses still come from the fresh records
+
+    index.sync("sonarr-a", redump.with_record(1, {**SEVEN, "year": 2001}, LIBRARY_COLUMNS))
+    assert reindexed == [1] and [t.ext_id for t in index.search("2001")] == [1]
@@ -0,0 +1,117 @@
+"""Sonarr/Radarr webhook events patching snapshots and reaching subscribers
+(engine/media/webhooks)."""
+
+import asyncio
+
+import pytest
+
+from engine.media import library, webhooks
+from engine.media.clients import RadarrClient, SonarrClient
+from engine.media.config import ArrInstance, MediaConfig
+from engine.media.library import cached_snapshot, library_index, refresh_interval
+from engine.media.models import AggregatedResult, InstanceStatus, MediaSearchResult, MediaType, PresenceState
+from engine.media.webhooks import apply_change, handle_event, subscribe
+
+CONFIG = MediaConfig(
+    sonarr=[ArrInstance(name="sonarr-a", base_url="http://a", api_key="k")],
+    radarr=[ArrInstance(name="radarr-a", base_url="http://r", api_key="k")],
+)
+SERIES = {"tvdbId": 371980, "id": 42, "statistics": {"episodeCount": 19, "episodeFileCount": 19}}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_state(monkeypatch):
+    monkeypatch.setattr(library, "_library_cache", {})
+    monkeypatch.setattr(library, "_last_push", {})
+    monkeypatch.setattr(webhooks, "_listeners", set())
+
+
+@pytest.fixture
+def sonarr(monkeypatch) -> list[int]:
+    """sonarr-a's library holds one other series; returns the records refetched."""
+    fetched: list[int] = []
+
+    async def get_library(self):
+        return [{"tvdbId": 1, "id": 1}]
+
+    async def library_record(self, tvdb_id):
+        fetched.append(tvdb_id)
+        return SERIES
+
+    monkeypatch.setattr(SonarrClient, "get_library", get_library)
+    monkeypatch.setattr(SonarrClient, "library_record", library_record)
+    return fetched
+
+
+def _handle(instance: str, payload: dict):
+    async def _run():
+        await library_index(SonarrClient(CONFIG.sonarr[0]))
+        return await handle_event(CONFIG, instance, payload)
+
+    return asyncio.run(_run())
+
+
+def test_download_patches_the_title_and_notifies_subscribers(sonarr):
+    seen = []
+    unsubscribe = subscribe(seen.append)
+    change = _handle("sonarr-a", {"eventType": "Download", "series": {"id": 42, "tvdbId": 371980}, "episodes": []})
+    assert sonarr == [371980]
+    assert change.external_key == "tvdb:371980" and change.status.state == PresenceState.MONITORED_COMPLETE
+    assert seen == [change]
+    assert cached_snapshot("sonarr-a").index[371980]["id"] == 42 and 1 in cached_snapshot("sonarr-a").index
+    unsubscribe()
+    _handle("sonarr-a", {"eventType": "Grab", "series": {"tvdbId": 371980}})
+    assert len(seen) == 1
+
+
+def test_delete_drops_the_title_without_a_request(sonarr):
+    change = _handle("sonarr-a", {"eventType": "SeriesDelete", "series": {"tvdbId": 1}})
+    assert sonarr == []
+    assert change.status.state == PresenceState.NOT_PRESENT
+    assert 1 not in cached_snapshot("sonarr-a").index
+
+
+def test_radarr_events_key_on_tmdb(monkeypatch):
+    async def library_record(self, tmdb_id):
+        return {"tmdbId": tmdb_id, "id": 7, "hasFile": True, "monitored": True}
+
+    monkeypatch.setattr(RadarrClient, "library_record", library_record)
+    change = asyncio.run(handle_event(CONFIG, "radarr-a", {"eventType": "Download", "movie": {"tmdbId": 603}}))
+    assert change.external_key == "tmdb:603" and change.media_type == MediaType.MOVIE
+
+
+def test_test_events_unknown_instances_and_empty_payloads(sonarr):
+    assert _handle("sonarr-a", {"eventType": "Test", "series": {"tvdbId": 1}}) is None
+    with pytest.raises(KeyError):
+        asyncio.run(handle_event(CONFIG, "sonarr-z", {"eventType": "Download"}))
+    with pytest.raises(ValueError):
+        asyncio.run(handle_event(CONFIG, "sonarr-a", {"eventType": "Download"}))
+    assert sonarr == []
+
+
+def test_apply_change_swaps_only_that_instances_row():
+    result = AggregatedResult(
+        result=MediaSearchResult(title="Severance", media_type=MediaType.TV, tvdb_id=371980),
+        statuses=[
+            InstanceStatus(instance="sonarr-a", state=PresenceState.NOT_PRESENT),
+            InstanceStatus(instance="sonarr-b", state=PresenceState.NOT_PRESENT),
+        ],
+    )
+    other = AggregatedResult(result=MediaSearchResult(title="Andor", media_type=MediaType.TV, tvdb_id=393189))
+    change = webhooks.LibraryChange(
+        instance="sonarr-a",
+        media_type=MediaType.TV,
+        event_type="SeriesAdd",
+        external_key="tvdb:371980",
+        status=InstanceStatus(instance="sonarr-a", state=PresenceState.MONITORED_INCOMPLETE),
+    )
+    assert apply_change([other, result], change) == [result]
+    assert [s.state for s in result.statuses] == [PresenceState.MONITORED_INCOMPLETE, PresenceState.NOT_PRESENT]
+
+
+def test_pushing_instances_are_polled_less(sonarr):
+    instance = CONFIG.sonarr[0]
+    assert refresh_interval(instance) == instance.library_refresh_seconds
+    _handle("sonarr-a", {"eventType": "Grab", "series": {"tvdbId": 371980}})
+    assert refresh_interval(instance) == instance.library_refresh_seconds * 10
+    assert refresh_interval(CONFIG.radarr[0]) == CONFIG.radarr[0].library_refresh_seconds